@@ -2,7 +2,38 @@ import numpy as np
 import matplotlib.pyplot as plt 
 import pandas as pd
 import os
+import gc
 import scipy   
+from typing import NamedTuple
+
+
+# Material properties
+MATERIAL_DENSITIES = {
+    'steel': 7850,  # kg/m^3
+    'aluminum': 2700,  # kg/m^3
+    'concrete': 2400,  # kg/m^3
+    'wood': 600,  # kg/m^3
+    'plastic': 950,  # kg/m^3
+    'abs': 1050,  # kg/m^3
+}
+
+MATERIAL_YIELD_STRENGTHS = {
+    'steel': 250,  # MPa
+    'aluminum': 70,  # MPa
+    'concrete': 30,  # MPa
+    'wood': 40,  # MPa
+    'plastic': 20,  # MPa
+    'abs': 50,  # MPa
+}
+
+MATERIAL_ELASTIC_MODULI = {
+    'steel': 210000,  # MPa
+    'aluminum': 70000,  # MPa
+    'concrete': 30000,  # MPa
+    'wood': 11000,  # MPa
+    'plastic': 1500,  # MPa
+    'abs': 2200,  # MPa
+}
 
 
 class Node:
@@ -21,7 +52,7 @@ class Node:
 class Bar:
     def __init__(self, length: float= 0.0, width: float = 0.0, height: float = 0.0, radius: float = None, hollow: bool = False, section: str = 'rectangular', 
                 width_thickness: float = 0, height_thickness: float = 0, material: str = 'steel',
-                alpha: float = 0.0, start_node: Node = Node("1", 0, 0), end_node: Node = Node("2", 0, 10)):
+                alpha: float = 0.0, start_node: Node = None, end_node: Node = None):
         """
         Initialize a Bar object with given dimensions and properties.
         Parameters:
@@ -35,8 +66,8 @@ class Bar:
         - height_thickness: Thickness of the height for hollow sections (default is 0).
         - material: Material of the bar (default is steel).
         - alpha: Angle of the bar in degrees respect to the horizontal (default is 0).
-        - start_node: Node object representing the start node of the bar.
-        - end_node: Node object representing the end node of the bar.
+        - start_node: Node object representing the start node of the bar (default is a new node at (0, 0)).
+        - end_node: Node object representing the end node of the bar (default is a new node at (0, 10)).
 
         """
 
@@ -60,8 +91,9 @@ class Bar:
         
         self.material = material
         self.material_density = None
-        self.start_node = start_node
-        self.end_node = end_node
+        # New nodes for every bar: a shared default would be moved by _recalculate_nodes_from_alpha
+        self.start_node = Node("1", 0, 0) if start_node is None else start_node
+        self.end_node = Node("2", 0, 10) if end_node is None else end_node
         
         self.get_material_density() 
 
@@ -186,7 +218,7 @@ class Bar:
                 inner_area = (self.width - self.width_thickness*2) * (self.height - self.height_thickness*2)
                 return outer_area - inner_area
             else:
-                return self.length * self.width
+                return self.width * self.height
             
         elif self.section == 'circular':
             if self.hollow:
@@ -250,7 +282,7 @@ class Bar:
             raise ValueError("Position must be within the length of the bar.")
         self.load[position] = [fx, fy, m]
 
-    def resistance_analysis(self, n, t, m, yield_strength: float = None) -> tuple :
+    def resistance_analysis(self, n, t, m, yield_strength: float = None, verbose: bool = True) -> tuple :
         """
         Perform resistance analysis on the bar.
         Args:
@@ -258,6 +290,7 @@ class Bar:
             t: Shear force applied on the section with maximum stress.
             m: Moment applied on the section with maximum stress.
             yield_strength: Yield strength of the material in Pa (optional).
+            verbose: Print the result of the check (default is True).
         Returns:
             tuple: Von Mises stress, yield strength, normal stress, and shear stress.
         """
@@ -282,10 +315,11 @@ class Bar:
         if yield_strength is None:
             yield_strength = self.get_material_yield_strength()
 
-        if von_mises_stress > yield_strength or von_mises_stress == None:
-            print(f"Warning: The bar is yielding! Von Mises stress: {von_mises_stress:.2f} MPa, Yield strength: {yield_strength:.2f} MPa")
-        else:
-            print(f"The bar is safe. Von Mises stress: {von_mises_stress:.2f} MPa, Yield strength: {yield_strength:.2f} MPa")
+        if verbose:
+            if von_mises_stress > yield_strength or von_mises_stress == None:
+                print(f"Warning: The bar is yielding! Von Mises stress: {von_mises_stress:.2f} MPa, Yield strength: {yield_strength:.2f} MPa")
+            else:
+                print(f"The bar is safe. Von Mises stress: {von_mises_stress:.2f} MPa, Yield strength: {yield_strength:.2f} MPa")
         return von_mises_stress, yield_strength, sigma, tau
 
 
@@ -293,32 +327,56 @@ class Bar:
         """
         Get the material density based on the material type.
         """
-        material_densities = {
-            'steel': 7850,  # kg/m^3
-            'aluminum': 2700,  # kg/m^3
-            'concrete': 2400,  # kg/m^3
-            'wood': 600,  # kg/m^3
-            'plastic': 950,  # kg/m^3
-            'abs': 1050,  # kg/m^3
-        }
-        self.material_density = material_densities.get(self.material.lower())
+        self.material_density = MATERIAL_DENSITIES.get(self.material.lower())
         if self.material_density is None:
-            raise ValueError(f"Material '{self.material}' not recognized. Please use one of the following: {', '.join(material_densities.keys())}")
+            raise ValueError(f"Material '{self.material}' not recognized. Please use one of the following: {', '.join(MATERIAL_DENSITIES.keys())}")
         
     def get_material_yield_strength(self):
         """
         Get the yield strength of the material based on the material type.
         """
-        material_yield_strengths = {
-            'steel': 250,  # MPa
-            'aluminum': 70,  # MPa
-            'concrete': 30,  # MPa
-            'wood': 40,  # MPa
-            'plastic': 20,  # MPa
-            'abs': 50,  # MPa
-        }
-        return material_yield_strengths.get(self.material.lower())
+        return MATERIAL_YIELD_STRENGTHS.get(self.material.lower())
+
+    def get_material_elastic_modulus(self):
+        """
+        Get the elastic (Young's) modulus of the material based on the material type.
+        """
+        return MATERIAL_ELASTIC_MODULI.get(self.material.lower())
         
+    def to_dict(self) -> dict:
+        """
+        Return the bar as a JSON-serializable dictionary (see Bar.from_dict).
+        """
+        return {
+            'length': self.length, 'width': self.width, 'height': self.height, 'radius': self.radius,
+            'hollow': self.hollow, 'section': self.section,
+            'width_thickness': self.width_thickness, 'height_thickness': self.height_thickness,
+            'material': self.material, 'alpha': self.alpha,
+            'start_node': {'id': self.start_node.id, 'x': self.start_node.x, 'y': self.start_node.y},
+            'end_node': {'id': self.end_node.id, 'x': self.end_node.x, 'y': self.end_node.y},
+            'loads': [[position, fx, fy, m] for position, (fx, fy, m) in self.load.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """
+        Create a bar from a dictionary as returned by Bar.to_dict.
+        """
+        data = dict(data)
+        loads = data.pop('loads', [])
+        data['start_node'] = Node(**data['start_node'])
+        data['end_node'] = Node(**data['end_node'])
+        bar = cls(**data)
+        for position, fx, fy, m in loads:
+            bar.load[position] = [fx, fy, m]
+        return bar
+
+    def snapshot(self):
+        """
+        Return a frozen, hashable copy of the bar (see BarSnapshot).
+        """
+        return BarSnapshot.from_bar(self)
+
     def info(self):
         """
         Print the properties of the bar.
@@ -364,6 +422,7 @@ class Structure:
         """
         self.name = name
         self.bars = []
+        self.supports = []
         
     def add_bar(self, bar: Bar):
         """
@@ -374,7 +433,151 @@ class Structure:
         if not isinstance(bar, Bar):
             raise ValueError("bar must be an instance of the Bar class.")
         self.bars.append(bar)
+
+    def add_bars(self, coordinates, connectivity, node_ids=None, **properties) -> list:
+        """
+        Add many bars at once from node coordinates and a connectivity array (fast path of add_bar).
+        The length and angle of the bars come from their nodes, which are shared by the bars they connect.
+        Parameters:
+        - coordinates: Coordinates of the nodes (n_nodes, 2).
+        - connectivity: Indices of the start and end nodes of the bars (n_bars, 2).
+        - node_ids: Ids of the nodes (default is the index of the node).
+        - properties: Properties of the bars as in Bar (width, height, radius, hollow, section, width_thickness,
+          height_thickness, material), each a single value or one value per bar.
+        Returns:
+            list: The new Bar objects.
+        """
+        coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+        connectivity = np.asarray(connectivity, dtype=int).reshape(-1, 2)
+        n_bars = len(connectivity)
+        if n_bars and (connectivity.min() < 0 or connectivity.max() >= len(coordinates)):
+            raise ValueError("connectivity refers to nodes that are not in coordinates.")
+        unknown = set(properties) - {'width', 'height', 'radius', 'hollow', 'section', 'width_thickness',
+                                     'height_thickness', 'material'}
+        if unknown:
+            raise ValueError(f"Unknown bar properties: {', '.join(sorted(unknown))}.")
+
+        # Bar properties: one column per varying property, the constant ones in a template made by Bar.__init__
+        # itself (so that the bars have all the attributes of a Bar, with their defaults)
+        constants, columns = {}, {}
+        for key, value in properties.items():
+            if np.ndim(value) == 0:
+                constants[key] = value
+            elif len(value) != n_bars:
+                raise ValueError(f"{key} must be a single value or one value per bar.")
+            else:
+                columns[key] = np.asarray(value).tolist()
+        template = vars(Bar(**constants))
+        if not set(columns.get('section', [])) <= {'rectangular', 'circular'}:
+            raise ValueError("section must be either 'rectangular' or 'circular'")
+        if 'material' in columns:
+            densities = {material: MATERIAL_DENSITIES.get(material.lower()) for material in set(columns['material'])}
+            for material, density in densities.items():
+                if density is None:
+                    raise ValueError(f"Material '{material}' not recognized. Please use one of the following: {', '.join(MATERIAL_DENSITIES.keys())}")
+            columns['material_density'] = [densities[material] for material in columns['material']]
+
+        # Geometry of all the bars at once
+        start, end = coordinates[connectivity[:, 0]], coordinates[connectivity[:, 1]]
+        delta = end - start
+        lengths = np.hypot(delta[:, 0], delta[:, 1]).tolist()
+        alphas = np.degrees(np.arctan2(delta[:, 1], delta[:, 0])).tolist()
+
+        ids = [str(i) for i in range(len(coordinates))] if node_ids is None else list(node_ids)
+        starts, ends = connectivity[:, 0].tolist(), connectivity[:, 1].tolist()
+        others = list(columns)
+        xy = coordinates.tolist()
+
+        # Build the nodes and the bars without going through Bar.__init__ (the properties are already checked),
+        # with the garbage collector paused: it would otherwise rescan the new objects many times
+        new = Bar.__new__
+        bars = []
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            nodes = [Node(node_id, x, y) for node_id, (x, y) in zip(ids, xy)]
+            for length, alpha, i, j, *values in zip(lengths, alphas, starts, ends, *columns.values()):
+                bar = new(Bar)
+                attributes = template.copy()
+                attributes['length'] = length
+                attributes['alpha'] = alpha
+                attributes['start_node'] = nodes[i]
+                attributes['end_node'] = nodes[j]
+                attributes['load'] = {}
+                if values:
+                    attributes.update(zip(others, values))
+                bar.__dict__ = attributes
+                bars.append(bar)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        self.bars.extend(bars)
+        return bars
+
+    def add_support(self, node: Node, ux: bool = True, uy: bool = True, rz: bool = False):
+        """
+        Add a support (constraint) to a node of the structure.
+        Parameters:
+        - node: Node object to be constrained (matched to the bars by its coordinates).
+        - ux: Block the horizontal displacement (default is True).
+        - uy: Block the vertical displacement (default is True).
+        - rz: Block the rotation (default is False, i.e. a pin).
+        """
+        if not isinstance(node, Node):
+            raise ValueError("node must be an instance of the Node class.")
+        self.supports.append((node, (ux, uy, rz)))
         
+    def to_dict(self) -> dict:
+        """
+        Return the structure as a JSON-serializable dictionary (see Structure.from_dict).
+        """
+        return {
+            'name': self.name,
+            'bars': [bar.to_dict() for bar in self.bars],
+            'supports': [{'node': {'id': node.id, 'x': node.x, 'y': node.y}, 'ux': ux, 'uy': uy, 'rz': rz}
+                         for node, (ux, uy, rz) in self.supports],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """
+        Create a structure from a dictionary as returned by Structure.to_dict.
+        """
+        structure = cls(name=data.get('name', ''))
+        for bar in data.get('bars', []):
+            structure.add_bar(Bar.from_dict(bar))
+        for support in data.get('supports', []):
+            structure.add_support(Node(**support['node']), support.get('ux', True), support.get('uy', True), support.get('rz', False))
+        return structure
+
+    def snapshot(self):
+        """
+        Return a frozen, hashable copy of the structure (see StructureSnapshot).
+        The snapshot can be analyzed on another thread or process while the structure keeps being edited.
+        """
+        return StructureSnapshot.from_structure(self)
+
+    def solve_load_cases(self, loads: np.ndarray) -> tuple:
+        """
+        Linear static analysis of many nodal load cases with a single factorization of the stiffness matrix.
+        Parameters:
+        - loads: Nodal loads (n_dofs, n_cases), 3 dofs per node (fx, fy, m). The numbering of the dofs is
+          the one of fem.FrameModel(structure), see FrameModel.dof.
+        Returns:
+            tuple: displacements (n_dofs, n_cases), end forces of the bars in local coordinates (n_bars, 6, n_cases).
+        """
+        from fem import StaticSolver  # fem depends on this module
+        return StaticSolver(self).solve_cases(loads)
+
+    def table(self, checks: bool = True, n_samples: int = 100) -> pd.DataFrame:
+        """
+        Return the bars of the structure as a table (one row per bar), see bar_table.
+        Parameters:
+        - checks: Add the results of the resistance check.
+        - n_samples: Number of samples along each bar of the stress diagrams.
+        """
+        return bar_table(self.bars, checks, n_samples)
+
     def info(self):
         """
         Print the properties of the structure and its associated bar.
@@ -383,3 +586,534 @@ class Structure:
         for bar in self.bars:
             bar.info()
 
+
+
+# Snapshot classes
+# Frozen, hashable copies of the model (tuples all the way down): they are safe to share between threads,
+# cheap to pickle for process pools and edited by copy (the unchanged bars and nodes are shared).
+# The snapshots have the attributes of Node, Bar and Structure, so the vectorized functions below
+# (bar_arrays, internal_forces, resistance_check...), fem.FrameModel and the plots accept them as well.
+class NodeSnapshot(NamedTuple):
+    id: str
+    x: float
+    y: float
+
+    @classmethod
+    def from_node(cls, node: Node):
+        return cls(node.id, float(node.x), float(node.y))
+
+    def to_node(self) -> Node:
+        return Node(self.id, self.x, self.y)
+
+class BarSnapshot(NamedTuple):
+    length: float
+    width: float
+    height: float
+    radius: float
+    hollow: bool
+    section: str
+    width_thickness: float
+    height_thickness: float
+    material: str
+    alpha: float
+    start_node: NodeSnapshot
+    end_node: NodeSnapshot
+    loads: tuple = ()  # ((position, fx, fy, m), ...) sorted by position
+
+    @classmethod
+    def from_bar(cls, bar: Bar, nodes: dict = None):
+        """
+        Create the snapshot of a bar.
+        Parameters:
+        - bar: Bar object.
+        - nodes: Snapshots of the nodes already converted, by id() of the Node (shared nodes stay shared).
+        """
+        nodes = {} if nodes is None else nodes
+        ends = []
+        for node in (bar.start_node, bar.end_node):
+            if id(node) not in nodes:
+                nodes[id(node)] = NodeSnapshot.from_node(node)
+            ends.append(nodes[id(node)])
+        loads = tuple((position, fx, fy, m) for position, (fx, fy, m) in sorted(bar.load.items()))
+        return cls(bar.length, bar.width, bar.height, bar.radius, bar.hollow, bar.section,
+                   bar.width_thickness, bar.height_thickness, bar.material, bar.alpha, ends[0], ends[1], loads)
+
+    @property
+    def load(self) -> dict:
+        """Loads as in Bar.load ({position: [fx, fy, m]}); the returned dictionary is a copy."""
+        return {position: [fx, fy, m] for position, fx, fy, m in self.loads}
+
+    def with_load(self, position: float, fx: float, fy: float, m: float):
+        """
+        Return a copy of the snapshot with a load added (or replaced) at a position (see Bar.add_load,
+        the position is checked the same way).
+        """
+        if position < 0 or position > self.length:
+            raise ValueError("Position must be within the length of the bar.")
+        loads = tuple(load for load in self.loads if load[0] != position) + ((position, fx, fy, m),)
+        return self._replace(loads=tuple(sorted(loads)))
+
+    def with_geometry(self, length: float = None, alpha: float = None):
+        """
+        Return a copy of the snapshot with a new length and/or angle, the end node being moved accordingly
+        (see Bar.set_length and Bar.set_alpha).
+        """
+        length = self.length if length is None else length
+        alpha = self.alpha if alpha is None else alpha
+        end_node = self.end_node._replace(x=self.start_node.x + length * np.cos(np.radians(alpha)),
+                                          y=self.start_node.y + length * np.sin(np.radians(alpha)))
+        return self._replace(length=length, alpha=alpha, end_node=end_node)
+
+    def to_bar(self, nodes: dict = None) -> Bar:
+        """
+        Create a mutable Bar from the snapshot.
+        Parameters:
+        - nodes: Nodes already created, by id() of the NodeSnapshot (shared nodes stay shared).
+        """
+        nodes = {} if nodes is None else nodes
+        ends = []
+        for node in (self.start_node, self.end_node):
+            if id(node) not in nodes:
+                nodes[id(node)] = node.to_node()
+            ends.append(nodes[id(node)])
+        bar = Bar(self.length, self.width, self.height, self.radius, self.hollow, self.section,
+                  self.width_thickness, self.height_thickness, self.material, self.alpha, ends[0], ends[1])
+        for position, fx, fy, m in self.loads:
+            bar.load[position] = [fx, fy, m]
+        return bar
+
+    def to_dict(self) -> dict:
+        """
+        Return the snapshot as a JSON-serializable dictionary (see Bar.from_dict).
+        """
+        data = {field: getattr(self, field) for field in self._fields[:10]}
+        data['start_node'] = self.start_node._asdict()
+        data['end_node'] = self.end_node._asdict()
+        data['loads'] = [list(load) for load in self.loads]
+        return data
+
+class StructureSnapshot(NamedTuple):
+    name: str
+    bars: tuple = ()  # BarSnapshot objects
+    supports: tuple = ()  # ((NodeSnapshot, (ux, uy, rz)), ...)
+
+    @classmethod
+    def from_structure(cls, structure: Structure):
+        """
+        Create the snapshot of a structure (see Structure.snapshot).
+        """
+        nodes = {}
+        bars = tuple(BarSnapshot.from_bar(bar, nodes) for bar in structure.bars)
+        supports = tuple((nodes.get(id(node)) or NodeSnapshot.from_node(node), tuple(bool(c) for c in constraints))
+                         for node, constraints in structure.supports)
+        return cls(structure.name, bars, supports)
+
+    def to_structure(self) -> Structure:
+        """
+        Create a mutable Structure from the snapshot (e.g. to restore it in the GUI).
+        """
+        nodes = {}
+        structure = Structure(self.name)
+        for bar in self.bars:
+            structure.add_bar(bar.to_bar(nodes))
+        for node, constraints in self.supports:
+            structure.add_support(nodes.get(id(node)) or node.to_node(), *constraints)
+        return structure
+
+    def with_bar(self, index: int, bar: BarSnapshot = None, **changes):
+        """
+        Return a copy of the snapshot with one bar replaced or changed; the other bars are shared.
+        Parameters:
+        - index: Index of the bar.
+        - bar: New BarSnapshot (default: the current bar).
+        - changes: Fields of the bar to change (e.g. width=50, loads=()).
+        """
+        bar = self.bars[index] if bar is None else bar
+        if changes:
+            bar = bar._replace(**changes)
+        index = range(len(self.bars))[index]
+        return self._replace(bars=self.bars[:index] + (bar,) + self.bars[index + 1:])
+
+    def add_bar(self, bar):
+        """
+        Return a copy of the snapshot with a bar (Bar or BarSnapshot) appended.
+        """
+        if isinstance(bar, Bar):
+            bar = BarSnapshot.from_bar(bar)
+        if not isinstance(bar, BarSnapshot):
+            raise ValueError("bar must be an instance of the Bar or BarSnapshot class.")
+        return self._replace(bars=self.bars + (bar,))
+
+    def remove_bar(self, index: int):
+        """
+        Return a copy of the snapshot without a bar.
+        """
+        index = range(len(self.bars))[index]
+        return self._replace(bars=self.bars[:index] + self.bars[index + 1:])
+
+    def add_support(self, node, ux: bool = True, uy: bool = True, rz: bool = False):
+        """
+        Return a copy of the snapshot with a support added (see Structure.add_support).
+        """
+        if isinstance(node, Node):
+            node = NodeSnapshot.from_node(node)
+        return self._replace(supports=self.supports + ((node, (bool(ux), bool(uy), bool(rz))),))
+
+    def to_dict(self) -> dict:
+        """
+        Return the snapshot as a JSON-serializable dictionary (see Structure.from_dict).
+        """
+        return {
+            'name': self.name,
+            'bars': [bar.to_dict() for bar in self.bars],
+            'supports': [{'node': node._asdict(), 'ux': ux, 'uy': uy, 'rz': rz}
+                         for node, (ux, uy, rz) in self.supports],
+        }
+
+
+
+def bar_arrays(bars) -> dict:
+    """
+    Collect the properties of a list of bars in NumPy arrays (one entry per bar).
+    Parameters:
+    - bars: List of Bar objects.
+    Returns:
+        dict: length, width, height, radius, hollow, circular, width_thickness, height_thickness, alpha,
+        x0, y0, x1, y1 (node coordinates), density, yield_strength and elastic_modulus.
+    """
+    bars = list(bars)
+    arrays = {
+        'length': np.array([bar.length for bar in bars], dtype=float),
+        'width': np.array([bar.width for bar in bars], dtype=float),
+        'height': np.array([bar.height for bar in bars], dtype=float),
+        'radius': np.array([np.nan if bar.radius is None else bar.radius for bar in bars], dtype=float),
+        'hollow': np.array([bar.hollow for bar in bars], dtype=bool),
+        'circular': np.array([bar.section == 'circular' for bar in bars], dtype=bool),
+        'width_thickness': np.array([bar.width_thickness for bar in bars], dtype=float),
+        'height_thickness': np.array([bar.height_thickness for bar in bars], dtype=float),
+        'alpha': np.array([bar.alpha for bar in bars], dtype=float),
+        'x0': np.array([bar.start_node.x for bar in bars], dtype=float),
+        'y0': np.array([bar.start_node.y for bar in bars], dtype=float),
+        'x1': np.array([bar.end_node.x for bar in bars], dtype=float),
+        'y1': np.array([bar.end_node.y for bar in bars], dtype=float),
+    }
+    materials = [bar.material.lower() for bar in bars]
+    for key, table in (('density', MATERIAL_DENSITIES), ('yield_strength', MATERIAL_YIELD_STRENGTHS),
+                       ('elastic_modulus', MATERIAL_ELASTIC_MODULI)):
+        arrays[key] = np.array([table.get(material, np.nan) for material in materials], dtype=float)
+    return arrays
+
+def section_properties(arrays: dict) -> dict:
+    """
+    Compute the section properties of many bars at once (same formulas as the Bar methods).
+    Parameters:
+    - arrays: Bar properties, as returned by bar_arrays.
+    Returns:
+        dict: A (sectional area), I (moment of inertia), S (static moment) and b (width used for the shear stress).
+    """
+    w = arrays['width']
+    h = arrays['height']
+    tw = arrays['width_thickness']
+    th = arrays['height_thickness']
+    r = arrays['radius']
+    hollow = arrays['hollow']
+    circular = arrays['circular']
+
+    # Circular bars have no width/height and rectangular bars no radius: ignore the invalid values of the other branch
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Rectangular sections
+        wi = np.where(hollow, w - 2 * tw, 0.0)
+        hi = np.where(hollow, h - 2 * th, 0.0)
+        rect_area = w * h - wi * hi
+        rect_inertia = (w * h ** 3 - wi * hi ** 3) / 12
+        rect_static = np.where(hollow, (w * h ** 3 - wi * (h - th) ** 3) / (6 * h), w * h ** 2 / 6)
+        rect_b = np.where(hollow, tw, w)
+
+        # Circular sections
+        ri = np.where(hollow, r - tw, 0.0)
+        circ_area = np.pi * (r ** 2 - ri ** 2)
+        circ_inertia = np.pi * (r ** 4 - ri ** 4) / 4
+        circ_static = np.where(hollow, np.pi * ((2 * r) ** 4 - (2 * ri) ** 4) / (32 * 2 * r), np.pi * r ** 3 / 4)
+        circ_b = np.where(hollow, tw, 2 * r)
+
+    return {
+        'A': np.where(circular, circ_area, rect_area),
+        'I': np.where(circular, circ_inertia, rect_inertia),
+        'S': np.where(circular, circ_static, rect_static),
+        'b': np.where(circular, circ_b, rect_b),
+    }
+
+def load_arrays(bars) -> tuple:
+    """
+    Collect the loads of a list of bars in padded NumPy arrays, sorted by position along each bar.
+    Parameters:
+    - bars: List of Bar objects.
+    Returns:
+        tuple: positions (n_bars, n_loads) as fraction of the length, forces (n_bars, n_loads, 3) as (fx, fy, m)
+        and mask (n_bars, n_loads) of the entries holding a load (padding has zero forces).
+    """
+    bars = list(bars)
+    n_loads = max((len(bar.load) for bar in bars), default=0)
+    positions = np.zeros((len(bars), n_loads))
+    forces = np.zeros((len(bars), n_loads, 3))
+    mask = np.zeros((len(bars), n_loads), dtype=bool)
+    for i, bar in enumerate(bars):
+        for j, (position, force) in enumerate(sorted(bar.load.items())):
+            positions[i, j] = position
+            forces[i, j] = force
+            mask[i, j] = True
+    return positions, forces, mask
+
+def internal_forces(bars, n_samples: int = 100, loads: tuple = None, arrays: dict = None) -> tuple:
+    """
+    Compute the shear, normal and flexion diagrams of many bars at once (vectorized compute_stress).
+    The loads are applied at the sample int(position * (n_samples - 1)), as in compute_stress.
+    Parameters:
+    - bars: List of Bar objects.
+    - n_samples: Number of samples along each bar.
+    - loads: Loads as returned by load_arrays (default: the loads of the bars).
+    - arrays: Bar properties as returned by bar_arrays (default: computed from the bars).
+    Returns:
+        tuple: x_data, shear, normal, flexion, each of shape (n_bars, n_samples).
+    """
+    bars = list(bars)
+    arrays = bar_arrays(bars) if arrays is None else arrays
+    positions, forces, mask = load_arrays(bars) if loads is None else loads
+    length = arrays['length'][:, None]
+    alpha = np.radians(arrays['alpha'])[:, None]
+    fx, fy, m = forces[..., 0], forces[..., 1], forces[..., 2]
+
+    # Load components in the reference of the bar
+    t = fy * np.cos(alpha) - fx * np.sin(alpha)
+    n = -fx * np.cos(alpha) - fy * np.sin(alpha)
+
+    # Scatter the loads on their sample, then cumulate from the start of the bar
+    index = (positions * (n_samples - 1)).astype(int)
+    rows = np.broadcast_to(np.arange(len(bars))[:, None], index.shape)
+    steps = np.zeros((4, len(bars), n_samples))
+    for k, values in enumerate((t, n, t * positions * length, m)):
+        np.add.at(steps[k], (rows[mask], index[mask]), values[mask])
+    t_sum, n_sum, ta_sum, m_sum = np.cumsum(steps, axis=2)
+
+    x_data = np.linspace(0, 1, n_samples)[None, :] * length
+    flexion = t_sum * x_data - ta_sum - m_sum
+    return x_data, t_sum, n_sum, flexion
+
+def critical_samples(bars, n_samples: int = 100) -> np.ndarray:
+    """
+    Samples of the stress diagrams (see internal_forces) where the Von Mises stress of each bar can be maximum.
+    Between two loads the shear and normal forces are constant and the moment is linear, so the squared
+    Von Mises stress is a convex function of the position: its maximum over a bar is at the ends of the bar
+    or on either side of a load, whatever the section.
+    Parameters:
+    - bars: List of Bar objects.
+    - n_samples: Number of samples along each bar.
+    Returns:
+        np.ndarray: Sample indices (n_bars, 2 * n_loads + 2), padded by repeating the first sample.
+    """
+    positions, _, mask = load_arrays(bars)
+    index = (positions * (n_samples - 1)).astype(int)
+    index = np.where(mask, index, 0)
+    before = np.where(mask, np.maximum(index - 1, 0), 0)
+    ends = np.broadcast_to(np.array([0, n_samples - 1]), (len(index), 2))
+    return np.concatenate([ends, index, before], axis=1)
+
+def envelope(bars, n_samples: int = 100, loads: tuple = None, arrays: dict = None) -> dict:
+    """
+    Extreme values of the stress diagrams of many bars and their positions, without building the diagrams
+    (same samples as internal_forces, memory proportional to the number of loads instead of n_samples).
+    Between two loads N and T are constant and M is linear, so the extremes of N, T, M, of the maximum Von Mises
+    stress and of |T| + |N| + |M| are at the ends of the segments; the minimum Von Mises stress is where the
+    normal stress changes sign. Ties are resolved as np.argmax / np.argmin on the diagrams (first sample).
+    Parameters:
+    - bars: List of Bar objects.
+    - n_samples: Number of samples along each bar.
+    - loads: Loads as returned by load_arrays (default: the loads of the bars). The forces can have leading
+      load case axes, e.g. (n_cases, n_bars, n_loads, 3): the results then have shape (n_cases, n_bars).
+    - arrays: Bar properties as returned by bar_arrays (default: computed from the bars).
+    Returns:
+        dict: {quantity}_max, {quantity}_min, {quantity}_max_position and {quantity}_min_position (mm) for the
+        quantities normal, shear, flexion and von_mises, and governing_position, governing_normal, governing_shear,
+        governing_flexion: the section with the largest |T| + |N| + |M| (see resistance_check).
+    """
+    bars = list(bars)
+    arrays = bar_arrays(bars) if arrays is None else arrays
+    positions, forces, mask = load_arrays(bars) if loads is None else loads
+    length = arrays['length'][:, None]
+    alpha = np.radians(arrays['alpha'])[:, None]
+
+    # Loads in the order of their samples (padding at the end, on a sample after the bar)
+    index = np.where(mask, (positions * (n_samples - 1)).astype(int), n_samples)
+    order = np.argsort(index, axis=1, kind='stable')
+    index, positions, mask = (np.take_along_axis(values, order, axis=1) for values in (index, positions, mask))
+    forces = np.take_along_axis(forces, np.broadcast_to(order[..., None], forces.shape), axis=-2)
+    fx, fy, m = forces[..., 0], forces[..., 1], forces[..., 2]
+    t = np.where(mask, fy * np.cos(alpha) - fx * np.sin(alpha), 0.0)
+    n = np.where(mask, -fx * np.cos(alpha) - fy * np.sin(alpha), 0.0)
+    m = np.where(mask, m, 0.0)
+
+    # Segment s covers the samples from load s - 1 (or the start of the bar) to load s (excluded)
+    def cumulate(values):
+        return np.concatenate([np.zeros(values.shape[:-1] + (1,)), np.cumsum(values, axis=-1)], axis=-1)
+    T, N, TA, MS = cumulate(t), cumulate(n), cumulate(t * positions * length), cumulate(m)
+    start = np.concatenate([np.zeros((len(bars), 1), dtype=int), index], axis=1)
+    end = np.concatenate([index, np.full((len(bars), 1), n_samples)], axis=1) - 1
+    valid = start <= end
+    start, end = np.minimum(start, n_samples - 1), np.clip(end, 0, n_samples - 1)
+
+    grid = np.linspace(0, 1, n_samples)
+    sections = {key: value[:, None] for key, value in section_properties(arrays).items()}
+    tau = T * sections['S'] / (sections['I'] * sections['b'])
+
+    def flexion_at(sample):
+        return T * grid[sample] * length - TA - MS
+
+    def von_mises_at(sample):
+        return np.sqrt((N / sections['A'] + flexion_at(sample) / sections['I']) ** 2 + 3 * tau ** 2)
+
+    # Samples around the zero of the normal stress: N / A + (T x - TA - MS) / I = 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        root = (TA + MS - N * sections['I'] / sections['A']) / (T * length) * (n_samples - 1)
+    root = np.where(np.isfinite(root), root, start)
+    below = np.clip(np.floor(root), start, end).astype(int)
+    above = np.clip(np.ceil(root), start, end).astype(int)
+
+    def extremes(name, candidates, samples, segment_valid, kinds=('max', 'min')):
+        """Max and/or min over the candidates (last axis, in the order of the samples) and their positions."""
+        valid_ = np.broadcast_to(segment_valid, candidates.shape)
+        x = np.broadcast_to(grid[samples] * length, candidates.shape)
+        for kind, fill, pick in (('max', -np.inf, np.argmax), ('min', np.inf, np.argmin)):
+            if kind not in kinds:
+                continue
+            best = pick(np.where(valid_, candidates, fill), axis=-1)[..., None]
+            results[f'{name}_{kind}'] = np.take_along_axis(candidates, best, axis=-1)[..., 0]
+            results[f'{name}_{kind}_position'] = np.take_along_axis(x, best, axis=-1)[..., 0]
+
+    def interleave(*values):
+        """Interleave values per segment along the last axis, e.g. at the start and at the end of the segments."""
+        stacked = np.stack(np.broadcast_arrays(*values), axis=-1)
+        # Explicit size of the last axis: -1 cannot be inferred when there are no bars
+        return stacked.reshape(stacked.shape[:-2] + (stacked.shape[-2] * stacked.shape[-1],))
+
+    def ends(start_values, end_values):
+        """Interleave the values at the start and at the end of the segments (sample order)."""
+        return interleave(start_values, end_values)
+
+    results = {}
+    shape = np.broadcast(T, start).shape
+    extremes('normal', np.broadcast_to(N, shape), start, valid)
+    extremes('shear', np.broadcast_to(T, shape), start, valid)
+    samples = ends(start, end)
+    valid2 = ends(valid, valid)
+    flexion = ends(flexion_at(start), flexion_at(end))
+    extremes('flexion', flexion, samples, valid2)
+
+    # Maximum of the Von Mises stress at the ends of the segments, minimum also around the zero of sigma
+    extremes('von_mises', ends(von_mises_at(start), von_mises_at(end)), samples, valid2, ('max',))
+    candidates = interleave(von_mises_at(start), von_mises_at(below), von_mises_at(above), von_mises_at(end))
+    extremes('von_mises', candidates, interleave(start, below, above, end), np.repeat(valid, 4, axis=1), ('min',))
+
+    # Governing section of resistance_check: largest |T| + |N| + |M|
+    proxy = ends(np.abs(T) + np.abs(N), np.abs(T) + np.abs(N)) + np.abs(flexion)
+    best = np.argmax(np.where(np.broadcast_to(valid2, proxy.shape), proxy, -np.inf), axis=-1)[..., None]
+    x = np.broadcast_to(grid[samples] * length, proxy.shape)
+    results['governing_position'] = np.take_along_axis(x, best, axis=-1)[..., 0]
+    results['governing_flexion'] = np.take_along_axis(flexion, best, axis=-1)[..., 0]
+    results['governing_normal'] = np.take_along_axis(ends(N, N), best, axis=-1)[..., 0]
+    results['governing_shear'] = np.take_along_axis(ends(T, T), best, axis=-1)[..., 0]
+    return results
+
+def von_mises_stress(normal, shear, flexion, sections: dict) -> tuple:
+    """
+    Von Mises stress of many sections at once (same formulas as Bar.resistance_analysis).
+    Parameters:
+    - normal, shear, flexion: Normal force, shear force and moment, broadcastable with the section properties.
+    - sections: Section properties, as returned by section_properties.
+    Returns:
+        tuple: Von Mises stress, normal stress and shear stress.
+    """
+    sigma = normal / sections['A'] + flexion / sections['I']
+    tau = (shear * sections['S']) / (sections['I'] * sections['b'])
+    return np.sqrt(sigma**2 + 3 * tau**2), sigma, tau
+
+def resistance_check(bars, n_samples: int = 100, arrays: dict = None, loads: tuple = None) -> dict:
+    """
+    Resistance check of the most stressed section of many bars at once (vectorized utils.check_resistance).
+    The most stressed section is the one with the largest |T| + |N| + |M|.
+    Parameters:
+    - bars: List of Bar objects.
+    - n_samples: Number of samples along each bar of the stress diagrams.
+    - arrays: Bar properties as returned by bar_arrays (default: computed from the bars).
+    - loads: Loads as returned by load_arrays (default: the loads of the bars).
+    Returns:
+        dict: position, normal, shear, flexion, von_mises, yield_strength, utilization and passed (one entry per bar).
+    """
+    bars = list(bars)
+    arrays = bar_arrays(bars) if arrays is None else arrays
+    # The governing section comes from the envelope: the diagrams are not needed
+    extremes = envelope(bars, n_samples, loads, arrays)
+    n, t, m = extremes['governing_normal'], extremes['governing_shear'], extremes['governing_flexion']
+    von_mises, _, _ = von_mises_stress(n, t, m, section_properties(arrays))
+    yield_strength = arrays['yield_strength']
+
+    return {
+        'position': extremes['governing_position'],
+        'normal': n,
+        'shear': t,
+        'flexion': m,
+        'von_mises': von_mises,
+        'yield_strength': yield_strength,
+        'utilization': von_mises / yield_strength,
+        'passed': von_mises < yield_strength,
+    }
+
+def bar_table(bars, checks: bool = True, n_samples: int = 100, offset: int = 0) -> pd.DataFrame:
+    """
+    Build a table of bar properties, loads and check results in one vectorized pass
+    (a parsable replacement of Bar.info).
+    Parameters:
+    - bars: List of Bar objects.
+    - checks: Add the results of the resistance check (see resistance_check).
+    - n_samples: Number of samples along each bar of the stress diagrams.
+    - offset: Index of the first bar (to number the rows of a chunk of a larger structure).
+    Returns:
+        pd.DataFrame: One row per bar. Lengths in mm, areas in mm^2, inertias in mm^4, forces in N, stresses in MPa.
+        The loads are listed in the 'loads' column as "position:fx,fy,m" separated by ';'.
+    """
+    bars = list(bars)
+    arrays = bar_arrays(bars)
+    sections = section_properties(arrays)
+    positions, forces, mask = load_arrays(bars)
+    volume = sections['A'] * arrays['length']
+
+    table = {
+        'bar': np.arange(offset, offset + len(bars)),
+        'start_node': [str(bar.start_node.id) for bar in bars],
+        'end_node': [str(bar.end_node.id) for bar in bars],
+    }
+    for key in ('x0', 'y0', 'x1', 'y1', 'length', 'alpha'):
+        table[key] = arrays[key]
+    table['section'] = np.where(arrays['circular'], 'circular', 'rectangular')
+    for key in ('hollow', 'width', 'height', 'radius', 'width_thickness', 'height_thickness'):
+        table[key] = arrays[key]
+    table['material'] = [bar.material for bar in bars]
+    for key in ('density', 'yield_strength', 'elastic_modulus'):
+        table[key] = arrays[key]
+    table.update({
+        'A': sections['A'],
+        'I': sections['I'],
+        'S': sections['S'],
+        'volume': volume,
+        'mass': volume * arrays['density'] * 10**-6,  # as Bar.mass
+        'n_loads': mask.sum(axis=1),
+        'fx_total': forces[..., 0].sum(axis=1),
+        'fy_total': forces[..., 1].sum(axis=1),
+        'm_total': forces[..., 2].sum(axis=1),
+        'loads': [";".join(f"{position:g}:{fx:g},{fy:g},{m:g}" for position, (fx, fy, m) in sorted(bar.load.items()))
+                  for bar in bars],
+    })
+    if checks:
+        results = resistance_check(bars, n_samples, arrays, (positions, forces, mask))
+        for key in ('position', 'normal', 'shear', 'flexion', 'von_mises', 'utilization', 'passed'):
+            table[key] = results[key]
+    return pd.DataFrame(table)
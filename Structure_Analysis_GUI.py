@@ -3,10 +3,29 @@ from Structure_Analysis import *
 import tkinter as tk
 from tkinter import ttk
 from utils import *
+from fem import deflections, modal_analysis
+from history import History
+from generators import scissor_frame, scissor_lift
+from response_surface import ResponseSurface
+
+# Bars along AE and along BD in the model of the mode shapes (the 6 modes of the spinbox within 0.1 %)
+MODE_ELEMENTS = 20
+# Delay (ms) after the last move of a slider before the exact update (mouse release runs it at once)
+SLIDER_UPDATE_DELAY = 300
 
 def main():
 
     structure = Structure(name="Test Structure")
+    # Pan/zoom state of the structure canvas (mouse wheel to zoom, drag to pan, double click to reset)
+    structure_view = StructureView()
+    # Running mode shape animation (replaced by the structure at the next update)
+    mode_animation = [None]
+    # Undo/redo history: snapshots of the structure with the values of the controls and the check results
+    history = History()
+    # Set while a state of the history is restored (its controls must not trigger a new update)
+    restoring = [False]
+    # Pending exact update of a slider move (id returned by root.after)
+    pending_update = [None]
 
     def update_structure_from_slider(_=None):
         angle = round(alpha_var.get(), 2)
@@ -20,7 +39,6 @@ def main():
         height = height_var.get()
 
         hollow =  section_type.get() == "hollow"
-        section_type.trace_add("write", lambda *args: update_structure_from_slider())
 
         if hollow:
             width_thickness = width_thickness_var.get()
@@ -32,70 +50,138 @@ def main():
         h = l * np.sin(np.deg2rad(angle))
         h_var.set(f"{h:.2f}")
 
-        # Redefine bars
-        bar1 = Bar(length=l, width=width, height=height, hollow=hollow, section='rectangular',
-                material='aluminum', alpha=angle, width_thickness=width_thickness, height_thickness=height_thickness)
-        bar2 = Bar(length=l, width=width, height=height, hollow=hollow, section='rectangular',
-                material='aluminum', alpha=180 - angle, width_thickness=width_thickness, height_thickness=height_thickness)
-        bar3 = Bar(length=l_platform, width=0.1, height=0.1, hollow=hollow, section='rectangular',
-                material='abs', alpha=0)
-
-        structure.add_bar(bar1)
-        structure.add_bar(bar2)
-        structure.add_bar(bar3)
-
-
-        bar1.start(Node("A", 0, 0))
-        bar1.end()
-
-        bar2.start(Node("D", l * np.cos(np.deg2rad(angle)), 0))
-        bar2.end()
-
-        bar3.start(Node("", -5, h))
-        bar3.end()
-        bar3.add_load(0.5, 0, -p, 0)
-
-        # Calculate the x-coordinate of the center of the platform
-        xbaricenter_platform = bar3.start_node.x + 0.5 * (bar3.end_node.x - bar3.start_node.x)
-        # Calculate the distance from the start node of bar1 to the center of the platform
-        d = xbaricenter_platform - bar1.start_node.x
-        f = p/np.tan(np.deg2rad(angle))
-        
-        # Add loads to the bars
-        # Bar AE
-        bar1.add_load(0, f, p - p * d / (l * np.cos(np.deg2rad(angle))), 0) #A
-        bar1.add_load(0.5, -f, (2*p*d/(l*np.cos(np.deg2rad(angle))))-p, 0) #C
-        bar1.add_load(1, 0, -p*d/(l*np.cos(np.deg2rad(angle))), 0) #E
-
-        # Bar BD
-        bar2.add_load(0, -f, p*d/(l*np.cos(np.deg2rad(angle))), 0) #B
-        bar2.add_load(1/2, f, -((2*p*d/(bar2.length*np.cos(np.deg2rad(angle)))) - p), 0) #C
-        bar2.add_load(1, 0, -(p - p*d/(l*np.cos(np.deg2rad(angle)))), 0) #D
-
-        # Calculate stresses 
-        stresses_bar1 = compute_stress(bar1)
-        # stresses_bar2 = compute_stress(bar2)
-
-        draw_structure_on_canvas(canvas_frame, structure)
-        draw_stress_on_canvas(canvas_frame2, bar1)
-        draw_stress_on_canvas(canvas_frame3, bar2)
+        # Redefine bars and loads
+        model = scissor_lift(angle, l, p, width, height, hollow, width_thickness, height_thickness, l_platform)
+        structure.bars.extend(model.bars)
+
+        # Record the new state (its resistance check is computed once and restored by undo/redo)
+        entry = history.push(structure, info=controls_state())
+        show_structure(entry)
+
+    def controls_state():
+        return {'alpha': alpha_var.get(), 'l': l_var.get(), 'p': p_var.get(), 'width': width_var.get(),
+                'height': height_var.get(), 'section': section_type.get(),
+                'width_thickness': width_thickness_var.get(), 'height_thickness': height_thickness_var.get()}
+
+    def show_structure(entry):
+        bar1 = structure.bars[0]
+
+        # Stop the mode shape animation before drawing the structure again
+        if mode_animation[0] is not None:
+            mode_animation[0].event_source.stop()
+            mode_animation[0] = None
+
+        show_deformed_shape()
+        draw_structure_on_canvas(canvas_frame, structure, structure_view)
+        stress_dashboard.set_structure(structure)
         draw_section_plot(resistance_canvas_frame, bar1)
 
-        # Finding the section of maximum stress along the bar --> The index is the position along the bar
-        proxy = abs(stresses_bar1[1]) + abs(stresses_bar1[2]) + abs(stresses_bar1[3])
-        idx = np.argmax(proxy)
-        
+        # Resistance check on the most stressed section (same as check_resistance, cached in the history)
+        result = entry.results[0]
+        show_resistance_check(result['position'], result['von_mises'], result['yield_strength'], bar1.material)
+
+        undo_button.state(["!disabled" if history.can_undo() else "disabled"])
+        redo_button.state(["!disabled" if history.can_redo() else "disabled"])
+
+    def restore(entry):
+        # Restore the controls and the bars of a state of the history, without analyzing it again
+        for var, key in ((alpha_var, 'alpha'), (l_var, 'l'), (p_var, 'p'), (width_var, 'width'), (height_var, 'height'),
+                         (width_thickness_var, 'width_thickness'), (height_thickness_var, 'height_thickness')):
+            var.set(entry.info[key])
+        if section_type.get() != entry.info['section']:
+            restoring[0] = True
+            try:
+                section_type.set(entry.info['section'])
+            finally:
+                restoring[0] = False
+        h_var.set(f"{entry.info['l'] * np.sin(np.deg2rad(entry.info['alpha'])):.2f}")
+        structure.bars[:] = entry.snapshot.to_structure().bars
+        show_structure(entry)
+
+    def undo(*args):
+        if history.can_undo():
+            restore(history.undo())
+
+    def redo(*args):
+        if history.can_redo():
+            restore(history.redo())
+
+    def crossing_bar_deflections(result):
+        # Maximum deflection of AE and BD from the deflections of their bars (see scissor_frame), relative
+        # to the chord of the whole bar
+        model = result['model']
+        n = len(model.length) // 2
+        for first in (0, n):
+            parts = result['displacements'][first:first + n]
+            displacements = np.concatenate([parts[0]] + [part[1:] for part in parts[1:]])
+            transverse = -model.sin[first] * displacements[:, 0] + model.cos[first] * displacements[:, 1]
+            xi = np.linspace(0, 1, len(transverse))
+            deflection = np.abs(transverse - ((1 - xi) * transverse[0] + xi * transverse[-1]))
+            worst = np.argmax(deflection)
+            yield deflection[worst], xi[worst] * model.length[first:first + n].sum()
+
+    def show_deformed_shape():
+        # Deformed shape overlay and maximum deflection of the scissor frame (drawn with the structure)
+        if not deformed_var.get():
+            structure_view.set_deformed(None)
+            deflection_label.config(text="Max deflection: -")
+            return
+        try:
+            scale = float(deformed_scale_var.get())
+            result = deflections(scissor_frame(structure))
+        except (ValueError, tk.TclError) as error:
+            structure_view.set_deformed(None)
+            show_temporary_message(mainframe, f"Deformed shape failed: {error}", 2000)
+            return
+        structure_view.set_deformed(result, scale if scale > 0 else None)  # scale 0: automatic
+        deflection_label.config(text="Max deflection: " + ", ".join(
+            f"{name} {d:.3g} (mm) at {x:.2f} (mm)" for name, (d, x) in zip(("AE", "BD"), crossing_bar_deflections(result))))
+
+    def show_resistance_check(position, von_mises_stress, limit, material, estimate=False):
+        # Estimates (slider moving) are marked with "~", the exact check replaces them when the slider is released
+        mark = "~" if estimate else ""
+
         # Update the label to show which is the most stressed section
-        most_stressed_section_label.config(text=f"Most stressed section is at: {np.round(stresses_bar1[0][idx+1], 2)} (mm)", foreground="black")
+        most_stressed_section_label.config(text=f"Most stressed section is at: {mark}{np.round(position, 2)} (mm)", foreground="black")
 
-        # Evaluate resistance check
-        von_mises_stress, limit, _, _ = bar1.resistance_analysis(stresses_bar1[1][idx], stresses_bar1[2][idx], stresses_bar1[3][idx])
         if von_mises_stress < limit:
             # Update the label to show the result
-            check_resistance_label.config(text=f"Resistance Check: PASS ✅\nVon Mises {np.round(von_mises_stress, 2)} (MPa) < {limit} (MPa) {bar1.material} yield strength", foreground="green")
+            check_resistance_label.config(text=f"Resistance Check: PASS ✅\nVon Mises {mark}{np.round(von_mises_stress, 2)} (MPa) < {limit} (MPa) {material} yield strength", foreground="green")
         else:
             # Update the label to show the result
-            check_resistance_label.config(text=f"Resistance Check: FAIL ❌\nVon Mises {np.round(von_mises_stress, 2)} (MPa) > {limit} (MPa) {bar1.material} yield strength", foreground="red") 
+            check_resistance_label.config(text=f"Resistance Check: FAIL ❌\nVon Mises {mark}{np.round(von_mises_stress, 2)} (MPa) > {limit} (MPa) {material} yield strength", foreground="red")
+
+    def exact_update_from_slider(_=None):
+        # Exact analysis and history entry of the slider values, replacing the preview
+        if pending_update[0] is not None:
+            root.after_cancel(pending_update[0])
+            pending_update[0] = None
+        update_structure_from_slider()
+
+    def schedule_update_from_slider(_=None):
+        # Exact update once the value stops changing (mouse drags, arrow keys and programmatic set alike)
+        if pending_update[0] is not None:
+            root.after_cancel(pending_update[0])
+        pending_update[0] = root.after(SLIDER_UPDATE_DELAY, exact_update_from_slider)
+
+    def preview_from_slider(_=None):
+        # Interpolate the results from the response surface while the slider moves (no preview until it is ready),
+        # the exact update follows when the value stops changing
+        schedule_update_from_slider()
+        if not response_surface.ready():
+            return
+        angle = round(alpha_var.get(), 2)
+        l = round(l_var.get(), 1)
+        try:
+            hollow = section_type.get() == "hollow"
+            material = structure.bars[0].material
+            result = response_surface.check(angle, l, p_var.get(), width_var.get(), height_var.get(), hollow,
+                                            width_thickness_var.get() if hollow else 0.0,
+                                            height_thickness_var.get() if hollow else 0.0, material)
+        except tk.TclError:
+            return
+        h_var.set(f"{float(result['h']):.2f}")
+        show_resistance_check(float(result['position']), float(result['von_mises']), result['yield_strength'], material, estimate=True)
 
     # Tkinter interface
     root = tk.Tk()
@@ -130,6 +216,10 @@ def main():
 
     width_thickness_var = tk.DoubleVar(value=0.0)
     height_thickness_var = tk.DoubleVar(value=0.0)
+
+    # Results tabulated over the slider ranges, computed in the background (see response_surface.py)
+    response_surface = ResponseSurface(alphas=np.linspace(10, 80, 71), lengths=np.linspace(l0, 2 * l0, 41), l_platform=l_platform)
+    response_surface.start()
     
     # Enable resizing
     root.rowconfigure(0, weight=1)
@@ -151,16 +241,12 @@ def main():
     stress_container = ttk.Frame(mainframe)
     stress_container.grid(row=0, column=1, sticky="nsew")
     # Configure stress_container grid
-    stress_container.rowconfigure(0, weight=1)  # Top stress plot
-    stress_container.rowconfigure(1, weight=1)  # Bottom stress plot
+    stress_container.rowconfigure(0, weight=1)  # Stress dashboard
     stress_container.columnconfigure(0, weight=1)  # Single column
 
-    # Stress canvases inside container (stacked vertically)
-    canvas_frame2 = ttk.Frame(stress_container)  # Top stress plot
-    canvas_frame2.grid(row=0, column=0, sticky="nsew")
-
-    canvas_frame3 = ttk.Frame(stress_container)  # Bottom stress plot
-    canvas_frame3.grid(row=1, column=0, sticky="nsew")  
+    # Scrollable list with the stress plots of every bar (rendered only when visible)
+    stress_dashboard = StressDashboard(stress_container)
+    stress_dashboard.grid(row=0, column=0, sticky="nsew")
 
     # Create a frame for controls (below canvases)
     controls_frame = ttk.Frame(mainframe)
@@ -204,6 +290,9 @@ def main():
     rbtn_full = ttk.Radiobutton(resistance_frame, text="Full", variable=section_type, value="full")
     rbtn_hollow = ttk.Radiobutton(resistance_frame, text="Hollow", variable=section_type, value="hollow")
 
+    # Update the structure when the section type changes (registered once, not at every update)
+    section_type.trace_add("write", lambda *args: restoring[0] or update_structure_from_slider())
+
     rbtn_full.grid(row=3, column=1, sticky="w", padx=5)
     rbtn_hollow.grid(row=4, column=1, sticky="w", padx=5)
 
@@ -228,8 +317,12 @@ def main():
     check_resistance_label = ttk.Label(resistance_frame, text="Resistance Check ...", font=("Arial", 24))
     check_resistance_label.grid(row=8, column=0, columnspan=2, sticky="ew", pady=10)
 
+    # Show the maximum deflection of the crossing bars (when the deformed shape is shown)
+    deflection_label = ttk.Label(resistance_frame, text="Max deflection: -", font=("Arial", 24))
+    deflection_label.grid(row=9, column=0, columnspan=2, sticky="ew", pady=10)
+
     # Row 2: Length slider
-    length_slider = ttk.Scale(controls_frame, from_=l0, to=2*l0, variable=l_var, orient='horizontal', command=update_structure_from_slider)
+    length_slider = ttk.Scale(controls_frame, from_=l0, to=2*l0, variable=l_var, orient='horizontal', command=preview_from_slider)
     length_label = ttk.Label(controls_frame, text="Length (l) (mm):", font=("Arial", 24))
     length_entry = ttk.Entry(controls_frame, textvariable=l_var, width=10, font=("Arial", 24))
 
@@ -238,7 +331,7 @@ def main():
     length_entry.grid(row=0, column=2, sticky="ew", padx=5)
 
     # Row 3: Alpha slider
-    angle_slider = ttk.Scale(controls_frame, from_=10, to=80, variable=alpha_var, orient='horizontal', command=update_structure_from_slider)
+    angle_slider = ttk.Scale(controls_frame, from_=10, to=80, variable=alpha_var, orient='horizontal', command=preview_from_slider)
     alpha_label = ttk.Label(controls_frame, text="Alpha angle (deg):", font=("Arial", 24))
     alpha_entry = ttk.Entry(controls_frame, textvariable=alpha_var, width=10, font=("Arial", 24))
 
@@ -260,6 +353,35 @@ def main():
     p_entry = ttk.Entry(controls_frame, textvariable=p_var, font=("Arial", 24))
     p_entry.grid(row=3, column=2, padx=5, sticky='e')
 
+    # Row 6: Mode shape animation
+    mode_var = tk.IntVar(value=1)
+    mode_label = ttk.Label(controls_frame, text="Mode shape (n):", font=("Arial", 24))
+    mode_label.grid(row=4, column=0, padx=5, sticky='w')
+
+    mode_spinbox = ttk.Spinbox(controls_frame, from_=1, to=6, textvariable=mode_var, width=5, font=("Arial", 24))
+    mode_spinbox.grid(row=4, column=1, padx=5, sticky='e')
+
+    mode_button = ttk.Button(controls_frame, text="Animate", command=lambda: show_mode_shape())
+    mode_button.grid(row=4, column=2, padx=5, sticky='ew')
+
+    # Row 7: Deformed shape overlay (scale 0: automatic)
+    deformed_var = tk.BooleanVar(value=False)
+    deformed_scale_var = tk.DoubleVar(value=0.0)
+    deformed_label = ttk.Label(controls_frame, text="Deformed shape scale (0: auto):", font=("Arial", 24))
+    deformed_label.grid(row=5, column=0, padx=5, sticky='w')
+
+    deformed_entry = ttk.Entry(controls_frame, textvariable=deformed_scale_var, width=10, font=("Arial", 24))
+    deformed_entry.grid(row=5, column=1, padx=5, sticky='e')
+
+    deformed_check = ttk.Checkbutton(controls_frame, text="Show", variable=deformed_var, command=lambda: update_structure_from_slider())
+    deformed_check.grid(row=5, column=2, padx=5, sticky='ew')
+
+    # Row 8: Undo/redo (also Ctrl+Z and Ctrl+Y)
+    undo_button = ttk.Button(controls_frame, text="Undo", command=undo)
+    undo_button.grid(row=6, column=0, padx=5, sticky='w')
+    redo_button = ttk.Button(controls_frame, text="Redo", command=redo)
+    redo_button.grid(row=6, column=2, padx=5, sticky='ew')
+
     # Function to apply entry manually
     def apply_alpha_from_entry(*args):
         try:
@@ -349,6 +471,18 @@ def main():
         except ValueError:
             show_temporary_message(mainframe, "Invalid input for Height thickness", 2000)
 
+    def show_mode_shape():
+        try:
+            n = int(mode_var.get())
+            if n < 1:
+                raise ValueError("the mode number must be >= 1")
+            frequencies, modes, model = modal_analysis(scissor_frame(structure, n_elements=MODE_ELEMENTS), k=n)
+        except (ValueError, tk.TclError) as error:
+            show_temporary_message(mainframe, f"Modal analysis failed: {error}", 2000)
+            return
+        # Keep a reference to the animation, or it is garbage collected
+        mode_animation[0] = animate_mode_shape(canvas_frame, model, modes[:, n - 1], frequencies[n - 1])
+
     # Optional: bind Enter key in the Entry box
     alpha_entry.bind("<Return>", apply_alpha_from_entry)
     h_entry.bind("<Return>", apply_h_from_entry)
@@ -358,11 +492,17 @@ def main():
     height_entry.bind("<Return>", apply_height_from_entry)
     width_thickness_entry.bind("<Return>", apply_width_thickness_from_entry)
     height_thickness_entry.bind("<Return>", apply_height_thickness_from_entry)
+    deformed_entry.bind("<Return>", lambda e: update_structure_from_slider())
+    root.bind("<Control-z>", undo)
+    root.bind("<Control-y>", redo)
     
+    # Exact analysis when a slider is released, or after a pause of the keyboard moves
+    for slider in (length_slider, angle_slider):
+        slider.bind("<ButtonRelease-1>", exact_update_from_slider)
+        slider.bind("<KeyRelease>", schedule_update_from_slider)
+
     # Bind <Configure> events
-    canvas_frame.bind("<Configure>", lambda e: draw_structure_on_canvas(canvas_frame, structure))
-    canvas_frame2.bind("<Configure>", lambda e: draw_stress_on_canvas(canvas_frame2, structure.bars[0]))
-    canvas_frame3.bind("<Configure>", lambda e: draw_stress_on_canvas(canvas_frame3, structure.bars[1]))
+    canvas_frame.bind("<Configure>", lambda e: draw_structure_on_canvas(canvas_frame, structure, structure_view))
 
     resistance_canvas_frame.bind("<Configure>", lambda e: draw_section_plot(resistance_canvas_frame, structure.bars[0]))
     
@@ -0,0 +1,80 @@
+import numpy as np
+from scipy.sparse.linalg import LinearOperator, eigsh
+from Structure_Analysis import Structure, bar_arrays, internal_forces, section_properties
+from fem import FrameModel, factorize
+
+
+def euler_check(structure: Structure, k_factor=1.0, n_samples: int = 100) -> dict:
+    """
+    Euler buckling check of every bar of the structure, vectorized over all the bars.
+    The compression is the most negative normal force of the stress diagrams (see internal_forces)
+    and the critical load is N_cr = pi^2 E I / (k L)^2, with I from the moment of inertia of the section.
+    Parameters:
+    - structure: Structure object.
+    - k_factor: Effective length factor, scalar or one value per bar (1 for pinned-pinned, 2 for a cantilever...).
+    - n_samples: Number of samples along each bar of the stress diagrams.
+    Returns:
+        dict: compression (N), position (mm), critical_load (N), utilization and passed (one entry per bar).
+    """
+    arrays = bar_arrays(structure.bars)
+    sections = section_properties(arrays)
+    x_data, _, normal, _ = internal_forces(structure.bars, n_samples)
+
+    idx = np.argmin(normal, axis=1)
+    rows = np.arange(len(idx))
+    compression = np.maximum(-normal[rows, idx], 0.0)
+    effective_length = np.asarray(k_factor) * arrays['length']
+    critical_load = np.pi**2 * arrays['elastic_modulus'] * sections['I'] / effective_length**2
+    utilization = compression / critical_load
+
+    return {
+        'compression': compression,
+        'position': x_data[rows, idx],
+        'critical_load': critical_load,
+        'utilization': utilization,
+        'passed': utilization < 1,
+    }
+
+def linear_buckling(structure: Structure, k: int = 1, axial_forces: np.ndarray = None, tol: float = 1e-6) -> tuple:
+    """
+    Global linear buckling analysis: (K + lambda K_G) phi = 0.
+    The axial forces of the reference state come from a linear static analysis under the loads of the bars,
+    unless they are given. The eigenproblem is solved as -K_G phi = (1 / lambda) K phi with a sparse
+    eigensolver, using a single factorization of K.
+    Parameters:
+    - structure: Structure object, with enough supports to prevent rigid body motions.
+    - k: Number of buckling modes to compute.
+    - axial_forces: Axial force of every bar in the reference state (tension positive), optional.
+    - tol: Relative accuracy of the eigenvalues (the default is enough for design and much faster than machine precision).
+    Returns:
+        tuple: critical load factors (k,), buckling modes on all the dofs (n_dofs, k), FrameModel.
+    """
+    model = FrameModel(structure)
+    # Checks of the arguments before the assembly and factorization of the matrices
+    n_free = len(model.free)
+    if n_free == 0:
+        raise ValueError("All the dofs are supported: the structure cannot buckle.")
+    if not 1 <= k < n_free:
+        raise ValueError(f"k must be at least 1 and lower than the number of free dofs ({n_free}).")
+
+    K = model.reduce(model.stiffness())
+    lu = factorize(K)
+
+    if axial_forces is None:
+        u = model.expand(lu.solve(model.load_vector()[model.free]))
+        if not np.all(np.isfinite(u)):
+            raise ValueError("The stiffness matrix is singular: add supports to prevent rigid body motions.")
+        axial_forces = model.axial_forces(model.end_forces(u))
+    if not np.any(axial_forces < 0):
+        raise ValueError("No bar is compressed: the structure cannot buckle under these loads.")
+
+    KG = model.reduce(model.assemble(model.to_global(model.local_geometric_stiffness(axial_forces))))
+
+    # Largest 1 / lambda <=> smallest positive load factor
+    Kinv = LinearOperator(K.shape, matvec=lu.solve, dtype=float)
+    mu, modes = eigsh(-KG, k=k, M=K, Minv=Kinv, which='LA', tol=tol)
+    order = np.argsort(-mu)
+    mu = mu[order]
+    with np.errstate(divide='ignore'):
+        load_factors = np.where(mu > 0, 1 / mu, np.inf)
+    return load_factors, model.expand(modes[:, order]), model
@@ -0,0 +1,565 @@
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import LinearOperator, eigsh, splu
+from Structure_Analysis import Structure, bar_arrays, load_arrays, section_properties
+
+# Units: mm, N, MPa, tonne (t) and s. With these units the densities in kg/m^3 are converted to t/mm^3.
+DENSITY_TO_T_PER_MM3 = 1e-12
+
+
+# FrameModel class
+# Finite element model (2D Euler-Bernoulli frame, 3 dofs per node: ux, uy, rz) of a Structure.
+# Element matrices are computed for all the bars at once and assembled in sparse matrices.
+class FrameModel:
+    def __init__(self, structure: Structure, decimals: int = 3):
+        """
+        Build the finite element model of a structure.
+        Bars sharing a node (same coordinates, rounded to `decimals`) are connected.
+        Parameters:
+        - structure: Structure object with the bars and the supports.
+        - decimals: Number of decimals used to merge coincident nodes (default is 3, as Bar.check_on_length).
+        """
+        self.structure = structure
+        self.decimals = decimals
+        arrays = bar_arrays(structure.bars)
+        sections = section_properties(arrays)
+
+        # Node table: merge the coincident end nodes of the bars
+        ends = np.stack([arrays['x0'], arrays['y0'], arrays['x1'], arrays['y1']], axis=1).reshape(-1, 2)
+        self.coords, inverse = np.unique(np.round(ends, decimals), axis=0, return_inverse=True)
+        self.connectivity = inverse.reshape(-1, 2)
+        self.n_nodes = len(self.coords)
+        self.n_dofs = 3 * self.n_nodes
+
+        # Element dofs: (ux, uy, rz) of the start node, then of the end node
+        self.dofs = (3 * self.connectivity[:, :, None] + np.arange(3)).reshape(-1, 6)
+
+        # Element geometry from the node coordinates
+        delta = self.coords[self.connectivity[:, 1]] - self.coords[self.connectivity[:, 0]]
+        self.length = np.hypot(delta[:, 0], delta[:, 1])
+        if np.any(self.length == 0):
+            raise ValueError("Bars {} have zero length.".format(np.flatnonzero(self.length == 0).tolist()))
+        self.cos = delta[:, 0] / self.length
+        self.sin = delta[:, 1] / self.length
+
+        self.E = arrays['elastic_modulus']
+        self.A = sections['A']
+        self.I = sections['I']
+        self.rho = arrays['density'] * DENSITY_TO_T_PER_MM3
+
+        # Supports
+        self.fixed = np.zeros(self.n_dofs, dtype=bool)
+        for node, constraints in structure.supports:
+            index = self.find_node(node.x, node.y)
+            if index is None:
+                raise ValueError(f"Support at node {node.id} ({node.x}, {node.y}) is not connected to any bar.")
+            self.fixed[3 * index:3 * index + 3] |= np.array(constraints, dtype=bool)
+        self.free = np.flatnonzero(~self.fixed)
+
+    def update_bars(self, bars) -> np.ndarray:
+        """
+        Read again the section, material and node coordinates of some bars after an edit.
+        The topology must not change: bars sharing a node before the edit must still share it.
+        Parameters:
+        - bars: Indices of the edited bars.
+        Returns:
+            np.ndarray: Indices of the bars whose element matrices changed (the edited bars and,
+            when a node moved, all the bars connected to it).
+        """
+        bars = np.unique(np.atleast_1d(bars))
+        arrays = bar_arrays([self.structure.bars[i] for i in bars])
+        sections = section_properties(arrays)
+        self.E[bars] = arrays['elastic_modulus']
+        self.A[bars] = sections['A']
+        self.I[bars] = sections['I']
+        self.rho[bars] = arrays['density'] * DENSITY_TO_T_PER_MM3
+
+        # Move the nodes of the edited bars and update the geometry of every bar connected to them
+        ends = np.stack([arrays['x0'], arrays['y0'], arrays['x1'], arrays['y1']], axis=1).reshape(-1, 2)
+        nodes = self.connectivity[bars].ravel()
+        moved = nodes[np.any(self.coords[nodes] != np.round(ends, self.decimals), axis=1)]
+        self.coords[nodes] = np.round(ends, self.decimals)
+        if len(moved):
+            bars = np.union1d(bars, np.flatnonzero(np.isin(self.connectivity, moved).any(axis=1)))
+        delta = self.coords[self.connectivity[bars, 1]] - self.coords[self.connectivity[bars, 0]]
+        self.length[bars] = np.hypot(delta[:, 0], delta[:, 1])
+        if np.any(self.length[bars] == 0):
+            raise ValueError("Bars {} have zero length.".format(bars[self.length[bars] == 0].tolist()))
+        self.cos[bars] = delta[:, 0] / self.length[bars]
+        self.sin[bars] = delta[:, 1] / self.length[bars]
+        return bars
+
+    def find_node(self, x: float, y: float):
+        """Return the index of the node at (x, y), or None if there is no node there."""
+        match = np.flatnonzero(np.all(self.coords == np.round([x, y], self.decimals), axis=1))
+        return int(match[0]) if len(match) else None
+
+    def dof(self, x: float, y: float, component: int) -> int:
+        """
+        Return the index of a dof, e.g. to fill a matrix of nodal load cases.
+        Parameters:
+        - x, y: Coordinates of the node.
+        - component: 0 for ux (fx), 1 for uy (fy), 2 for rz (m).
+        """
+        index = self.find_node(x, y)
+        if index is None:
+            raise ValueError(f"There is no node at ({x}, {y}).")
+        return 3 * index + component
+
+    def rotation(self, bars=None) -> np.ndarray:
+        """Return the (n_bars, 6, 6) rotation matrices from global to local element dofs (optionally of some bars only)."""
+        cos = self.cos if bars is None else self.cos[bars]
+        sin = self.sin if bars is None else self.sin[bars]
+        T = np.zeros((len(cos), 6, 6))
+        for k in (0, 3):
+            T[:, k, k] = T[:, k + 1, k + 1] = cos
+            T[:, k, k + 1] = sin
+            T[:, k + 1, k] = -sin
+            T[:, k + 2, k + 2] = 1.0
+        return T
+
+    def local_stiffness(self, bars=None) -> np.ndarray:
+        """Return the (n_bars, 6, 6) element stiffness matrices in local coordinates (optionally of some bars only)."""
+        select = slice(None) if bars is None else bars
+        E = self.E[select]
+        A = self.A[select]
+        I = self.I[select]
+        L = self.length[select]
+        axial = E * A / L
+        k12, k6, k4, k2 = 12 * E * I / L**3, 6 * E * I / L**2, 4 * E * I / L, 2 * E * I / L
+
+        k = np.zeros((len(L), 6, 6))
+        k[:, 0, 0] = k[:, 3, 3] = axial
+        k[:, 0, 3] = k[:, 3, 0] = -axial
+        k[:, 1, 1] = k[:, 4, 4] = k12
+        k[:, 1, 4] = k[:, 4, 1] = -k12
+        k[:, 1, 2] = k[:, 2, 1] = k[:, 1, 5] = k[:, 5, 1] = k6
+        k[:, 2, 4] = k[:, 4, 2] = k[:, 4, 5] = k[:, 5, 4] = -k6
+        k[:, 2, 2] = k[:, 5, 5] = k4
+        k[:, 2, 5] = k[:, 5, 2] = k2
+        return k
+
+    def local_mass(self, lumped: bool = False) -> np.ndarray:
+        """Return the (n_bars, 6, 6) consistent (or lumped) element mass matrices in local coordinates."""
+        L = self.length
+        m = self.rho * self.A * L
+        M = np.zeros((len(L), 6, 6))
+        if lumped:
+            # Half of the mass at each node, rotary inertia of half of the bar about its end
+            for k in (0, 1, 3, 4):
+                M[:, k, k] = m / 2
+            M[:, 2, 2] = M[:, 5, 5] = m * L**2 / 24
+            return M
+
+        M[:, 0, 0] = M[:, 3, 3] = m / 3
+        M[:, 0, 3] = M[:, 3, 0] = m / 6
+        c = m / 420
+        M[:, 1, 1] = M[:, 4, 4] = 156 * c
+        M[:, 1, 4] = M[:, 4, 1] = 54 * c
+        M[:, 1, 2] = M[:, 2, 1] = 22 * L * c
+        M[:, 4, 5] = M[:, 5, 4] = -22 * L * c
+        M[:, 1, 5] = M[:, 5, 1] = -13 * L * c
+        M[:, 2, 4] = M[:, 4, 2] = 13 * L * c
+        M[:, 2, 2] = M[:, 5, 5] = 4 * L**2 * c
+        M[:, 2, 5] = M[:, 5, 2] = -3 * L**2 * c
+        return M
+
+    def local_geometric_stiffness(self, N: np.ndarray) -> np.ndarray:
+        """
+        Return the (n_bars, 6, 6) element geometric stiffness matrices in local coordinates.
+        Parameters:
+        - N: Axial force of every bar (tension positive).
+        """
+        L = self.length
+        c = N / L
+        kg = np.zeros((len(L), 6, 6))
+        kg[:, 1, 1] = kg[:, 4, 4] = 6 / 5 * c
+        kg[:, 1, 4] = kg[:, 4, 1] = -6 / 5 * c
+        kg[:, 1, 2] = kg[:, 2, 1] = kg[:, 1, 5] = kg[:, 5, 1] = L / 10 * c
+        kg[:, 2, 4] = kg[:, 4, 2] = kg[:, 4, 5] = kg[:, 5, 4] = -L / 10 * c
+        kg[:, 2, 2] = kg[:, 5, 5] = 2 * L**2 / 15 * c
+        kg[:, 2, 5] = kg[:, 5, 2] = -L**2 / 30 * c
+        return kg
+
+    def to_global(self, local: np.ndarray, bars=None) -> np.ndarray:
+        """Rotate (n_bars, 6, 6) element matrices (optionally of some bars only) from local to global coordinates (T^T k T)."""
+        T = self.rotation(bars)
+        return np.einsum('eji,ejk,ekl->eil', T, local, T)
+
+    def assemble(self, element_matrices: np.ndarray, bars=None) -> sp.csr_matrix:
+        """
+        Assemble (n, 6, 6) global element matrices in a sparse (n_dofs, n_dofs) matrix.
+        Parameters:
+        - element_matrices: Element matrices in global coordinates.
+        - bars: Indices of the bars of element_matrices (default: all the bars).
+        """
+        dofs = self.dofs if bars is None else self.dofs[bars]
+        rows = np.broadcast_to(dofs[:, :, None], element_matrices.shape).ravel()
+        cols = np.broadcast_to(dofs[:, None, :], element_matrices.shape).ravel()
+        return sp.coo_matrix((element_matrices.ravel(), (rows, cols)), shape=(self.n_dofs, self.n_dofs)).tocsr()
+
+    def stiffness(self) -> sp.csr_matrix:
+        """Return the global stiffness matrix (all dofs, supports not applied)."""
+        return self.assemble(self.to_global(self.local_stiffness()))
+
+    def mass(self, lumped: bool = False) -> sp.csr_matrix:
+        """Return the global mass matrix (all dofs, supports not applied)."""
+        return self.assemble(self.to_global(self.local_mass(lumped)))
+
+    def local_loads(self, loads: tuple = None) -> tuple:
+        """
+        Return the loads along the bars in local coordinates: positions (fraction of the length),
+        axial and transverse forces, moments and mask, each of shape (n_bars, n_loads).
+        Parameters:
+        - loads: Loads as returned by load_arrays (default: the loads of the bars).
+        """
+        positions, forces, mask = load_arrays(self.structure.bars) if loads is None else loads
+        c = self.cos[:, None]
+        s = self.sin[:, None]
+        fx, fy, m = forces[..., 0], forces[..., 1], forces[..., 2]
+        return positions, fx * c + fy * s, -fx * s + fy * c, m, mask
+
+    def equivalent_loads(self, loads: tuple = None) -> np.ndarray:
+        """
+        Return the (n_bars, 6) nodal loads, in local coordinates, equivalent to the loads along the bars
+        (work-equivalent through the beam shape functions).
+        Parameters:
+        - loads: Loads as returned by load_arrays (default: the loads of the bars).
+          The positions are fractions of the length of the bar, as in compute_stress.
+        """
+        xi, axial, transverse, m, mask = self.local_loads(loads)
+        L = self.length[:, None]
+
+        f = np.stack([
+            (1 - xi) * axial,
+            (1 - 3 * xi**2 + 2 * xi**3) * transverse + (-6 * xi + 6 * xi**2) / L * m,
+            (xi - 2 * xi**2 + xi**3) * L * transverse + (1 - 4 * xi + 3 * xi**2) * m,
+            xi * axial,
+            (3 * xi**2 - 2 * xi**3) * transverse + (6 * xi - 6 * xi**2) / L * m,
+            (-xi**2 + xi**3) * L * transverse + (-2 * xi + 3 * xi**2) * m,
+        ], axis=-1)
+        return (f * mask[..., None]).sum(axis=1)
+
+    def load_vector(self, loads: tuple = None) -> np.ndarray:
+        """Return the global load vector (all dofs) equivalent to the loads along the bars."""
+        f = np.einsum('eji,ej->ei', self.rotation(), self.equivalent_loads(loads))
+        F = np.zeros(self.n_dofs)
+        np.add.at(F, self.dofs, f)
+        return F
+
+    def end_forces(self, u: np.ndarray, loads: tuple = None) -> np.ndarray:
+        """
+        Return the (n_bars, 6) forces applied by the nodes on the bars, in local coordinates
+        (start: axial, shear, moment, then end: axial, shear, moment).
+        Parameters:
+        - u: Displacements of all the dofs.
+        - loads: Loads along the bars used for u (default: the loads of the bars).
+        """
+        return self.nodal_end_forces(u) - self.equivalent_loads(loads)
+
+    def nodal_end_forces(self, u: np.ndarray) -> np.ndarray:
+        """
+        Return the forces applied by the nodes on the bars due to the nodal displacements only (k T u),
+        in local coordinates. u can have one column per load case: the result is then (n_bars, 6, n_cases).
+        """
+        kT = self.local_stiffness() @ self.rotation()
+        ue = u[self.dofs]
+        if ue.ndim == 2:
+            return np.einsum('eij,ej->ei', kT, ue)
+        return kT @ ue
+
+    def axial_forces(self, end_forces: np.ndarray, loads: tuple = None) -> np.ndarray:
+        """
+        Return the axial force (tension positive) of every bar, averaged along its length.
+        Parameters:
+        - end_forces: End forces of the bars, as returned by end_forces.
+        - loads: Loads along the bars used for end_forces (default: the loads of the bars).
+        """
+        xi, axial, _, _, mask = self.local_loads(loads)
+        return -end_forces[:, 0] - (axial * (1 - xi) * mask).sum(axis=1)
+
+    def reduce(self, matrix: sp.spmatrix) -> sp.csc_matrix:
+        """Keep only the free dofs (rows and columns) of a global matrix."""
+        return matrix.tocsr()[self.free][:, self.free].tocsc()
+
+    def expand(self, values: np.ndarray) -> np.ndarray:
+        """Expand vectors on the free dofs (first axis) to all the dofs, with zeros on the supports."""
+        full = np.zeros((self.n_dofs,) + values.shape[1:])
+        full[self.free] = values
+        return full
+
+    def interpolate(self, u: np.ndarray, n_points: int = 11) -> np.ndarray:
+        """
+        Interpolate nodal displacements along the bars with the beam shape functions
+        (linear for the axial displacement, cubic Hermite for the transverse one).
+        Parameters:
+        - u: Displacements of all the dofs.
+        - n_points: Number of points along each bar.
+        Returns:
+            np.ndarray: (n_bars, n_points, 2) global displacements (ux, uy) along the bars.
+        """
+        local = np.einsum('eij,ej->ei', self.rotation(), u[self.dofs])
+        xi = np.linspace(0, 1, n_points)
+        L = self.length[:, None]
+        axial = (1 - xi) * local[:, [0]] + xi * local[:, [3]]
+        transverse = ((1 - 3 * xi**2 + 2 * xi**3) * local[:, [1]] + (xi - 2 * xi**2 + xi**3) * L * local[:, [2]]
+                      + (3 * xi**2 - 2 * xi**3) * local[:, [4]] + (-xi**2 + xi**3) * L * local[:, [5]])
+        c = self.cos[:, None]
+        s = self.sin[:, None]
+        return np.stack([c * axial - s * transverse, s * axial + c * transverse], axis=-1)
+
+    def span_displacements(self, n_points: int = 11, loads: tuple = None) -> np.ndarray:
+        """
+        Displacements along the bars due to the loads between the nodes, with both ends clamped (zero end
+        displacements and rotations): the exact displacements are interpolate(u) plus these ones.
+        Each load is the cantilever solution from the start node (exact Euler-Bernoulli) minus the cubic
+        fixing its end displacement and rotation, for all the bars, loads and points at once.
+        Parameters:
+        - n_points: Number of points along each bar.
+        - loads: Loads as returned by load_arrays (default: the loads of the bars).
+        Returns:
+            np.ndarray: (n_bars, n_points, 2) local displacements (axial, transverse) along the bars.
+        """
+        a, axial, transverse, m, mask = self.local_loads(loads)
+        L = self.length[:, None, None]
+        EA = (self.E * self.A)[:, None, None]
+        EI = (self.E * self.I)[:, None, None]
+        x = np.linspace(0, 1, n_points)[None, :, None] * L  # (n_bars, n_points, 1) against loads (n_bars, 1, n_loads)
+        a = a[:, None, :] * L
+        axial, transverse, m = (np.where(mask, values, 0.0)[:, None, :] for values in (axial, transverse, m))
+
+        # Cantilever clamped at the start node: displacement at x and at the end, rotation at the end
+        before = x <= a
+        u = axial * np.minimum(x, a) / EA
+        v = (transverse * np.where(before, x**2 * (3 * a - x), a**2 * (3 * x - a)) / 6
+             + m * np.where(before, x**2, a * (2 * x - a)) / 2) / EI
+        u_end = axial * a / EA
+        v_end = (transverse * a**2 * (3 * L - a) / 6 + m * a * (2 * L - a) / 2) / EI
+        theta_end = (transverse * a**2 / 2 + m * a) / EI
+
+        # Clamp the end node (shape functions of the end dofs)
+        xi = x / L
+        u = u - xi * u_end
+        v = v - (3 * xi**2 - 2 * xi**3) * v_end - (-xi**2 + xi**3) * L * theta_end
+        return np.stack([u.sum(axis=2), v.sum(axis=2)], axis=-1)
+
+    def deformed(self, u: np.ndarray, n_points: int = 11, loads: tuple = None) -> np.ndarray:
+        """
+        Exact displacements along the bars under the loads of a static solution: the nodal displacements
+        interpolated with the beam shape functions plus the displacements due to the loads along the bars.
+        Parameters:
+        - u: Displacements of all the dofs (from StaticSolver.solve or solve_static).
+        - n_points: Number of points along each bar.
+        - loads: Loads used for u (default: the loads of the bars).
+        Returns:
+            np.ndarray: (n_bars, n_points, 2) global displacements (ux, uy) along the bars.
+        """
+        span = self.span_displacements(n_points, loads)
+        c = self.cos[:, None]
+        s = self.sin[:, None]
+        return self.interpolate(u, n_points) + np.stack([c * span[..., 0] - s * span[..., 1],
+                                                         s * span[..., 0] + c * span[..., 1]], axis=-1)
+
+    def positions(self, n_points: int = 11) -> np.ndarray:
+        """Return the (n_bars, n_points, 2) undeformed coordinates of the points used by interpolate."""
+        xi = np.linspace(0, 1, n_points)[None, :, None]
+        start = self.coords[self.connectivity[:, 0]][:, None, :]
+        end = self.coords[self.connectivity[:, 1]][:, None, :]
+        return start + xi * (end - start)
+
+def factorize(matrix: sp.spmatrix):
+    """
+    Sparse LU factorization of a symmetric matrix (e.g. a reduced stiffness matrix).
+    A symmetric fill-reducing ordering with diagonal pivoting is used, which is much faster
+    and sparser than the default column ordering for stiffness matrices.
+    Returns:
+        scipy.sparse.linalg.SuperLU: Factorization, with a solve(b) method (b can have many columns).
+    """
+    try:
+        return splu(sp.csc_matrix(matrix), permc_spec='MMD_AT_PLUS_A', diag_pivot_thresh=0,
+                    options=dict(SymmetricMode=True))
+    except RuntimeError as error:
+        raise ValueError(f"The stiffness matrix is singular ({error}): add supports to prevent rigid body motions.")
+
+# StaticSolver class
+# Linear static solver keeping the factorization of the stiffness matrix between solves.
+# After an edit of a few bars the stiffness changes by a low-rank term, which is taken into account with the
+# Sherman-Morrison-Woodbury identity instead of a new factorization:
+#   (K + P C P^T)^-1 b = y - Z C (I + P^T Z C)^-1 P^T y,   y = K^-1 b,  Z = K^-1 P
+# where P selects the free dofs of the edited bars and C is the change of stiffness on those dofs.
+class StaticSolver:
+    def __init__(self, structure: Structure, max_rank: int = 300):
+        """
+        Build the finite element model of a structure and factorize its stiffness matrix.
+        Parameters:
+        - structure: Structure object, with enough supports to prevent rigid body motions.
+        - max_rank: Maximum number of dofs touched by the edits before the matrix is factorized again.
+        """
+        self.structure = structure
+        self.max_rank = max_rank
+        self.model = FrameModel(structure)
+        self.free_index = np.full(self.model.n_dofs, -1)
+        self.free_index[self.model.free] = np.arange(len(self.model.free))
+        self.factorize()
+
+    def factorize(self):
+        """Factorize the current stiffness matrix and forget the low-rank updates."""
+        self.elements = self.model.to_global(self.model.local_stiffness())
+        self.lu = factorize(self.model.reduce(self.model.assemble(self.elements)))
+        self.update_dofs = np.zeros(0, dtype=int)
+        self.C = np.zeros((0, 0))
+        self.Z = np.zeros((len(self.model.free), 0))
+
+    @property
+    def rank(self) -> int:
+        """Number of dofs touched by the edits since the last factorization."""
+        return len(self.update_dofs)
+
+    def update_bars(self, bars):
+        """
+        Take into account an edit of the section, material or geometry of some bars (see FrameModel.update_bars).
+        The cost is a few back-substitutions, unless the edits since the last factorization touch more than
+        max_rank dofs, in which case the stiffness matrix is factorized again.
+        Parameters:
+        - bars: Indices of the edited bars.
+        """
+        bars = self.model.update_bars(bars)
+        new = self.model.to_global(self.model.local_stiffness(bars), bars)
+        delta = new - self.elements[bars]
+        self.elements[bars] = new
+
+        dofs = self.free_index[self.model.dofs[bars]]
+        added = np.setdiff1d(dofs[dofs >= 0], self.update_dofs)
+        if self.rank + len(added) > self.max_rank:
+            self.factorize()
+            return
+
+        # New columns of Z = K^-1 P, one multi-RHS back-substitution
+        columns = np.zeros((len(self.model.free), len(added)))
+        columns[added, np.arange(len(added))] = 1.0
+        self.Z = np.hstack([self.Z, self.lu.solve(columns)]) if len(added) else self.Z
+        self.update_dofs = np.concatenate([self.update_dofs, added])
+        C = np.zeros((self.rank, self.rank))
+        C[:self.C.shape[0], :self.C.shape[1]] = self.C
+
+        # Accumulate the change of the element matrices on the free dofs
+        slot = np.full(len(self.model.free), -1)
+        slot[self.update_dofs] = np.arange(self.rank)
+        rows = np.broadcast_to(dofs[:, :, None], delta.shape)
+        cols = np.broadcast_to(dofs[:, None, :], delta.shape)
+        keep = (rows >= 0) & (cols >= 0)
+        np.add.at(C, (slot[rows[keep]], slot[cols[keep]]), delta[keep])
+        self.C = C
+
+    def solve_free(self, F: np.ndarray) -> np.ndarray:
+        """Solve the current stiffness matrix on the free dofs (F can have one column per load case)."""
+        y = self.lu.solve(F)
+        if self.rank:
+            D = self.update_dofs
+            capacitance = np.eye(self.rank) + self.Z[D] @ self.C
+            y = y - self.Z @ (self.C @ np.linalg.solve(capacitance, y[D]))
+        return y
+
+    def solve_cases(self, F: np.ndarray) -> tuple:
+        """
+        Solve many nodal load cases at once: one blocked back-substitution on the existing factorization.
+        Parameters:
+        - F: Nodal loads of all the dofs, one column per load case (n_dofs, n_cases).
+          Loads on the supported dofs are ignored. See FrameModel.dof for the numbering of the dofs.
+        Returns:
+            tuple: displacements (n_dofs, n_cases), end forces of the bars (n_bars, 6, n_cases).
+        """
+        F = np.asarray(F, dtype=float)
+        if F.ndim != 2 or F.shape[0] != self.model.n_dofs:
+            raise ValueError(f"F must have shape (n_dofs, n_cases) with n_dofs = {self.model.n_dofs}.")
+        u = self.model.expand(self.solve_free(F[self.model.free]))
+        if not np.all(np.isfinite(u)):
+            raise ValueError("The stiffness matrix is singular: add supports to prevent rigid body motions.")
+        return u, self.model.nodal_end_forces(u)
+
+    def solve(self, loads: tuple = None) -> tuple:
+        """
+        Solve the structure under the loads of its bars.
+        Parameters:
+        - loads: Loads as returned by load_arrays (default: the loads of the bars).
+        Returns:
+            tuple: displacements of all the dofs (n_dofs,), end forces of the bars (n_bars, 6).
+        """
+        u = self.model.expand(self.solve_free(self.model.load_vector(loads)[self.model.free]))
+        if not np.all(np.isfinite(u)):
+            raise ValueError("The stiffness matrix is singular: add supports to prevent rigid body motions.")
+        return u, self.model.end_forces(u, loads)
+
+def solve_static(structure: Structure, loads: tuple = None) -> tuple:
+    """
+    Linear static analysis of a structure under the loads of its bars.
+    Parameters:
+    - structure: Structure object, with enough supports to prevent rigid body motions.
+    - loads: Loads as returned by load_arrays (default: the loads of the bars).
+    Returns:
+        tuple: displacements of all the dofs (n_dofs,), end forces of the bars (n_bars, 6), FrameModel.
+    """
+    solver = StaticSolver(structure)
+    u, end_forces = solver.solve(loads)
+    return u, end_forces, solver.model
+
+def modal_analysis(structure: Structure, k: int = 6, lumped: bool = False, sigma: float = 0.0) -> tuple:
+    """
+    Compute the first natural frequencies and mode shapes of a structure.
+    The sparse stiffness and mass matrices are assembled on the free dofs and the generalized eigenproblem
+    K phi = omega^2 M phi is solved with a shift-invert sparse eigensolver (no dense matrices are built).
+    Parameters:
+    - structure: Structure object, with enough supports to prevent rigid body motions.
+    - k: Number of modes to compute.
+    - lumped: Use lumped instead of consistent mass matrices.
+    - sigma: Shift (in (rad/s)^2) around which the eigenvalues are searched (default 0: lowest modes).
+    Returns:
+        tuple: frequencies in Hz (k,), mode shapes on all the dofs (n_dofs, k), FrameModel.
+    """
+    model = FrameModel(structure)
+    K = model.reduce(model.stiffness())
+    M = model.reduce(model.mass(lumped))
+    if k >= K.shape[0]:
+        raise ValueError(f"k must be lower than the number of free dofs ({K.shape[0]}).")
+
+    # Shift-invert operator (K - sigma M)^-1 from a single sparse factorization
+    lu = factorize(K - sigma * M)
+    OPinv = LinearOperator(K.shape, matvec=lu.solve, dtype=float)
+    eigenvalues, modes = eigsh(K, k=k, M=M, sigma=sigma, which='LM', OPinv=OPinv)
+    order = np.argsort(eigenvalues)
+    frequencies = np.sqrt(np.maximum(eigenvalues[order], 0)) / (2 * np.pi)
+    return frequencies, model.expand(modes[:, order]), model
+
+def deflections(structure: Structure, n_points: int = 21, loads: tuple = None) -> dict:
+    """
+    Deformed shape of a structure and maximum deflection of every bar, from one static solution and one
+    vectorized pass over all the bars and points (serviceability counterpart of resistance_check).
+    The deflection is the displacement perpendicular to the chord joining the displaced end nodes.
+    Parameters:
+    - structure: Structure object, with enough supports to prevent rigid body motions.
+    - n_points: Number of points along each bar.
+    - loads: Loads as returned by load_arrays (default: the loads of the bars).
+    Returns:
+        dict: positions and displacements (n_bars, n_points, 2), deflection (n_bars, n_points),
+        max_deflection, max_deflection_position (distance from the start node) and max_displacement
+        (one entry per bar), u (all the dofs) and model (FrameModel).
+    """
+    u, _, model = solve_static(structure, loads)
+    displacements = model.deformed(u, n_points, loads)
+
+    # Transverse displacement in the reference of the bar, relative to the chord
+    transverse = -model.sin[:, None] * displacements[..., 0] + model.cos[:, None] * displacements[..., 1]
+    xi = np.linspace(0, 1, n_points)
+    deflection = transverse - ((1 - xi) * transverse[:, [0]] + xi * transverse[:, [-1]])
+    worst = np.argmax(np.abs(deflection), axis=1)
+    rows = np.arange(len(worst))
+    return {
+        'positions': model.positions(n_points),
+        'displacements': displacements,
+        'deflection': deflection,
+        'max_deflection': np.abs(deflection[rows, worst]),
+        'max_deflection_position': xi[worst] * model.length,
+        'max_displacement': np.linalg.norm(displacements, axis=2).max(axis=1),
+        'u': u,
+        'model': model,
+    }
@@ -0,0 +1,227 @@
+import numpy as np
+from Structure_Analysis import Bar, Node, Structure
+
+# Section of the generated bars unless given (see Structure.add_bars)
+DEFAULT_PROPERTIES = {'width': 50.0, 'height': 50.0, 'material': 'steel'}
+
+
+def _build(name: str, coordinates: np.ndarray, connectivity: np.ndarray, supports: list, properties: dict) -> Structure:
+    """Create the structure from its arrays and add the supports (node index, ux, uy, rz)."""
+    structure = Structure(name)
+    bars = structure.add_bars(coordinates, connectivity, **{**DEFAULT_PROPERTIES, **properties})
+    # Node objects of the supports, from the first bar ending at each node
+    flat = connectivity.ravel()
+    used, first = np.unique(flat, return_index=True)
+    for i, ux, uy, rz in supports:
+        k = first[np.searchsorted(used, i)]
+        bar = bars[k // 2]
+        structure.add_support(bar.start_node if k % 2 == 0 else bar.end_node, ux, uy, rz)
+    return structure
+
+def _chords(n_panels: int, span: float, depth: float) -> tuple:
+    """Nodes of a parallel chord truss (bottom 0..n, top n+1..2n+1) and the chord and vertical bars."""
+    x = np.linspace(0, span, n_panels + 1)
+    coordinates = np.concatenate([np.stack([x, np.zeros_like(x)], axis=1), np.stack([x, np.full_like(x, depth)], axis=1)])
+    bottom = np.arange(n_panels + 1)
+    top = bottom + n_panels + 1
+    chords = np.concatenate([np.stack([bottom[:-1], bottom[1:]], axis=1), np.stack([top[:-1], top[1:]], axis=1)])
+    verticals = np.stack([bottom, top], axis=1)
+    return coordinates, bottom, top, np.concatenate([chords, verticals])
+
+def _truss_supports(n_panels: int) -> list:
+    """Pin at the left end of the bottom chord and roller at the right end."""
+    return [(0, True, True, False), (n_panels, False, True, False)]
+
+def warren_truss(n_panels: int, span: float, depth: float, name: str = "Warren truss", **properties) -> Structure:
+    """
+    Warren truss: parallel chords and diagonals alternating in direction, without verticals.
+    Parameters:
+    - n_panels: Number of panels (triangles pointing down) along the span.
+    - span: Length of the bottom chord (mm).
+    - depth: Distance between the chords (mm).
+    - name: Name of the structure.
+    - properties: Section of the bars (see Structure.add_bars), default DEFAULT_PROPERTIES.
+    Returns:
+        Structure: 4 * n_panels - 1 bars, pinned at the left end and on a roller at the right end.
+    """
+    panel = span / n_panels
+    x_bottom = np.linspace(0, span, n_panels + 1)
+    x_top = (np.arange(n_panels) + 0.5) * panel
+    coordinates = np.concatenate([np.stack([x_bottom, np.zeros_like(x_bottom)], axis=1),
+                                  np.stack([x_top, np.full_like(x_top, depth)], axis=1)])
+    bottom = np.arange(n_panels + 1)
+    top = np.arange(n_panels) + n_panels + 1
+    connectivity = np.concatenate([
+        np.stack([bottom[:-1], bottom[1:]], axis=1),  # bottom chord
+        np.stack([top[:-1], top[1:]], axis=1),        # top chord
+        np.stack([bottom[:-1], top], axis=1),         # rising diagonals
+        np.stack([top, bottom[1:]], axis=1),          # falling diagonals
+    ])
+    return _build(name, coordinates, connectivity, _truss_supports(n_panels), properties)
+
+def pratt_truss(n_panels: int, span: float, depth: float, name: str = "Pratt truss", **properties) -> Structure:
+    """
+    Pratt truss: parallel chords, verticals and diagonals sloping down towards the middle
+    (in tension under gravity loads).
+    Parameters: see warren_truss (n_panels should be even for a symmetric truss).
+    Returns:
+        Structure: 4 * n_panels + 1 bars, pinned at the left end and on a roller at the right end.
+    """
+    coordinates, bottom, top, connectivity = _chords(n_panels, span, depth)
+    left = np.arange(n_panels) < n_panels / 2
+    diagonals = np.where(left[:, None], np.stack([top[:-1], bottom[1:]], axis=1), np.stack([bottom[:-1], top[1:]], axis=1))
+    return _build(name, coordinates, np.concatenate([connectivity, diagonals]), _truss_supports(n_panels), properties)
+
+def howe_truss(n_panels: int, span: float, depth: float, name: str = "Howe truss", **properties) -> Structure:
+    """
+    Howe truss: parallel chords, verticals and diagonals sloping up towards the middle
+    (in compression under gravity loads).
+    Parameters: see warren_truss (n_panels should be even for a symmetric truss).
+    Returns:
+        Structure: 4 * n_panels + 1 bars, pinned at the left end and on a roller at the right end.
+    """
+    coordinates, bottom, top, connectivity = _chords(n_panels, span, depth)
+    left = np.arange(n_panels) < n_panels / 2
+    diagonals = np.where(left[:, None], np.stack([bottom[:-1], top[1:]], axis=1), np.stack([top[:-1], bottom[1:]], axis=1))
+    return _build(name, coordinates, np.concatenate([connectivity, diagonals]), _truss_supports(n_panels), properties)
+
+def portal_frame(n_bays: int, n_stories: int, bay_width: float, story_height: float, name: str = "Portal frame",
+                 **properties) -> Structure:
+    """
+    Multi-bay, multi-story portal frame with clamped column bases.
+    Parameters:
+    - n_bays: Number of bays.
+    - n_stories: Number of stories.
+    - bay_width: Distance between the columns (mm).
+    - story_height: Distance between the floors (mm).
+    - name: Name of the structure.
+    - properties: Section of the bars (see Structure.add_bars), default DEFAULT_PROPERTIES.
+    Returns:
+        Structure: (n_bays + 1) * n_stories columns and n_bays * n_stories beams.
+    """
+    x, y = np.meshgrid(np.arange(n_bays + 1) * bay_width, np.arange(n_stories + 1) * story_height)
+    coordinates = np.stack([x.ravel(), y.ravel()], axis=1)
+    index = np.arange(coordinates.shape[0]).reshape(n_stories + 1, n_bays + 1)
+    connectivity = np.concatenate([
+        np.stack([index[:-1].ravel(), index[1:].ravel()], axis=1),         # columns
+        np.stack([index[1:, :-1].ravel(), index[1:, 1:].ravel()], axis=1),  # beams
+    ])
+    supports = [(i, True, True, True) for i in index[0].tolist()]
+    return _build(name, coordinates, connectivity, supports, properties)
+
+def grid(nx: int, ny: int, dx: float, dy: float, diagonals: bool = False, name: str = "Grid", **properties) -> Structure:
+    """
+    Rectangular grid of bars standing on its bottom row of nodes (pinned).
+    Parameters:
+    - nx, ny: Number of cells along x and y.
+    - dx, dy: Size of the cells (mm).
+    - diagonals: Add one diagonal per cell (bracing).
+    - name: Name of the structure.
+    - properties: Section of the bars (see Structure.add_bars), default DEFAULT_PROPERTIES.
+    Returns:
+        Structure: nx * (ny + 1) + ny * (nx + 1) bars (plus nx * ny diagonals).
+    """
+    x, y = np.meshgrid(np.arange(nx + 1) * dx, np.arange(ny + 1) * dy)
+    coordinates = np.stack([x.ravel(), y.ravel()], axis=1)
+    index = np.arange(coordinates.shape[0]).reshape(ny + 1, nx + 1)
+    parts = [
+        np.stack([index[:, :-1].ravel(), index[:, 1:].ravel()], axis=1),  # horizontal bars
+        np.stack([index[:-1].ravel(), index[1:].ravel()], axis=1),        # vertical bars
+    ]
+    if diagonals:
+        parts.append(np.stack([index[:-1, :-1].ravel(), index[1:, 1:].ravel()], axis=1))
+    supports = [(i, True, True, False) for i in index[0].tolist()]
+    return _build(name, coordinates, np.concatenate(parts), supports, properties)
+
+def scissor_lift(alpha: float, length: float, p: float, width: float = 3.0, height: float = 1.0, hollow: bool = False,
+                 width_thickness: float = 0.0, height_thickness: float = 0.0, l_platform: float = 50.0,
+                 name: str = "Test Structure") -> Structure:
+    """
+    Scissor lift of the GUI: two aluminum bars crossing at their middle (C) and an ABS platform resting on them,
+    with the platform load P at its middle and the corresponding reactions on the bars.
+    Parameters:
+    - alpha: Angle of the first bar (deg), the second one is at 180 - alpha.
+    - length: Length of the crossing bars (mm).
+    - p: Load on the platform (N), all the loads are proportional to it.
+    - width, height: Section of the crossing bars (mm).
+    - hollow: Hollow sections (the platform too).
+    - width_thickness, height_thickness: Wall thicknesses of the crossing bars (mm).
+    - l_platform: Length of the platform (mm).
+    - name: Name of the structure.
+    Returns:
+        Structure: bars AE, BD and the platform, without supports.
+    """
+    structure = Structure(name)
+    h = length * np.sin(np.deg2rad(alpha))
+    bar1 = Bar(length=length, width=width, height=height, hollow=hollow, section='rectangular',
+               material='aluminum', alpha=alpha, width_thickness=width_thickness, height_thickness=height_thickness)
+    bar2 = Bar(length=length, width=width, height=height, hollow=hollow, section='rectangular',
+               material='aluminum', alpha=180 - alpha, width_thickness=width_thickness, height_thickness=height_thickness)
+    bar3 = Bar(length=l_platform, width=0.1, height=0.1, hollow=hollow, section='rectangular', material='abs', alpha=0)
+    structure.add_bar(bar1)
+    structure.add_bar(bar2)
+    structure.add_bar(bar3)
+
+    bar1.start(Node("A", 0, 0))
+    bar1.end()
+    bar2.start(Node("D", length * np.cos(np.deg2rad(alpha)), 0))
+    bar2.end()
+    bar3.start(Node("", -5, h))
+    bar3.end()
+    bar3.add_load(0.5, 0, -p, 0)
+
+    # Distance from the start node of bar1 to the center of the platform
+    d = bar3.start_node.x + 0.5 * (bar3.end_node.x - bar3.start_node.x) - bar1.start_node.x
+    f = p / np.tan(np.deg2rad(alpha))
+    c = length * np.cos(np.deg2rad(alpha))
+
+    # Bar AE
+    bar1.add_load(0, f, p - p * d / c, 0)  # A
+    bar1.add_load(0.5, -f, (2 * p * d / c) - p, 0)  # C
+    bar1.add_load(1, 0, -p * d / c, 0)  # E
+    # Bar BD
+    bar2.add_load(0, -f, p * d / c, 0)  # B
+    bar2.add_load(1 / 2, f, -((2 * p * d / c) - p), 0)  # C
+    bar2.add_load(1, 0, -(p - p * d / c), 0)  # D
+    return structure
+
+def scissor_frame(lift: Structure, n_elements: int = 2, name: str = "Scissor frame") -> Structure:
+    """
+    Finite element model of the crossing bars of a scissor lift (see scissor_lift): AE and BD are split in
+    n_elements bars each, with a node at their crossing C shared by both, so that they are joined there, and they
+    are clamped at the ground (the platform only rests on them). The joint at C is rigid: the frame is stiffer
+    than a pinned scissor. The loads of the bars are kept: the loads at C of AE and BD are opposite and cancel on
+    the shared node.
+    Parameters:
+    - lift: Scissor lift as returned by scissor_lift (bars AE, BD and the platform).
+    - n_elements: Number of bars along AE and along BD, even (2 is exact for the static analysis, more bars
+      for the higher mode shapes).
+    - name: Name of the structure.
+    Returns:
+        Structure: n_elements bars from A to E, then n_elements bars from D to B, with clamped supports at A and D.
+    """
+    if n_elements < 2 or n_elements % 2:
+        raise ValueError("n_elements must be an even number >= 2 (C must be a node).")
+    frame = Structure(name)
+    ae, bd = lift.bars[0], lift.bars[1]
+    c = Node("C", (ae.start_node.x + ae.end_node.x) / 2, (ae.start_node.y + ae.end_node.y) / 2)
+    xi = np.linspace(0, 1, n_elements + 1)
+    for bar in (ae, bd):
+        start, end = bar.start_node, bar.end_node
+        inner = [c if 2 * k == n_elements else Node("", start.x + t * (end.x - start.x), start.y + t * (end.y - start.y))
+                 for k, t in enumerate(xi[1:-1], start=1)]
+        nodes = [start] + inner + [end]
+        elements = [Bar(length=bar.length / n_elements, width=bar.width, height=bar.height, radius=bar.radius,
+                        hollow=bar.hollow, section=bar.section, width_thickness=bar.width_thickness,
+                        height_thickness=bar.height_thickness, material=bar.material, alpha=bar.alpha,
+                        start_node=nodes[k], end_node=nodes[k + 1]) for k in range(n_elements)]
+        # Each load on the element holding it, at its position along the element (set directly: add_load
+        # compares the position with the length in mm, which rejects the end of elements shorter than 1 mm)
+        for position, (fx, fy, m) in bar.load.items():
+            k = min(int(position * n_elements), n_elements - 1)
+            elements[k].load[position * n_elements - k] = [fx, fy, m]
+        for element in elements:
+            frame.add_bar(element)
+    frame.add_support(ae.start_node, rz=True)
+    frame.add_support(bd.start_node, rz=True)
+    return frame
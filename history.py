@@ -0,0 +1,135 @@
+from collections import deque
+from typing import NamedTuple
+import numpy as np
+from Structure_Analysis import StructureSnapshot, resistance_check
+
+
+# HistoryEntry class
+# One state of the edit history: the snapshot of the structure, the analysis results of its bars
+# and any information needed to restore the editor (e.g. the values of the GUI controls).
+class HistoryEntry(NamedTuple):
+    snapshot: StructureSnapshot
+    results: tuple  # one dictionary per bar (see History), shared with the other states
+    info: object = None
+
+
+# History class
+# Undo/redo history of a structure. The states are snapshots sharing their unchanged bars and nodes, and the
+# analysis results are cached per bar: undo and redo only move an entry between two stacks, and a new state
+# only stores (and analyzes) the bars that changed.
+class History:
+    def __init__(self, structure=None, analyze=resistance_check, info=None, limit: int = None):
+        """
+        Parameters:
+        - structure: Initial Structure or StructureSnapshot (optional, see push).
+        - analyze: Vectorized analysis of a list of bars returning {key: array with one entry per bar}
+          (default: resistance_check). The results of a bar must depend on the bar only.
+        - info: Information stored with the initial state.
+        - limit: Maximum number of undo steps (default: unlimited).
+        """
+        self.analyze = analyze
+        self.current = None
+        self._undo = deque(maxlen=limit)
+        self._redo = []
+        self._nodes = {}  # NodeSnapshot -> the same node, shared by all the states
+        self._bars = {}   # BarSnapshot -> the same bar, shared by all the states
+        self._rows = {}   # id() of a shared bar -> its analysis results
+        if structure is not None:
+            self.push(structure, info)
+
+    def _share(self, snapshot: StructureSnapshot) -> StructureSnapshot:
+        """Replace the bars and nodes of a snapshot by the equal ones already in the history."""
+        def node(value):
+            return self._nodes.setdefault(value, value)
+
+        bars = []
+        for bar in snapshot.bars:
+            if id(bar) not in self._rows:
+                shared = self._bars.get(bar)
+                if shared is None:
+                    shared = bar._replace(start_node=node(bar.start_node), end_node=node(bar.end_node))
+                    self._bars[shared] = shared
+                bar = shared
+            bars.append(bar)
+        supports = tuple((node(support), constraints) for support, constraints in snapshot.supports)
+        return snapshot._replace(bars=tuple(bars), supports=supports)
+
+    def _results(self, bars: tuple) -> tuple:
+        """Return the results of the bars, analyzing (all at once) only the bars never analyzed before."""
+        new = list({id(bar): bar for bar in bars if id(bar) not in self._rows}.values())
+        if new:
+            results = self.analyze(new)
+            columns = {key: np.asarray(values).tolist() for key, values in results.items()}
+            for bar, values in zip(new, zip(*columns.values())):
+                self._rows[id(bar)] = dict(zip(columns, values))
+        return tuple(self._rows[id(bar)] for bar in bars)
+
+    def _prune(self):
+        """Forget the bars, nodes and results no longer used by any state (after states are dropped)."""
+        entries = [self.current, *self._undo, *self._redo]
+        bars = {id(bar): bar for entry in entries for bar in entry.snapshot.bars}
+        nodes = {node for entry in entries for node, _ in entry.snapshot.supports}
+        nodes.update(node for bar in bars.values() for node in (bar.start_node, bar.end_node))
+        self._bars = {bar: bar for bar in self._bars.values() if id(bar) in bars}
+        self._rows = {key: row for key, row in self._rows.items() if key in bars}
+        self._nodes = {node: node for node in self._nodes.values() if node in nodes}
+
+    def push(self, structure, info=None) -> HistoryEntry:
+        """
+        Record a new state (the redo steps are discarded). Nothing is recorded if the state is the current one.
+        Parameters:
+        - structure: Structure or StructureSnapshot after the edit.
+        - info: Information stored with the state (e.g. the values of the GUI controls).
+        Returns:
+            HistoryEntry: The current state.
+        """
+        snapshot = structure if isinstance(structure, StructureSnapshot) else structure.snapshot()
+        snapshot = self._share(snapshot)
+        if self.current is not None and snapshot == self.current.snapshot and info == self.current.info:
+            return self.current
+        entry = HistoryEntry(snapshot, self._results(snapshot.bars), info)
+        # The oldest undo step (if the history is full) and the redo steps are dropped
+        dropped = bool(self._redo) or len(self._undo) == self._undo.maxlen
+        if self.current is not None:
+            self._undo.append(self.current)
+        self._redo.clear()
+        self.current = entry
+        if dropped:
+            self._prune()
+        return entry
+
+    def can_undo(self) -> bool:
+        return len(self._undo) > 0
+
+    def can_redo(self) -> bool:
+        return len(self._redo) > 0
+
+    def undo(self) -> HistoryEntry:
+        """
+        Go back to the previous state (its snapshot and results are restored as they were, without analysis).
+        Returns:
+            HistoryEntry: The new current state.
+        """
+        if not self._undo:
+            raise IndexError("Nothing to undo.")
+        self._redo.append(self.current)
+        self.current = self._undo.pop()
+        return self.current
+
+    def redo(self) -> HistoryEntry:
+        """
+        Go forward to the state undone last.
+        Returns:
+            HistoryEntry: The new current state.
+        """
+        if not self._redo:
+            raise IndexError("Nothing to redo.")
+        self._undo.append(self.current)
+        self.current = self._redo.pop()
+        return self.current
+
+    def result_arrays(self) -> dict:
+        """Return the results of the current state as arrays (one entry per bar), as returned by analyze."""
+        rows = self.current.results
+        keys = rows[0].keys() if rows else ()
+        return {key: np.array([row[key] for row in rows]) for key in keys}
@@ -0,0 +1,152 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from Structure_Analysis import bar_arrays, envelope, internal_forces, load_arrays, section_properties, von_mises_stress
+
+# Results of every bar written by the workers (see parallel_check)
+CHECK_OUTPUTS = ('position', 'normal', 'shear', 'flexion', 'von_mises', 'yield_strength', 'utilization', 'passed',
+                 'normal_max', 'normal_min', 'shear_max', 'shear_min', 'flexion_max', 'flexion_min')
+DIAGRAM_OUTPUTS = ('shear_diagram', 'normal_diagram', 'flexion_diagram')
+
+
+# SharedArrays class
+# Named NumPy arrays stored in a single shared memory block. The block is created by the main process and
+# attached by the workers from its spec (name and layout): only the spec is pickled, never the arrays.
+class SharedArrays:
+    def __init__(self, layout: dict, name: str = None):
+        """
+        Parameters:
+        - layout: {key: (shape, dtype string)} of the arrays.
+        - name: Name of an existing block to attach (default: create a new block).
+        """
+        self.layout = layout
+        offsets = {}
+        size = 0
+        for key, (shape, dtype) in layout.items():
+            offsets[key] = size
+            size += -(-int(np.prod(shape)) * np.dtype(dtype).itemsize // 64) * 64  # aligned on 64 bytes
+        self.owner = name is None
+        self.block = shared_memory.SharedMemory(name=name, create=self.owner, size=max(size, 1))
+        self.arrays = {key: np.ndarray(shape, dtype, buffer=self.block.buf, offset=offsets[key])
+                       for key, (shape, dtype) in layout.items()}
+
+    @classmethod
+    def from_arrays(cls, arrays: dict):
+        """Create a block holding a copy of the given arrays."""
+        arrays = {key: np.ascontiguousarray(value) for key, value in arrays.items()}
+        shared = cls({key: (value.shape, value.dtype.str) for key, value in arrays.items()})
+        for key, value in arrays.items():
+            shared.arrays[key][...] = value
+        return shared
+
+    @property
+    def spec(self) -> tuple:
+        """Name and layout of the block, to attach it from another process."""
+        return self.block.name, self.layout
+
+    def close(self):
+        """Release the views and detach the block (and free it if this process created it)."""
+        self.arrays = {}
+        self.block.close()
+        if self.owner:
+            self.block.unlink()
+
+
+# Blocks attached by a worker process (set by _attach, used by _check_slice)
+_worker = {}
+
+def _attach(inputs: tuple, outputs: tuple, n_samples: int):
+    """Worker initializer: attach the input and output blocks once for all the slices."""
+    _worker['inputs'] = SharedArrays(inputs[1], name=inputs[0])
+    _worker['outputs'] = SharedArrays(outputs[1], name=outputs[0])
+    _worker['n_samples'] = n_samples
+
+def _check_slice(bounds: tuple) -> int:
+    """
+    Evaluate the bars start:stop from the shared inputs and write their results in the shared outputs
+    (worker entry point of parallel_check).
+    Returns:
+        int: Number of bars evaluated.
+    """
+    start, stop = bounds
+    inputs, outputs = _worker['inputs'].arrays, _worker['outputs'].arrays
+    n_samples = _worker['n_samples']
+    arrays = {key: value[start:stop] for key, value in inputs.items() if key not in ('positions', 'forces', 'mask')}
+    loads = (inputs['positions'][start:stop], inputs['forces'][start:stop], inputs['mask'][start:stop])
+    bars = range(stop - start)  # only the number of bars is used when the arrays and the loads are given
+
+    # Same results as resistance_check, from a single envelope pass
+    extremes = envelope(bars, n_samples, loads, arrays)
+    n, t, m = extremes['governing_normal'], extremes['governing_shear'], extremes['governing_flexion']
+    von_mises, _, _ = von_mises_stress(n, t, m, section_properties(arrays))
+    results = {
+        'position': extremes['governing_position'],
+        'normal': n,
+        'shear': t,
+        'flexion': m,
+        'von_mises': von_mises,
+        'yield_strength': arrays['yield_strength'],
+        'utilization': von_mises / arrays['yield_strength'],
+        'passed': von_mises < arrays['yield_strength'],
+    }
+    for key in CHECK_OUTPUTS[8:]:
+        results[key] = extremes[key]
+    if 'shear_diagram' in outputs:
+        _, results['shear_diagram'], results['normal_diagram'], results['flexion_diagram'] = \
+            internal_forces(bars, n_samples, loads, arrays)
+    for key, value in results.items():
+        outputs[key][start:stop] = value
+    return stop - start
+
+def parallel_check(structure, n_samples: int = 100, processes: int = None, chunk_size: int = None,
+                   diagrams: bool = False) -> dict:
+    """
+    Resistance check and envelope of the stress diagrams of a large structure on a process pool, without
+    pickling the bars: the bar and load arrays are placed in shared memory, every worker evaluates slices of
+    bars and writes the results directly in shared output arrays.
+    Parameters:
+    - structure: Structure object (or StructureSnapshot).
+    - n_samples: Number of samples along each bar of the stress diagrams.
+    - processes: Number of worker processes, at least 1 (default: all the CPUs, 1 runs in this process).
+    - chunk_size: Number of bars per slice (default: 4 slices per process, at most 50000 bars).
+    - diagrams: Also return the shear, normal and flexion diagrams (n_bars, n_samples) of every bar.
+    Returns:
+        dict: CHECK_OUTPUTS (see resistance_check and envelope), one entry per bar,
+        and DIAGRAM_OUTPUTS when diagrams is True.
+    """
+    bars = list(structure.bars)
+    processes = os.cpu_count() if processes is None else processes
+    if processes < 1:
+        raise ValueError("The number of processes must be at least 1.")
+    if chunk_size is None:
+        chunk_size = min(max(-(-len(bars) // (4 * processes)), 1), 50_000)
+    arrays = bar_arrays(bars)
+    positions, forces, mask = load_arrays(bars)
+
+    layout = {key: ((len(bars),), 'bool' if key == 'passed' else 'float64') for key in CHECK_OUTPUTS}
+    if diagrams:
+        layout.update({key: ((len(bars), n_samples), 'float64') for key in DIAGRAM_OUTPUTS})
+    slices = [(start, min(start + chunk_size, len(bars))) for start in range(0, len(bars), chunk_size)]
+    inputs = SharedArrays.from_arrays({**arrays, 'positions': positions, 'forces': forces, 'mask': mask})
+    outputs = None
+    try:
+        outputs = SharedArrays(layout)
+        if processes == 1:
+            _attach(inputs.spec, outputs.spec, n_samples)
+            try:
+                for bounds in slices:
+                    _check_slice(bounds)
+            finally:
+                _worker['inputs'].close()
+                _worker['outputs'].close()
+                _worker.clear()
+        else:
+            with ProcessPoolExecutor(max_workers=processes, initializer=_attach,
+                                     initargs=(inputs.spec, outputs.spec, n_samples)) as executor:
+                list(executor.map(_check_slice, slices))
+        return {key: value.copy() for key, value in outputs.arrays.items()}
+    finally:
+        inputs.close()
+        if outputs is not None:
+            outputs.close()
@@ -0,0 +1,144 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scipy.stats import norm
+from Structure_Analysis import bar_arrays, critical_samples, internal_forces, section_properties
+
+# Random variables of the analysis: section dimensions and yield strength of every bar, and the load factor P
+# (all the loads of the structure are proportional to P, as the platform load in the GUI)
+DIMENSIONS = ('width', 'height', 'radius', 'width_thickness', 'height_thickness')
+VARIABLES = DIMENSIONS + ('yield_strength', 'P')
+
+
+def sample_factors(rng: np.random.Generator, distribution: tuple, size) -> np.ndarray:
+    """
+    Draw random factors applied to a nominal value.
+    Parameters:
+    - rng: NumPy random generator.
+    - distribution: ('normal', mean, std), ('lognormal', mean, std) or ('uniform', low, high), in fraction of
+      the nominal value (e.g. ('normal', 1.0, 0.05) for a 5% standard deviation), or None for the nominal value.
+    - size: Shape of the output.
+    Returns:
+        np.ndarray: The factors.
+    """
+    if distribution is None:
+        return np.ones(size)
+    kind, a, b = distribution
+    if kind == 'normal':
+        return rng.normal(a, b, size)
+    if kind == 'lognormal':
+        # Parameters of the underlying normal distribution from the mean and standard deviation of the factor
+        sigma2 = np.log(1 + (b / a) ** 2)
+        return rng.lognormal(np.log(a) - sigma2 / 2, np.sqrt(sigma2), size)
+    if kind == 'uniform':
+        return rng.uniform(a, b, size)
+    raise ValueError(f"Unknown distribution '{kind}': use 'normal', 'lognormal' or 'uniform'.")
+
+def wilson_interval(failures, n: int, confidence: float = 0.95) -> tuple:
+    """
+    Wilson score interval of a probability estimated from n Bernoulli samples (well behaved close to 0).
+    Returns:
+        tuple: lower and upper bounds.
+    """
+    z = norm.ppf(0.5 + confidence / 2)
+    p = np.asarray(failures) / n
+    center = (p + z**2 / (2 * n)) / (1 + z**2 / n)
+    half_width = z * np.sqrt(p * (1 - p) / n + z**2 / (4 * n**2)) / (1 + z**2 / n)
+    lower = np.where(p > 0, np.maximum(center - half_width, 0.0), 0.0)
+    upper = np.where(p < 1, np.minimum(center + half_width, 1.0), 1.0)
+    return lower, upper
+
+def _chunk_failures(job: tuple) -> tuple:
+    """
+    Evaluate one chunk of samples (worker entry point of monte_carlo).
+    Returns:
+        tuple: failures per bar (n_bars,), failures of the structure (any bar) and sum of the utilizations per bar.
+    """
+    arrays, forces, distributions, size, seed = job
+    rng = np.random.default_rng(seed)
+    n_bars = len(arrays['length'])
+    normal, shear, flexion = forces
+
+    # Sampled section properties (size, n_bars), broadcast against the critical samples (size, n_bars, n_critical)
+    sampled = dict(arrays)
+    for key in DIMENSIONS:
+        sampled[key] = arrays[key] * sample_factors(rng, distributions.get(key), (size, n_bars))
+    sections = {key: value[..., None] for key, value in section_properties(sampled).items()}
+    yield_strength = arrays['yield_strength'] * sample_factors(rng, distributions.get('yield_strength'), (size, n_bars))
+    load_factor = np.abs(sample_factors(rng, distributions.get('P'), (size, 1)))
+
+    # Same formulas as von_mises_stress; the internal forces are linear in P
+    sigma = normal / sections['A'] + flexion / sections['I']
+    tau = shear * sections['S'] / (sections['I'] * sections['b'])
+    von_mises = load_factor * np.sqrt(np.max(sigma**2 + 3 * tau**2, axis=2))
+
+    utilization = von_mises / yield_strength
+    failed = ~(utilization < 1)  # a NaN utilization (invalid section) is a failure
+    return failed.sum(axis=0), np.count_nonzero(failed.any(axis=1)), np.nansum(utilization, axis=0)
+
+def monte_carlo(structure, distributions: dict, n: int = 1_000_000, chunk_size: int = 100_000,
+                n_samples: int = 100, confidence: float = 0.95, processes: int = 1, seed=None) -> dict:
+    """
+    Monte Carlo reliability analysis of the bars of a structure under random dimensions, yield strengths and load.
+    The random variables are independent: one factor per bar for every dimension and the yield strength,
+    one factor per sample for the load P. The Von Mises stress is evaluated at the critical samples of the
+    stress diagrams (see critical_samples), i.e. its exact maximum over each bar.
+    Parameters:
+    - structure: Structure object (or StructureSnapshot).
+    - distributions: Distribution of the factors of the variables (see sample_factors and VARIABLES),
+      e.g. {'yield_strength': ('lognormal', 1.0, 0.07), 'width': ('normal', 1.0, 0.02), 'P': ('uniform', 0.8, 1.2)}.
+      The missing variables keep their nominal value.
+    - n: Number of samples.
+    - chunk_size: Number of samples evaluated at once (the memory is about 40 * chunk_size * n_bars * 2 * (n_loads + 1) bytes).
+    - n_samples: Number of samples along each bar of the stress diagrams.
+    - confidence: Confidence level of the intervals.
+    - processes: Number of worker processes (1 runs in this process, None uses all the CPUs).
+    - seed: Seed of the random generator (the results do not depend on the number of processes).
+    Returns:
+        dict: probability, lower, upper (confidence interval), failures and mean_utilization (one entry per bar),
+        system_probability, system_lower, system_upper (failure of any bar) and n.
+    """
+    unknown = set(distributions) - set(VARIABLES)
+    if unknown:
+        raise ValueError(f"Unknown variables {sorted(unknown)}: use {VARIABLES}.")
+    bars = list(structure.bars)
+    arrays = bar_arrays(bars)
+
+    # Internal forces do not depend on the section: compute them once, at the critical samples only
+    _, shear, normal, flexion = internal_forces(bars, n_samples)
+    index = critical_samples(bars, n_samples)
+    forces = tuple(np.take_along_axis(values, index, axis=1) for values in (normal, shear, flexion))
+
+    sizes = [chunk_size] * (n // chunk_size) + ([n % chunk_size] if n % chunk_size else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(arrays, forces, distributions, size, chunk_seed) for size, chunk_seed in zip(sizes, seeds)]
+    if processes == 1:
+        results = map(_chunk_failures, jobs)
+    else:
+        executor = ProcessPoolExecutor(max_workers=processes)
+        results = executor.map(_chunk_failures, jobs)
+
+    failures = np.zeros(len(bars), dtype=int)
+    system_failures = 0
+    utilization = np.zeros(len(bars))
+    try:
+        for bar_failures, chunk_system_failures, chunk_utilization in results:
+            failures += bar_failures
+            system_failures += chunk_system_failures
+            utilization += chunk_utilization
+    finally:
+        if processes != 1:
+            executor.shutdown()
+
+    lower, upper = wilson_interval(failures, n, confidence)
+    system_lower, system_upper = wilson_interval(system_failures, n, confidence)
+    return {
+        'probability': failures / n,
+        'lower': lower,
+        'upper': upper,
+        'failures': failures,
+        'mean_utilization': utilization / n,
+        'system_probability': system_failures / n,
+        'system_lower': float(system_lower),
+        'system_upper': float(system_upper),
+        'n': n,
+    }
@@ -0,0 +1,142 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import numpy as np
+from Structure_Analysis import Structure, bar_table, resistance_check
+from utils import StructureView, plot_section, plot_stress, plot_structure
+
+
+def build_report_figure(structure: Structure, bar_index: int = None, size: tuple = (16, 9), dpi: int = 100,
+                        max_rows: int = 25) -> Figure:
+    """Build the report sheet of a structure on an offscreen (Agg) figure.
+    The sheet contains the structure view, the stress diagrams and the section of one bar,
+    and the resistance check of every bar.
+    Args:
+        structure (Structure): The structure to report.
+        bar_index (int): Bar whose diagrams and section are shown (default: the most utilized bar).
+        size (tuple): Size of the sheet in inches.
+        dpi (int): Resolution of the sheet.
+        max_rows (int): Maximum number of bars listed in the resistance table (most utilized first).
+    Returns:
+        Figure: The report figure."""
+    fig = Figure(figsize=size, dpi=dpi)
+    FigureCanvasAgg(fig)
+    grid = fig.add_gridspec(3, 3, width_ratios=[2, 1.2, 1], hspace=0.8, wspace=0.3)
+
+    # Resistance check of every bar, in one vectorized pass
+    checks = resistance_check(structure.bars)
+    utilization = checks['utilization']
+    order = np.argsort(-utilization, kind='stable').tolist()
+    if bar_index is None:
+        bar_index = order[0] if order else None
+
+    view = StructureView()
+    view.set_structure(structure)
+    plot_structure(fig.add_subplot(grid[:, 0]), structure, view)
+
+    ax_table = fig.add_subplot(grid[2, 2])
+    ax_table.axis('off')
+    if bar_index is not None:
+        bar = structure.bars[bar_index]
+        plot_stress([fig.add_subplot(grid[i, 1]) for i in range(3)], bar)
+        plot_section(fig.add_subplot(grid[0:2, 2]), bar)
+
+    failing = int(np.sum(utilization >= 1))
+    lines = [f"{structure.name}: {len(order)} bars, {failing} failing", ""]
+    for i in order[:max_rows]:
+        bar = structure.bars[i]
+        von_mises, limit = checks['von_mises'][i], checks['yield_strength'][i]
+        result = "PASS" if von_mises < limit else "FAIL"
+        lines.append(f"{i:>4} {bar.start_node.id}{bar.end_node.id:<4} {von_mises:10.2f} / {limit:6.1f} MPa  {result}")
+    if len(order) > max_rows:
+        lines.append(f"... {len(order) - max_rows} more")
+    ax_table.text(0, 1, "\n".join(lines), va='top', ha='left', family='monospace', fontsize=8, transform=ax_table.transAxes)
+    ax_table.set_title("Resistance Check")
+
+    return fig
+
+def render_report(structure: Structure, path: str, bar_index: int = None, size: tuple = (16, 9), dpi: int = 100,
+                  formats: tuple = ('png', 'pdf')) -> list:
+    """Render the report sheet of a structure to files, without a display.
+    Args:
+        structure (Structure): The structure to report.
+        path (str): Path of the output files, without extension.
+        bar_index (int): Bar whose diagrams and section are shown (default: the most utilized bar).
+        size (tuple): Size of the sheet in inches.
+        dpi (int): Resolution of the sheet.
+        formats (tuple): File formats to write ('png', 'pdf', 'svg', ...).
+    Returns:
+        list: Paths of the written files."""
+    fig = build_report_figure(structure, bar_index=bar_index, size=size, dpi=dpi)
+    paths = []
+    for fmt in formats:
+        file_path = f"{path}.{fmt}"
+        fig.savefig(file_path, format=fmt, dpi=dpi)
+        paths.append(file_path)
+    return paths
+
+def _render_job(job: tuple) -> list:
+    """Worker entry point of render_reports."""
+    structure, path, kwargs = job
+    return render_report(structure, path, **kwargs)
+
+def render_reports(structures: list, out_dir: str, processes: int = None, chunksize: int = 4, **kwargs) -> list:
+    """Render the report sheets of many structures (e.g. the variants of a design sweep) in parallel.
+    Args:
+        structures (list): The structures to report.
+        out_dir (str): Directory where the sheets are written (created if missing).
+        processes (int): Number of worker processes (default: number of CPUs).
+        chunksize (int): Number of sheets sent to a worker at a time.
+        **kwargs: Options passed to render_report (size, dpi, formats, bar_index).
+    Returns:
+        list: For every structure, the paths of its written files."""
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = []
+    for i, structure in enumerate(structures):
+        name = re.sub(r'[^\w\-]+', '_', structure.name).strip('_') or "structure"
+        jobs.append((structure, os.path.join(out_dir, f"{i:05d}_{name}"), kwargs))
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(_render_job, jobs, chunksize=chunksize))
+
+def write_table(structure: Structure, path: str, chunk_size: int = 50_000, checks: bool = True,
+                n_samples: int = 100, fmt: str = None) -> int:
+    """Stream the table of the bars of a structure (see bar_table) to a CSV or Parquet file, chunk by chunk,
+    so that the memory stays bounded for large models.
+    Args:
+        structure (Structure): The structure to report.
+        path (str): Output file.
+        chunk_size (int): Number of bars per chunk.
+        checks (bool): Add the results of the resistance check.
+        n_samples (int): Number of samples along each bar of the stress diagrams.
+        fmt (str): 'csv' or 'parquet' (default: from the extension of path). Parquet needs pyarrow.
+    Returns:
+        int: Number of rows written."""
+    fmt = (fmt or os.path.splitext(path)[1].lstrip('.') or 'csv').lower()
+    if fmt not in ('csv', 'parquet'):
+        raise ValueError(f"Unknown table format '{fmt}': use 'csv' or 'parquet'.")
+    if fmt == 'parquet':
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as error:
+            raise ImportError("Writing Parquet files requires pyarrow (pip install pyarrow).") from error
+
+    bars = structure.bars
+    writer = None
+    try:
+        for start in range(0, max(len(bars), 1), chunk_size):
+            chunk = bar_table(bars[start:start + chunk_size], checks, n_samples, offset=start)
+            if fmt == 'csv':
+                chunk.to_csv(path, mode='w' if start == 0 else 'a', header=start == 0, index=False)
+            else:
+                table = pa.Table.from_pandas(chunk, preserve_index=False, schema=writer.schema if writer else None)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return len(bars)
@@ -0,0 +1,137 @@
+import threading
+import numpy as np
+from scipy.interpolate import RegularGridInterpolator
+from Structure_Analysis import Bar, bar_arrays, critical_samples, internal_forces, von_mises_stress, section_properties
+from generators import scissor_lift
+
+# Outputs of every bar of the model (see ResponseSurface.outputs)
+OUTPUTS = ('governing_position', 'governing_normal', 'governing_shear', 'governing_flexion',
+           'max_normal', 'max_shear', 'max_flexion')
+# Values tabulated at unit load for every candidate section of every bar (in the order of internal_forces)
+CANDIDATES = ('position', 'shear', 'normal', 'flexion')
+
+
+# ResponseSurface class
+# Outputs of the scissor lift of the GUI tabulated over the slider ranges (alpha, l), so that a slider move
+# is answered by interpolation while the exact analysis runs only when the slider is released.
+# The loads are proportional to P and do not depend on the section (the model is statically determinate):
+# P and the section are not axes of the table, they are applied exactly to the interpolated forces.
+# The forces are tabulated at the candidate sections of every bar (ends of the segments between loads, which
+# stay at the same fractions of the bars on the whole grid) and interpolated one section at a time: the governing
+# section and the maxima are chosen after the interpolation, so they never mix the forces of two sections.
+class ResponseSurface:
+    def __init__(self, alphas=None, lengths=None, l_platform: float = 50.0, n_samples: int = 100):
+        """
+        Parameters:
+        - alphas: Grid of the angle (deg), default 10 to 80 every 1 deg (the alpha slider).
+        - lengths: Grid of the length of the crossing bars (mm), default 40 to 80 every 1 mm (the l slider).
+        - l_platform: Length of the platform (mm).
+        - n_samples: Number of samples along each bar of the stress diagrams (as the exact analysis).
+        """
+        self.alphas = np.linspace(10, 80, 71) if alphas is None else np.asarray(alphas, dtype=float)
+        self.lengths = np.linspace(40, 80, 41) if lengths is None else np.asarray(lengths, dtype=float)
+        self.l_platform = l_platform
+        self.n_samples = n_samples
+        self.table = None
+        self._interpolator = None
+        self._done = threading.Event()
+        self._thread = None
+
+    def compute(self):
+        """Evaluate the forces of the candidate sections on the whole grid (one vectorized analysis per angle)."""
+        model = scissor_lift(self.alphas[0], self.lengths[0], 1.0, l_platform=self.l_platform).bars
+        # Where |T| + |N| + |M| and the extremes of every diagram can be, in the order of the samples
+        samples = np.sort(critical_samples(model, self.n_samples), axis=1)
+
+        rows = np.arange(len(model))[:, None]
+
+        table = {key: [] for key in CANDIDATES}
+        for alpha in self.alphas:
+            bars = [bar for length in self.lengths
+                    for bar in scissor_lift(alpha, length, 1.0, l_platform=self.l_platform).bars]
+            for key, values in zip(CANDIDATES, internal_forces(bars, self.n_samples, arrays=bar_arrays(bars))):
+                table[key].append(values.reshape(len(self.lengths), len(model), -1)[:, rows, samples])
+        # Arrays of shape (n_alphas, n_lengths, n_bars, n_candidates)
+        self.table = {key: np.array(values) for key, values in table.items()}
+
+        # One interpolator for all the candidates: values of shape (n_alphas, n_lengths, n_values)
+        values = np.stack([self.table[key] for key in CANDIDATES], axis=2)
+        self._interpolator = RegularGridInterpolator((self.alphas, self.lengths),
+                                                     values.reshape(values.shape[:2] + (-1,)))
+        self._done.set()
+
+    def start(self) -> threading.Thread:
+        """Compute the table in a background thread (the GUI stays responsive meanwhile)."""
+        self._thread = threading.Thread(target=self.compute, daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def ready(self) -> bool:
+        """Return True once the table is computed."""
+        return self._done.is_set()
+
+    def outputs(self, alpha, length, p: float = 1.0) -> dict:
+        """
+        Interpolate the forces of every candidate section (bilinear in alpha and l, scaled by P), then pick the
+        governing section (largest |T| + |N| + |M|, see resistance_check) and the maxima among them.
+        Parameters:
+        - alpha: Angle (deg), scalar or array.
+        - length: Length of the crossing bars (mm), scalar or array.
+        - p: Load on the platform (N).
+        Returns:
+            dict: h and OUTPUTS (forces and moments scaled by P), with a trailing axis of one entry per bar.
+        """
+        if not self.ready():
+            raise RuntimeError("The response surface is not computed yet: call compute or start first.")
+        alpha, length = np.broadcast_arrays(np.asarray(alpha, dtype=float), np.asarray(length, dtype=float))
+        shape = self.table['position'].shape[2:]
+        values = self._interpolator(np.stack([alpha, length], axis=-1))
+        values = values.reshape(alpha.shape + (len(CANDIDATES),) + shape)
+        position, shear, normal, flexion = (values[..., k, :, :] for k in range(len(CANDIDATES)))
+        shear, normal, flexion = shear * p, normal * p, flexion * p
+
+        result = {'h': length * np.sin(np.deg2rad(alpha))}
+        # First candidate with the largest proxy, as np.argmax on the diagrams
+        best = np.argmax(np.abs(shear) + np.abs(normal) + np.abs(flexion), axis=-1)[..., None]
+        for key, value in (('position', position), ('normal', normal), ('shear', shear), ('flexion', flexion)):
+            result[f'governing_{key}'] = np.take_along_axis(value, best, axis=-1)[..., 0]
+        for key, value in (('normal', normal), ('shear', shear), ('flexion', flexion)):
+            result[f'max_{key}'] = np.abs(value).max(axis=-1)
+        return result
+
+    def check(self, alpha: float, length: float, p: float, width: float, height: float, hollow: bool = False,
+              width_thickness: float = 0.0, height_thickness: float = 0.0, material: str = 'aluminum',
+              bar: int = 0) -> dict:
+        """
+        Estimate the resistance check of a bar of the GUI (see utils.check_resistance) from the table.
+        The Von Mises stress is exact for the interpolated forces, only the forces are interpolated.
+        Parameters:
+        - alpha, length, p: Slider values.
+        - width, height, hollow, width_thickness, height_thickness: Section of the crossing bars.
+        - material: Material of the crossing bars (only the yield strength depends on it).
+        - bar: Index of the bar (0: AE, 1: BD).
+        Returns:
+            dict: h, position, normal, shear, flexion, max_normal, max_shear, max_flexion, von_mises,
+            yield_strength and passed.
+        """
+        result = self.outputs(alpha, length, p)
+        section = Bar(length=length, width=width, height=height, hollow=hollow, section='rectangular',
+                      material=material, alpha=alpha, width_thickness=width_thickness,
+                      height_thickness=height_thickness)
+        arrays = bar_arrays([section])
+        n, t, m = (result[f'governing_{key}'][..., bar] for key in ('normal', 'shear', 'flexion'))
+        von_mises, _, _ = von_mises_stress(n, t, m, {key: value[0] for key, value in section_properties(arrays).items()})
+        yield_strength = arrays['yield_strength'][0]
+        return {
+            'h': result['h'],
+            'position': result['governing_position'][..., bar],
+            'normal': n,
+            'shear': t,
+            'flexion': m,
+            'max_normal': result['max_normal'][..., bar],
+            'max_shear': result['max_shear'][..., bar],
+            'max_flexion': result['max_flexion'][..., bar],
+            'von_mises': von_mises,
+            'yield_strength': yield_strength,
+            'passed': von_mises < yield_strength,
+        }
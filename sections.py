@@ -0,0 +1,211 @@
+import numpy as np
+from Structure_Analysis import MATERIAL_DENSITIES
+
+# Standard steel profiles (mm), properties computed with sharp corners (without root radii)
+# Rectangular and square hollow sections: (height, width, thickness)
+RHS_SIZES = [
+    (40, 40, 2.5), (40, 40, 3), (40, 40, 4), (50, 30, 2.5), (50, 30, 3), (50, 30, 4),
+    (50, 50, 3), (50, 50, 4), (50, 50, 5), (60, 40, 3), (60, 40, 4), (60, 60, 3), (60, 60, 4), (60, 60, 5),
+    (80, 40, 3), (80, 40, 4), (80, 80, 4), (80, 80, 5), (80, 80, 6), (100, 50, 3), (100, 50, 4), (100, 50, 5),
+    (100, 100, 4), (100, 100, 5), (100, 100, 6), (100, 100, 8), (120, 60, 4), (120, 60, 5),
+    (120, 80, 4), (120, 80, 5), (120, 80, 6), (120, 120, 5), (120, 120, 6), (120, 120, 8),
+    (150, 100, 5), (150, 100, 6), (150, 100, 8), (150, 150, 6), (150, 150, 8), (150, 150, 10),
+    (200, 100, 5), (200, 100, 6), (200, 100, 8), (200, 100, 10), (200, 200, 8), (200, 200, 10), (200, 200, 12.5),
+    (250, 150, 6), (250, 150, 8), (250, 150, 10), (300, 200, 8), (300, 200, 10), (300, 200, 12.5),
+]
+# Circular hollow sections: (outside diameter, thickness)
+CHS_SIZES = [
+    (33.7, 2.6), (33.7, 3.2), (42.4, 2.6), (42.4, 3.2), (42.4, 4), (48.3, 3.2), (48.3, 4), (48.3, 5),
+    (60.3, 3.2), (60.3, 4), (60.3, 5), (76.1, 3.2), (76.1, 4), (76.1, 5), (88.9, 4), (88.9, 5), (88.9, 6.3),
+    (114.3, 4), (114.3, 5), (114.3, 6.3), (139.7, 5), (139.7, 6.3), (139.7, 8), (168.3, 5), (168.3, 6.3),
+    (168.3, 8), (168.3, 10), (219.1, 6.3), (219.1, 8), (219.1, 10), (219.1, 12.5), (273, 8), (273, 10),
+    (273, 12.5), (323.9, 8), (323.9, 10), (323.9, 12.5),
+]
+# I-shapes: name, (height, width, web thickness, flange thickness)
+I_SIZES = {
+    'IPE 80': (80, 46, 3.8, 5.2), 'IPE 100': (100, 55, 4.1, 5.7), 'IPE 120': (120, 64, 4.4, 6.3),
+    'IPE 140': (140, 73, 4.7, 6.9), 'IPE 160': (160, 82, 5.0, 7.4), 'IPE 180': (180, 91, 5.3, 8.0),
+    'IPE 200': (200, 100, 5.6, 8.5), 'IPE 220': (220, 110, 5.9, 9.2), 'IPE 240': (240, 120, 6.2, 9.8),
+    'IPE 270': (270, 135, 6.6, 10.2), 'IPE 300': (300, 150, 7.1, 10.7), 'IPE 330': (330, 160, 7.5, 11.5),
+    'IPE 360': (360, 170, 8.0, 12.7), 'IPE 400': (400, 180, 8.6, 13.5), 'IPE 450': (450, 190, 9.4, 14.6),
+    'IPE 500': (500, 200, 10.2, 16.0), 'IPE 550': (550, 210, 11.1, 17.2), 'IPE 600': (600, 220, 12.0, 19.0),
+    'HEA 100': (96, 100, 5.0, 8.0), 'HEA 120': (114, 120, 5.0, 8.0), 'HEA 140': (133, 140, 5.5, 8.5),
+    'HEA 160': (152, 160, 6.0, 9.0), 'HEA 180': (171, 180, 6.0, 9.5), 'HEA 200': (190, 200, 6.5, 10.0),
+    'HEA 220': (210, 220, 7.0, 11.0), 'HEA 240': (230, 240, 7.5, 12.0), 'HEA 260': (250, 260, 7.5, 12.5),
+    'HEA 280': (270, 280, 8.0, 13.0), 'HEA 300': (290, 300, 8.5, 14.0),
+}
+# Equal leg angles: (leg, thickness), bending about the axis parallel to a leg
+ANGLE_SIZES = [
+    (20, 3), (25, 3), (30, 3), (30, 4), (40, 4), (40, 5), (50, 5), (50, 6), (60, 6), (60, 8),
+    (70, 7), (80, 8), (90, 9), (100, 10), (120, 12), (150, 15),
+]
+
+FAMILIES = ('RHS', 'CHS', 'I', 'L')
+# Section properties that can be looked up
+KEYS = ('A', 'I', 'W', 'S', 'mass')
+
+
+def _composite(rectangles: list) -> dict:
+    """
+    Properties of sections made of rectangles (vectorized over the profiles).
+    Parameters:
+    - rectangles: List of (width, height, bottom, sign) arrays, sign -1 for the holes.
+    Returns:
+        dict: A, I (about the centroidal axis), W (elastic section modulus) and S (first moment of the area
+        above the centroid, for the shear stress).
+    """
+    area = sum(s * b * h for b, h, y, s in rectangles)
+    centroid = sum(s * b * h * (y + h / 2) for b, h, y, s in rectangles) / area
+    inertia = sum(s * (b * h ** 3 / 12 + b * h * (y + h / 2 - centroid) ** 2) for b, h, y, s in rectangles)
+    static = 0.0
+    for b, h, y, s in rectangles:
+        low = np.maximum(y, centroid)
+        above = np.clip(y + h - low, 0, None)
+        static = static + s * b * above * (low + above / 2 - centroid)
+    top = np.max(np.broadcast_arrays(*(y + h for b, h, y, s in rectangles)), axis=0)
+    bottom = np.min(np.broadcast_arrays(*(y for b, h, y, s in rectangles)), axis=0)
+    extreme = np.maximum(top - centroid, centroid - bottom)
+    return {'A': area, 'I': inertia, 'W': inertia / extreme, 'S': static}
+
+def _profiles() -> dict:
+    """Arrays of the standard profiles (one entry per profile)."""
+    columns = {key: [] for key in ('name', 'family', 'height', 'width', 'thickness', 'flange_thickness',
+                                   'A', 'I', 'W', 'S', 'shear_width')}
+
+    def add(family, names, height, width, thickness, flange, properties, shear_width):
+        columns['name'] += names
+        columns['family'] += [family] * len(names)
+        for key, values in (('height', height), ('width', width), ('thickness', thickness),
+                            ('flange_thickness', flange), ('shear_width', shear_width)):
+            columns[key].append(np.broadcast_to(values, len(names)))
+        for key in ('A', 'I', 'W', 'S'):
+            columns[key].append(properties[key])
+
+    h, b, t = np.array(RHS_SIZES, dtype=float).T
+    add('RHS', [f"RHS {H:g}x{B:g}x{T:g}" for H, B, T in RHS_SIZES], h, b, t, t,
+        _composite([(b, h, 0 * h, 1), (b - 2 * t, h - 2 * t, t, -1)]), 2 * t)
+
+    d, t = np.array(CHS_SIZES, dtype=float).T
+    r, ri = d / 2, d / 2 - t
+    inertia = np.pi * (r ** 4 - ri ** 4) / 4
+    add('CHS', [f"CHS {D:g}x{T:g}" for D, T in CHS_SIZES], d, d, t, t,
+        {'A': np.pi * (r ** 2 - ri ** 2), 'I': inertia, 'W': inertia / r, 'S': 2 * (r ** 3 - ri ** 3) / 3}, 2 * t)
+
+    h, b, tw, tf = np.array(list(I_SIZES.values()), dtype=float).T
+    add('I', list(I_SIZES), h, b, tw, tf,
+        _composite([(b, tf, 0 * h, 1), (tw, h - 2 * tf, tf, 1), (b, tf, h - tf, 1)]), tw)
+
+    a, t = np.array(ANGLE_SIZES, dtype=float).T
+    add('L', [f"L {A:g}x{A:g}x{T:g}" for A, T in ANGLE_SIZES], a, a, t, t,
+        _composite([(t, a, 0 * a, 1), (a - t, t, 0 * a, 1)]), t)
+
+    profiles = {key: np.concatenate(values) if key not in ('name', 'family') else np.array(values)
+                for key, values in columns.items()}
+    profiles['mass'] = profiles['A'] * MATERIAL_DENSITIES['steel'] * 1e-6  # kg/m
+    return profiles
+
+
+# SectionCatalogue class
+# Standard profiles in sorted arrays: the lightest profile with a property above a required value is found
+# by binary search, for all the bars at once.
+class SectionCatalogue:
+    def __init__(self, profiles: dict = None):
+        """
+        Parameters:
+        - profiles: Arrays of the profiles (name, family, height, width, thickness, flange_thickness, A, I, W, S,
+          shear_width, mass), default the standard profiles of this module.
+        """
+        self.profiles = _profiles() if profiles is None else {key: np.asarray(value) for key, value in profiles.items()}
+        self._indices = {}
+
+    def __len__(self):
+        return len(self.profiles['name'])
+
+    def _index(self, key: str, families: tuple) -> tuple:
+        """Profiles sorted by a property and, for every position, the lightest profile from there to the end."""
+        if key not in KEYS:
+            raise ValueError(f"key must be one of {KEYS}.")
+        cache_key = (key, families)
+        if cache_key not in self._indices:
+            selected = np.flatnonzero(np.isin(self.profiles['family'], families))
+            order = selected[np.argsort(self.profiles[key][selected], kind='stable')]
+            mass = self.profiles['mass'][order]
+            # Suffix minimum of the mass (and its position), so that any query is a single lookup: scanning from
+            # the end, the minimum moves at every strictly lighter profile, the last of which is the lightest
+            reverse = mass[::-1]
+            minimum = np.minimum.accumulate(reverse)
+            moved = np.concatenate(([True], reverse[1:] < minimum[:-1])) if len(order) else np.zeros(0, dtype=bool)
+            best = np.maximum.accumulate(np.where(moved, np.arange(len(order)), 0))
+            lightest = (len(order) - 1 - best)[::-1]
+            self._indices[cache_key] = (self.profiles[key][order], order[lightest])
+        return self._indices[cache_key]
+
+    def lightest(self, required, key: str = 'W', families: tuple = FAMILIES) -> np.ndarray:
+        """
+        Find the lightest profiles whose property is at least the required value.
+        Parameters:
+        - required: Required value(s) of the property (scalar or array, e.g. one value per bar).
+        - key: Property to compare ('A', 'I', 'W', 'S' or 'mass').
+        - families: Families of profiles allowed ('RHS', 'CHS', 'I', 'L').
+        Returns:
+            np.ndarray: Indices of the profiles (-1 where no profile is large enough), same shape as required.
+        """
+        values, lightest = self._index(key, tuple(families))
+        position = np.searchsorted(values, np.asarray(required, dtype=float), side='left')
+        found = position < len(values)
+        return np.where(found, lightest[np.minimum(position, len(values) - 1)] if len(values) else -1, -1)
+
+    def properties(self, indices) -> dict:
+        """
+        Return the properties of some profiles.
+        Parameters:
+        - indices: Indices of the profiles (as returned by lightest).
+        Returns:
+            dict: Arrays of the properties (name, family, dimensions, A, I, W, S, shear_width, mass).
+        """
+        indices = np.asarray(indices)
+        if np.any(indices < 0):
+            raise ValueError("No profile for some of the indices (-1).")
+        return {key: values[indices] for key, values in self.profiles.items()}
+
+    def apply(self, bars, indices):
+        """
+        Give the sections of the catalogue to bars. Only the hollow sections (RHS, CHS) can be represented
+        by a Bar; the other families raise a ValueError.
+        Parameters:
+        - bars: List of Bar objects.
+        - indices: Index of the profile of every bar (as returned by lightest).
+        """
+        bars = list(bars)
+        profiles = self.properties(np.broadcast_to(indices, len(bars)))
+        unsupported = ~np.isin(profiles['family'], ('RHS', 'CHS'))
+        if np.any(unsupported):
+            raise ValueError(f"Bars only support RHS and CHS profiles, not {sorted(set(profiles['name'][unsupported]))}.")
+        for bar, family, height, width, thickness in zip(bars, profiles['family'].tolist(), profiles['height'].tolist(),
+                                                         profiles['width'].tolist(), profiles['thickness'].tolist()):
+            bar.hollow = True
+            bar.width_thickness = thickness
+            if family == 'RHS':
+                bar.section, bar.width, bar.height, bar.radius = 'rectangular', width, height, None
+                bar.height_thickness = thickness
+            else:
+                bar.section, bar.width, bar.height, bar.radius = 'circular', 0.0, 0.0, width / 2
+                bar.height_thickness = 0
+
+    def size_bars(self, bars, required, key: str = 'W', families: tuple = ('RHS', 'CHS')) -> np.ndarray:
+        """
+        Give every bar the lightest hollow profile meeting its requirement (vectorized lookup).
+        Parameters:
+        - bars: List of Bar objects.
+        - required: Required value of the property for every bar (e.g. the section modulus M / f_y).
+        - key: Property to compare ('A', 'I', 'W', 'S').
+        - families: Families of profiles allowed (RHS and/or CHS).
+        Returns:
+            np.ndarray: Index of the profile of every bar. Raises ValueError if no profile is large enough.
+        """
+        bars = list(bars)
+        indices = self.lightest(np.broadcast_to(required, len(bars)), key, families)
+        if np.any(indices < 0):
+            raise ValueError(f"No profile of the catalogue is large enough for the bars {np.flatnonzero(indices < 0).tolist()}.")
+        self.apply(bars, indices)
+        return indices
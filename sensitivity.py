@@ -0,0 +1,130 @@
+import numpy as np
+from Structure_Analysis import bar_arrays, critical_samples, internal_forces, load_arrays, section_properties
+
+# Design parameters of the sections and of the bars
+SECTION_PARAMETERS = ('width', 'height', 'width_thickness', 'height_thickness', 'radius')
+PARAMETERS = SECTION_PARAMETERS + ('length', 'alpha', 'P')
+
+
+def section_derivatives(arrays: dict) -> tuple:
+    """
+    Section properties of many bars and their analytic derivatives (same formulas as section_properties).
+    Parameters:
+    - arrays: Bar properties, as returned by bar_arrays.
+    Returns:
+        tuple: section properties (see section_properties) and their derivatives, as
+        {'A': {'width': dA/dwidth, ...}, 'I': {...}, 'S': {...}, 'b': {...}} (one entry per bar, 0 when a
+        parameter does not apply to the section).
+    """
+    w = arrays['width']
+    h = arrays['height']
+    tw = arrays['width_thickness']
+    th = arrays['height_thickness']
+    r = arrays['radius']
+    hollow = arrays['hollow'].astype(float)
+    circular = arrays['circular']
+    sections = section_properties(arrays)
+    zero = np.zeros_like(w)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Rectangular sections: inner dimensions wi = w - 2 tw and hi = h - 2 th when hollow
+        wi = hollow * (w - 2 * tw)
+        hi = hollow * (h - 2 * th)
+        g = w * h ** 3 - wi * (h - th) ** 3  # S = g / (6 h)
+        rect = {
+            'A': {'width': h - hollow * hi, 'height': w - hollow * wi,
+                  'width_thickness': 2 * hollow * hi, 'height_thickness': 2 * hollow * wi, 'radius': zero},
+            'I': {'width': (h ** 3 - hollow * hi ** 3) / 12, 'height': (w * h ** 2 - hollow * wi * hi ** 2) / 4,
+                  'width_thickness': hollow * hi ** 3 / 6, 'height_thickness': hollow * wi * hi ** 2 / 2, 'radius': zero},
+            'S': {'width': (h ** 3 - hollow * (h - th) ** 3) / (6 * h),
+                  'height': (w * h ** 2 - wi * (h - th) ** 2) / (2 * h) - g / (6 * h ** 2),
+                  'width_thickness': hollow * (h - th) ** 3 / (3 * h),
+                  'height_thickness': wi * (h - th) ** 2 / (2 * h), 'radius': zero},
+            'b': {'width': 1 - hollow, 'height': zero, 'width_thickness': hollow, 'height_thickness': zero, 'radius': zero},
+        }
+
+        # Circular sections: inner radius ri = r - tw when hollow, S = pi (r^4 - ri^4) / (4 r)
+        ri = hollow * (r - tw)
+        circ = {
+            'A': {'width': zero, 'height': zero, 'width_thickness': 2 * np.pi * hollow * ri, 'height_thickness': zero,
+                  'radius': 2 * np.pi * (r - hollow * ri)},
+            'I': {'width': zero, 'height': zero, 'width_thickness': np.pi * hollow * ri ** 3, 'height_thickness': zero,
+                  'radius': np.pi * (r ** 3 - hollow * ri ** 3)},
+            'S': {'width': zero, 'height': zero, 'width_thickness': np.pi * hollow * ri ** 3 / r, 'height_thickness': zero,
+                  'radius': (np.pi * (r ** 3 - hollow * ri ** 3) - sections['S']) / r},
+            'b': {'width': zero, 'height': zero, 'width_thickness': hollow, 'height_thickness': zero,
+                  'radius': 2 * (1 - hollow)},
+        }
+
+    derivatives = {key: {parameter: np.where(circular, circ[key][parameter], rect[key][parameter])
+                         for parameter in SECTION_PARAMETERS} for key in rect}
+    return sections, derivatives
+
+def von_mises_sensitivities(bars, n_samples: int = 100, P: float = 1.0) -> dict:
+    """
+    Maximum Von Mises stress of many bars and its analytic derivatives with respect to the design parameters,
+    in a single vectorized pass (no finite differences).
+    The maximum is taken over the critical samples of the stress diagrams (see critical_samples). The loads keep
+    their global components and their position as a fraction of the length; they are proportional to P.
+    Parameters:
+    - bars: List of Bar objects.
+    - n_samples: Number of samples along each bar of the stress diagrams.
+    - P: Current value of the load the loads are proportional to (e.g. the platform load of the GUI).
+    Returns:
+        dict: position, von_mises, A, I, S (one entry per bar), dvon_mises ({parameter: derivative} for PARAMETERS,
+        alpha in degrees) and dA, dI, dS ({parameter: derivative} for SECTION_PARAMETERS).
+    """
+    bars = list(bars)
+    arrays = bar_arrays(bars)
+    sections, derivatives = section_derivatives(arrays)
+    positions, forces, mask = load_arrays(bars)
+    fx, fy, m = forces[..., 0], forces[..., 1], forces[..., 2]
+    zero = np.zeros_like(fx)
+
+    # Internal forces, forces of the moment loads only (for dM/dlength) and of the loads turned by -90 degrees
+    # (dt/dalpha = n and dn/dalpha = -t, so the derivatives with respect to alpha are the forces of the turned loads)
+    x_data, shear, normal, flexion = internal_forces(bars, n_samples, (positions, forces, mask))
+    _, _, _, flexion_m = internal_forces(bars, n_samples, (positions, np.stack([zero, zero, m], axis=-1), mask))
+    _, shear_a, normal_a, flexion_a = internal_forces(bars, n_samples, (positions, np.stack([fy, -fx, zero], axis=-1), mask))
+
+    # Most stressed section among the critical samples
+    index = critical_samples(bars, n_samples)
+    A, I, S, b = (sections[key][:, None] for key in ('A', 'I', 'S', 'b'))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sigma = np.take_along_axis(normal, index, 1) / A + np.take_along_axis(flexion, index, 1) / I
+        tau = np.take_along_axis(shear, index, 1) * S / (I * b)
+    best = np.take_along_axis(index, np.argmax(np.nan_to_num(sigma**2 + 3 * tau**2, nan=-1.0), axis=1)[:, None], 1)[:, 0]
+    rows = np.arange(len(bars))
+    N, T, M = normal[rows, best], shear[rows, best], flexion[rows, best]
+    A, I, S, b = (sections[key] for key in ('A', 'I', 'S', 'b'))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sigma = N / A + M / I
+        tau = T * S / (I * b)
+        von_mises = np.sqrt(sigma**2 + 3 * tau**2)
+
+        def derivative(dN, dT, dM, dA, dI, dS, db):
+            """Derivative of the Von Mises stress from the derivatives of the forces and of the section."""
+            d_sigma = dN / A - N * dA / A**2 + dM / I - M * dI / I**2
+            d_tau = (dT * S + T * dS) / (I * b) - tau * (dI / I + db / b)
+            return (sigma * d_sigma + 3 * tau * d_tau) / von_mises
+
+        sensitivities = {parameter: derivative(0, 0, 0, *(derivatives[key][parameter] for key in ('A', 'I', 'S', 'b')))
+                         for parameter in SECTION_PARAMETERS}
+        # The moment of the forces grows with the length (load positions are fractions of the length)
+        sensitivities['length'] = derivative(0, 0, (M - flexion_m[rows, best]) / arrays['length'], 0, 0, 0, 0)
+        sensitivities['alpha'] = np.radians(derivative(normal_a[rows, best], shear_a[rows, best], flexion_a[rows, best],
+                                                       0, 0, 0, 0))
+        sensitivities['P'] = von_mises / P
+
+    return {
+        'position': x_data[rows, best],
+        'von_mises': von_mises,
+        'A': A,
+        'I': I,
+        'S': S,
+        'dvon_mises': sensitivities,
+        'dA': derivatives['A'],
+        'dI': derivatives['I'],
+        'dS': derivatives['S'],
+    }
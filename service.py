@@ -0,0 +1,250 @@
+import argparse
+import asyncio
+import json
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from Structure_Analysis import Structure, resistance_check
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+def _to_json(value):
+    """Convert the NumPy values of a result to plain Python values."""
+    if isinstance(value, dict):
+        return {key: _to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def check_batch(models: list, n_samples: int = 100) -> list:
+    """
+    Resistance check of many structures with a single vectorized evaluation over all their bars.
+    Parameters:
+    - models: Structures as dictionaries (see Structure.to_dict).
+    - n_samples: Number of samples along each bar of the stress diagrams.
+    Returns:
+        list: For every structure, the results of resistance_check (lists with one entry per bar).
+    """
+    structures = [Structure.from_dict(model) for model in models]
+    bars = [bar for structure in structures for bar in structure.bars]
+    results = resistance_check(bars, n_samples)
+    bounds = np.cumsum([0] + [len(structure.bars) for structure in structures])
+    return [_to_json({key: values[start:end] for key, values in results.items()})
+            for start, end in zip(bounds[:-1], bounds[1:])]
+
+def solve_model(model: dict) -> dict:
+    """
+    Linear static analysis of a structure given as a dictionary (see Structure.to_dict).
+    Returns:
+        dict: node coordinates, displacements (n_nodes, 3) and local end forces of the bars (n_bars, 6).
+    """
+    from fem import solve_static  # scipy.sparse is only needed by this method
+    u, end_forces, frame = solve_static(Structure.from_dict(model))
+    return _to_json({'nodes': frame.coords, 'displacements': u.reshape(-1, 3), 'end_forces': end_forces})
+
+
+# AnalysisServer class
+# Local JSON-RPC 2.0 server (over HTTP POST) around the structural checks.
+# Concurrent "check" requests are collected for a short time window and evaluated together in a single
+# vectorized pass; the CPU-heavy work runs in a process pool so the event loop stays responsive.
+class AnalysisServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, processes: int = None,
+                 batch_window: float = 0.005, max_batch: int = 256):
+        """
+        Parameters:
+        - host: Address to listen on (localhost by default).
+        - port: Port to listen on (0 to pick a free port, see the port attribute after start).
+        - processes: Number of worker processes (default: number of CPUs).
+        - batch_window: Time in seconds during which concurrent check requests are batched together.
+        - max_batch: Maximum number of structures evaluated in one batch.
+        """
+        self.host = host
+        self.port = port
+        self.processes = processes
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.methods = {'ping': self._ping, 'check': self._check, 'solve': self._solve}
+        self._server = None
+        self._executor = None
+        self._queue = None
+        self._batcher = None
+
+    async def start(self):
+        """Start the worker processes and listen for connections."""
+        self._executor = ProcessPoolExecutor(max_workers=self.processes)
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._batch_loop())
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """Start the server (if needed) and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """Stop listening and shut the worker processes down."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Read one HTTP request, dispatch its JSON-RPC payload and write the response."""
+        try:
+            request_line = await reader.readline()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                key, _, value = line.decode("latin-1").partition(":")
+                headers[key.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+            if not request_line.startswith(b"POST"):
+                status, payload = "405 Method Not Allowed", {"error": "use POST with a JSON-RPC 2.0 body"}
+            else:
+                status, payload = "200 OK", await self._dispatch_payload(body)
+
+            data = b"" if payload is None else json.dumps(payload).encode()
+            writer.write((f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                          f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n").encode() + data)
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch_payload(self, body: bytes):
+        """Handle a single JSON-RPC request or a batch (list) of requests."""
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return self._error(None, PARSE_ERROR, "Parse error")
+        if isinstance(payload, list):
+            if not payload:
+                return self._error(None, INVALID_REQUEST, "Empty batch")
+            responses = await asyncio.gather(*(self._dispatch(request) for request in payload))
+            return [response for response in responses if response is not None] or None
+        return await self._dispatch(payload)
+
+    async def _dispatch(self, request):
+        """Run one JSON-RPC request. Notifications (requests without id) get no response."""
+        if not isinstance(request, dict) or request.get("jsonrpc") != "2.0" or "method" not in request:
+            return self._error(None, INVALID_REQUEST, "Invalid Request")
+        request_id = request.get("id")
+        method = self.methods.get(request["method"])
+        if method is None:
+            return self._error(request_id, METHOD_NOT_FOUND, f"Method '{request['method']}' not found")
+        params = request.get("params", {})
+        try:
+            result = await (method(**params) if isinstance(params, dict) else method(*params))
+        except (TypeError, ValueError, KeyError) as error:
+            return self._error(request_id, INVALID_PARAMS, str(error))
+        except Exception as error:
+            return self._error(request_id, INTERNAL_ERROR, f"{type(error).__name__}: {error}")
+        if "id" not in request:
+            return None
+        return {"jsonrpc": "2.0", "result": result, "id": request_id}
+
+    @staticmethod
+    def _error(request_id, code: int, message: str) -> dict:
+        return {"jsonrpc": "2.0", "error": {"code": code, "message": message}, "id": request_id}
+
+    async def _ping(self):
+        return "pong"
+
+    async def _check(self, structure: dict):
+        """Resistance check of every bar of a structure (batched with the concurrent requests)."""
+        if not isinstance(structure, dict) or not isinstance(structure.get('bars'), list):
+            raise ValueError("structure must be a dictionary with a list of bars (see Structure.to_dict).")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((structure, future))
+        return await future
+
+    async def _solve(self, structure: dict):
+        """Linear static analysis of a structure."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, solve_model, structure)
+
+    async def _batch_loop(self):
+        """Collect the queued check requests and evaluate them in batches in the process pool."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            loop.create_task(self._run_batch(batch))
+
+    async def _run_batch(self, batch: list):
+        models = [model for model, _ in batch]
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(self._executor, check_batch, models)
+        except Exception:
+            # Evaluate the structures one at a time, so that only the invalid ones fail
+            for model, future in batch:
+                try:
+                    result = (await asyncio.get_running_loop().run_in_executor(self._executor, check_batch, [model]))[0]
+                    future.set_result(result)
+                except Exception as error:
+                    future.set_exception(ValueError(f"{type(error).__name__}: {error}"))
+            return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+def call(method: str, params=None, host: str = "127.0.0.1", port: int = 8765, timeout: float = 60):
+    """
+    Call a method of a running AnalysisServer.
+    Parameters:
+    - method: Name of the method ('ping', 'check' or 'solve').
+    - params: Parameters of the method (e.g. {'structure': structure.to_dict()}).
+    - host, port: Address of the server.
+    - timeout: Timeout of the request in seconds.
+    Returns:
+        The result of the method. Raises RuntimeError if the server returns an error.
+    """
+    request = {"jsonrpc": "2.0", "method": method, "params": params or {}, "id": 1}
+    http_request = urllib.request.Request(f"http://{host}:{port}/", data=json.dumps(request).encode(),
+                                          headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(http_request, timeout=timeout) as response:
+        payload = json.loads(response.read())
+    if "error" in payload:
+        raise RuntimeError(f"{payload['error']['message']} (code {payload['error']['code']})")
+    return payload["result"]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Local JSON-RPC server for structural checks.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    server = AnalysisServer(args.host, args.port, args.processes)
+    print(f"Analysis server listening on http://{args.host}:{args.port}/")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("Server stopped.")
@@ -0,0 +1,134 @@
+import numpy as np
+
+
+# GridIndex class
+# Uniform grid over the bounding boxes of the bars, used to find the bars inside a region
+# without looping over the whole structure.
+class GridIndex:
+    def __init__(self, x0, y0, x1, y1, cell_size: float = None):
+        """
+        Build a uniform grid index over a set of segments (or boxes).
+        Parameters:
+        - x0, y0: Arrays with the coordinates of the start points.
+        - x1, y1: Arrays with the coordinates of the end points.
+        - cell_size: Size of a grid cell (default: chosen from the extent and the number of items).
+        """
+        x0 = np.asarray(x0, dtype=float)
+        y0 = np.asarray(y0, dtype=float)
+        x1 = np.asarray(x1, dtype=float)
+        y1 = np.asarray(y1, dtype=float)
+
+        self.xmin = np.minimum(x0, x1)
+        self.xmax = np.maximum(x0, x1)
+        self.ymin = np.minimum(y0, y1)
+        self.ymax = np.maximum(y0, y1)
+        self.size = len(self.xmin)
+
+        if self.size == 0:
+            self.origin = (0.0, 0.0)
+            self.cell_size = 1.0 if cell_size is None else cell_size
+            self.shape = (0, 0)
+            self.offsets = np.zeros(1, dtype=np.int64)
+            self.items = np.zeros(0, dtype=np.int64)
+            return
+
+        self.origin = (self.xmin.min(), self.ymin.min())
+        width = self.xmax.max() - self.origin[0]
+        height = self.ymax.max() - self.origin[1]
+
+        if cell_size is None:
+            # About one item per cell, but never smaller than the typical item
+            typical = np.median(np.maximum(self.xmax - self.xmin, self.ymax - self.ymin))
+            cell_size = max(np.sqrt(max(width * height, 1e-12) / self.size), typical)
+            if cell_size <= 0:
+                cell_size = max(width, height, 1.0)
+        self.cell_size = float(cell_size)
+
+        nx = int(width // self.cell_size) + 1
+        ny = int(height // self.cell_size) + 1
+        self.shape = (nx, ny)
+
+        # Cell range covered by every box
+        ix0, iy0 = self._cell(self.xmin, self.ymin)
+        ix1, iy1 = self._cell(self.xmax, self.ymax)
+        span_x = ix1 - ix0 + 1
+        span_y = iy1 - iy0 + 1
+        counts = span_x * span_y
+
+        # Expand every box into the list of the cells it touches
+        item = np.repeat(np.arange(self.size), counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        cx = ix0[item] + local % span_x[item]
+        cy = iy0[item] + local // span_x[item]
+        cell = cy * nx + cx
+
+        order = np.argsort(cell, kind='stable')
+        self.items = item[order]
+        self.offsets = np.zeros(nx * ny + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cell, minlength=nx * ny), out=self.offsets[1:])
+
+    def _cell(self, x, y):
+        """Return the (clipped) grid cell of the given coordinates."""
+        nx, ny = self.shape
+        ix = np.clip(((np.asarray(x) - self.origin[0]) // self.cell_size).astype(np.int64), 0, nx - 1)
+        iy = np.clip(((np.asarray(y) - self.origin[1]) // self.cell_size).astype(np.int64), 0, ny - 1)
+        return ix, iy
+
+    def query(self, xmin: float, ymin: float, xmax: float, ymax: float) -> np.ndarray:
+        """
+        Find the items whose bounding box intersects a rectangle.
+        Parameters:
+        - xmin, ymin, xmax, ymax: Limits of the rectangle.
+        Returns:
+            np.ndarray: Sorted indices of the intersecting items.
+        """
+        if self.size == 0:
+            return np.zeros(0, dtype=np.int64)
+        (ix0, ix1), (iy0, iy1) = self._cell([xmin, xmax], [ymin, ymax])
+        nx = self.shape[0]
+
+        # Gather the items of all the cells inside the rectangle
+        cells = (np.arange(iy0, iy1 + 1)[:, None] * nx + np.arange(ix0, ix1 + 1)[None, :]).ravel()
+        starts = self.offsets[cells]
+        counts = self.offsets[cells + 1] - starts
+        total = counts.sum()
+        if total == 0:
+            return np.zeros(0, dtype=np.int64)
+        positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+        candidates = np.unique(self.items[positions])
+
+        # Exact test on the bounding boxes (cells are larger than the rectangle)
+        inside = ((self.xmax[candidates] >= xmin) & (self.xmin[candidates] <= xmax) &
+                  (self.ymax[candidates] >= ymin) & (self.ymin[candidates] <= ymax))
+        return candidates[inside]
+
+    def pairs(self) -> np.ndarray:
+        """
+        Find all the pairs of items whose bounding boxes intersect (or touch), using the items sharing a cell
+        as candidates instead of testing every pair.
+        Returns:
+            np.ndarray: Sorted, unique pairs (n_pairs, 2) of item indices, with i < j.
+        """
+        if self.size < 2:
+            return np.zeros((0, 2), dtype=np.int64)
+        # Every entry of a cell with the entries that follow it in the same cell
+        cell_end = np.repeat(self.offsets[1:], np.diff(self.offsets))
+        partners = cell_end - np.arange(len(self.items)) - 1
+        total = partners.sum()
+        first = np.repeat(np.arange(len(self.items)), partners)
+        second = first + 1 + np.arange(total) - np.repeat(np.cumsum(partners) - partners, partners)
+        i, j = self.items[first], self.items[second]
+        keys = np.unique(np.minimum(i, j) * self.size + np.maximum(i, j))
+        pairs = np.stack([keys // self.size, keys % self.size], axis=1)
+
+        # Exact test on the bounding boxes (sharing a cell does not mean intersecting)
+        i, j = pairs[:, 0], pairs[:, 1]
+        overlap = ((self.xmax[i] >= self.xmin[j]) & (self.xmin[i] <= self.xmax[j]) &
+                   (self.ymax[i] >= self.ymin[j]) & (self.ymin[i] <= self.ymax[j]))
+        return pairs[overlap]
+
+    def bounds(self) -> tuple:
+        """Return the extent (xmin, ymin, xmax, ymax) of all the indexed items."""
+        if self.size == 0:
+            return 0.0, 0.0, 0.0, 0.0
+        return self.xmin.min(), self.ymin.min(), self.xmax.max(), self.ymax.max()
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The modules of the project are flat files at the root of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# utils imports the Tk backend of matplotlib: draw offscreen in the tests
+os.environ.setdefault("MPLBACKEND", "Agg")
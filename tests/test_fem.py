@@ -0,0 +1,263 @@
+import numpy as np
+import pytest
+from Structure_Analysis import Structure
+from fem import DENSITY_TO_T_PER_MM3, modal_analysis
+
+
+def cantilever(n_elements=40, length=1000.0, width=20.0, height=40.0):
+    """Horizontal steel cantilever split in equal elements, clamped at x = 0."""
+    x = np.linspace(0, length, n_elements + 1)
+    coordinates = np.stack([x, np.zeros_like(x)], axis=1)
+    connectivity = np.stack([np.arange(n_elements), np.arange(1, n_elements + 1)], axis=1)
+    structure = Structure("Cantilever")
+    bars = structure.add_bars(coordinates, connectivity, width=width, height=height, material='steel')
+    structure.add_support(bars[0].start_node, True, True, True)
+    return structure, bars
+
+
+def test_modal_analysis_matches_cantilever_frequencies():
+    length, width, height = 1000.0, 20.0, 40.0
+    structure, _ = cantilever(40, length, width, height)
+    frequencies, modes, model = modal_analysis(structure, k=4)
+
+    # Bending modes of a cantilever: f = (beta L)^2 / (2 pi L^2) sqrt(E I / (rho A)), in the plane of the frame
+    E, rho = 210000.0, 7850 * DENSITY_TO_T_PER_MM3
+    A, I = width * height, width * height**3 / 12
+    # (the first axial mode, sqrt(E / rho) / (4 L), is above the fourth bending mode for this bar)
+    beta_L = np.array([1.875104, 4.694091, 7.854757, 10.995541])
+    expected = beta_L**2 / (2 * np.pi * length**2) * np.sqrt(E * I / (rho * A))
+    assert np.sqrt(E / rho) / (4 * length) > expected[-1]
+    np.testing.assert_allclose(frequencies, expected, rtol=1e-3)
+    assert modes.shape == (model.n_dofs, 4)
+    assert np.all(modes[:3] == 0)  # clamped dofs
+
+
+def test_linear_buckling_matches_euler_cantilever():
+    from buckling import linear_buckling
+
+    length, width, height, P = 1000.0, 20.0, 40.0, 1000.0
+    structure, bars = cantilever(20, length, width, height)
+    bars[-1].add_load(1, -P, 0, 0)  # compression at the free end
+    load_factors, modes, model = linear_buckling(structure, k=2)
+
+    critical = np.pi**2 * 210000.0 * width * height**3 / 12 / (4 * length**2)
+    assert load_factors[0] * P == pytest.approx(critical, rel=1e-3)
+    assert load_factors[1] * P == pytest.approx(9 * critical, rel=1e-2)
+
+
+@pytest.mark.parametrize("k, clamped, message", [(0, False, "k must be"), (6, False, "k must be"),
+                                                  (1, True, "All the dofs")])
+def test_linear_buckling_checks_k_before_factorizing(monkeypatch, k, clamped, message):
+    import buckling
+
+    structure, bars = cantilever(2)  # 6 free dofs
+    bars[-1].add_load(1, -1000.0, 0, 0)
+    if clamped:
+        structure.add_support(bars[-1].end_node, True, True, True)
+        structure.add_support(bars[0].end_node, True, True, True)
+
+    def fail(matrix):
+        raise AssertionError("factorize called before the checks")
+
+    monkeypatch.setattr(buckling, 'factorize', fail)
+    with pytest.raises(ValueError, match=message):
+        buckling.linear_buckling(structure, k=k)
+
+
+def loaded_frame():
+    from generators import portal_frame
+
+    frame = portal_frame(n_bays=3, n_stories=4, bay_width=4000, story_height=3000, width=100, height=200, material='steel')
+    for i, bar in enumerate(frame.bars):
+        bar.add_load(0.5, 1000.0 * (i % 3 - 1), -2000.0, 1e4 * (i % 2))
+    return frame
+
+
+@pytest.mark.parametrize("max_rank", [300, 20])
+def test_static_solver_update_matches_fresh_solve(max_rank):
+    from fem import StaticSolver
+
+    frame = loaded_frame()
+    solver = StaticSolver(frame, max_rank=max_rank)
+    solver.solve()
+
+    # Successive edits of sections and materials, accumulated in the low-rank update (or refactorized)
+    for bars, changes in (([0], {'width': 150}), ([5, 17], {'height': 120}), ([0, 9], {'material': 'aluminum'})):
+        for i in bars:
+            for key, value in changes.items():
+                setattr(frame.bars[i], key, value)
+        solver.update_bars(bars)
+        u, end_forces = solver.solve()
+
+        fresh_u, fresh_end_forces = StaticSolver(frame).solve()
+        np.testing.assert_allclose(u, fresh_u, rtol=1e-9, atol=1e-12 * np.abs(fresh_u).max())
+        np.testing.assert_allclose(end_forces, fresh_end_forces, rtol=1e-7, atol=1e-7 * np.abs(fresh_end_forces).max())
+    if max_rank == 20:
+        assert solver.rank <= 20
+    else:
+        assert solver.rank > 0  # no new factorization
+
+
+def test_static_solver_update_after_moving_a_node():
+    from fem import StaticSolver
+
+    frame = loaded_frame()
+    solver = StaticSolver(frame)
+    # Move a roof node shared by several bars (same Node object): the connected bars change length and angle
+    bar = frame.bars[-1]
+    bar.end_node.y += 500
+    connected = [i for i, other in enumerate(frame.bars) if bar.end_node in (other.start_node, other.end_node)]
+    for i in connected:
+        other = frame.bars[i]
+        other.length = np.hypot(other.end_node.x - other.start_node.x, other.end_node.y - other.start_node.y)
+    solver.update_bars(connected)
+
+    u, _ = solver.solve()
+    fresh_u, _ = StaticSolver(frame).solve()
+    np.testing.assert_allclose(u, fresh_u, rtol=1e-9, atol=1e-12 * np.abs(fresh_u).max())
+
+
+@pytest.mark.parametrize("update", [False, True])
+def test_solve_cases_matches_each_case_on_its_own(update):
+    import scipy.sparse.linalg as spla
+    from fem import StaticSolver
+
+    frame = loaded_frame()
+    solver = StaticSolver(frame)
+    if update:  # solve_cases on the low-rank update of the factorization
+        frame.bars[3].width = 150
+        solver.update_bars([3])
+    model = solver.model
+
+    # Cases: the loads of the bars, a horizontal load at the top left node, random loads on all the dofs
+    F = np.zeros((model.n_dofs, 3))
+    F[:, 0] = model.load_vector()
+    F[model.dof(0, 12000, 0), 1] = 5000.0
+    F[:, 2] = np.random.default_rng(0).normal(size=model.n_dofs) * 1000
+    u, nodal_end_forces = solver.solve_cases(F)
+    assert u.shape == (model.n_dofs, 3) and nodal_end_forces.shape == (len(frame.bars), 6, 3)
+
+    fresh = StaticSolver(frame)
+    K = model.reduce(model.assemble(fresh.elements))
+    for case in range(3):
+        expected = model.expand(spla.spsolve(K, F[model.free, case]))
+        atol = 1e-12 * np.abs(expected).max()
+        np.testing.assert_allclose(u[:, case], expected, rtol=1e-9, atol=atol)
+        np.testing.assert_allclose(solver.solve_cases(F[:, [case]])[0][:, 0], expected, rtol=1e-9, atol=atol)
+        forces = model.nodal_end_forces(expected)
+        np.testing.assert_allclose(nodal_end_forces[..., case], forces, rtol=1e-7, atol=1e-9 * np.abs(forces).max())
+
+    # The first case is the loads of the bars: same results as the single solve
+    single_u, end_forces = fresh.solve()
+    np.testing.assert_allclose(u[:, 0], single_u, rtol=1e-9, atol=1e-12 * np.abs(single_u).max())
+    np.testing.assert_allclose(nodal_end_forces[..., 0] - model.equivalent_loads(), end_forces,
+                               rtol=1e-7, atol=1e-9 * np.abs(end_forces).max())
+
+    structure_u, structure_forces = frame.solve_load_cases(F)
+    np.testing.assert_allclose(structure_u, u, rtol=1e-9, atol=1e-12 * np.abs(u).max())
+    np.testing.assert_allclose(structure_forces, nodal_end_forces,
+                               rtol=1e-7, atol=1e-9 * np.abs(nodal_end_forces).max())
+    with pytest.raises(ValueError):
+        solver.solve_cases(F[:-1])
+
+
+def beam(length=1000.0, width=20.0, height=40.0):
+    """Single horizontal steel bar from (0, 0) to (length, 0), as one element."""
+    structure = Structure("Beam")
+    bar, = structure.add_bars([(0, 0), (length, 0)], [(0, 1)], width=width, height=height, material='steel')
+    return structure, bar, 210000.0 * width * height**3 / 12
+
+
+@pytest.mark.parametrize("a", [1.0, 0.3])
+def test_deflections_match_cantilever_point_load(a):
+    from fem import deflections
+
+    length, P = 1000.0, 500.0
+    structure, bar, EI = beam(length)
+    structure.add_support(bar.start_node, True, True, True)
+    bar.add_load(a, 0, -P, 0)
+    result = deflections(structure, n_points=21)
+
+    # v(x) = -P x^2 (3 a - x) / (6 EI) before the load, -P a^2 (3 x - a) / (6 EI) after it (a in mm)
+    x = np.linspace(0, length, 21)
+    a = a * length
+    expected = -P * np.where(x <= a, x**2 * (3 * a - x), a**2 * (3 * x - a)) / (6 * EI)
+    np.testing.assert_allclose(result['displacements'][0, :, 1], expected, rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(result['displacements'][0, :, 0], 0, atol=1e-12)
+    assert result['max_displacement'][0] == pytest.approx(abs(expected[-1]))
+
+
+def test_deflections_match_simply_supported_point_load():
+    from fem import deflections
+
+    length, P = 1000.0, 500.0
+    structure, bar, EI = beam(length)
+    structure.add_support(bar.start_node)
+    structure.add_support(bar.end_node, ux=False)
+    bar.add_load(0.5, 0, -P, 0)
+    result = deflections(structure, n_points=21)
+
+    # v(x) = -P x (3 L^2 - 4 x^2) / (48 EI) for x <= L / 2, symmetric
+    x = np.linspace(0, length, 21)
+    s = np.minimum(x, length - x)
+    expected = -P * s * (3 * length**2 - 4 * s**2) / (48 * EI)
+    np.testing.assert_allclose(result['displacements'][0, :, 1], expected, rtol=1e-9, atol=1e-12)
+    assert result['max_deflection'][0] == pytest.approx(P * length**3 / (48 * EI))
+    assert result['max_deflection_position'][0] == pytest.approx(length / 2)
+
+
+def test_scissor_frame_is_joined_at_the_crossing():
+    from fem import FrameModel, deflections
+    from generators import scissor_frame, scissor_lift
+
+    lift = scissor_lift(30, 60, 10)
+    frame = scissor_frame(lift)
+    model = FrameModel(frame)
+    ae = lift.bars[0]
+    c = model.find_node((ae.start_node.x + ae.end_node.x) / 2, (ae.start_node.y + ae.end_node.y) / 2)
+    assert model.n_nodes == 5
+    assert np.sum(model.connectivity == c) == 4
+    assert [constraints for _, constraints in frame.supports] == [(True, True, True)] * 2
+
+    # Same loads as the crossing bars, the opposite loads at C cancel on the joint
+    total = np.sum([values for bar in frame.bars for values in bar.load.values()], axis=0)
+    np.testing.assert_allclose(total, np.sum([values for bar in lift.bars[:2] for values in bar.load.values()], axis=0))
+
+    # Joined at C, the bars deflect less than two independent cantilevers
+    cantilevers = Structure("Cantilevers")
+    for bar in lift.bars[:2]:
+        cantilevers.add_bar(bar)
+        cantilevers.add_support(bar.start_node, rz=True)
+    joined = deflections(frame)['max_displacement']
+    separate = deflections(cantilevers)['max_displacement']
+    assert joined[[1, 3]].max() < separate.max()
+
+
+def test_scissor_frame_modes():
+    from generators import scissor_frame, scissor_lift
+
+    lift = scissor_lift(30, 60, 10)
+    frequencies, modes, model = modal_analysis(scissor_frame(lift, n_elements=20), k=6)
+    reference, _, _ = modal_analysis(scissor_frame(lift, n_elements=80), k=6)
+    np.testing.assert_allclose(frequencies, reference, rtol=1e-3)
+
+    # Two independent cantilevers have the same frequencies two by two, the joined frame does not
+    cantilevers = Structure("Cantilevers")
+    for bar in lift.bars[:2]:
+        cantilevers.add_bar(bar)
+        cantilevers.add_support(bar.start_node, rz=True)
+    separate, _, _ = modal_analysis(cantilevers, k=2)
+    assert separate[1] == pytest.approx(separate[0])
+    assert frequencies[1] > 1.1 * frequencies[0]
+
+    # The frame is symmetric about the vertical through C: every mode is symmetric or antisymmetric
+    xc = lift.bars[0].end_node.x / 2
+    reflected = model.coords * [-1, 1] + [2 * xc, 0]
+    distances = np.linalg.norm(reflected[:, None, :] - model.coords[None, :, :], axis=2)
+    assert np.allclose(distances.min(axis=1), 0, atol=1e-2)
+    mirror = distances.argmin(axis=1)
+    for mode in modes.T:
+        u = mode.reshape(-1, 3)
+        mirrored = u[mirror] * [-1, 1, -1]
+        tolerance = 1e-2 * np.abs(u).max()  # the node coordinates are rounded (see FrameModel)
+        assert np.allclose(mirrored, u, atol=tolerance) or np.allclose(mirrored, -u, atol=tolerance)
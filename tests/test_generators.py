@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from generators import grid, howe_truss, portal_frame, pratt_truss, warren_truss
+
+
+def node_count(structure):
+    """Number of distinct Node objects of the bars."""
+    return len({id(node) for bar in structure.bars for node in (bar.start_node, bar.end_node)})
+
+
+def assert_shared_nodes(structure):
+    """Every node position is a single Node object, shared by all the bars meeting there."""
+    nodes = {}
+    for bar in structure.bars:
+        for node in (bar.start_node, bar.end_node):
+            assert nodes.setdefault((node.x, node.y), node) is node
+    for bar in structure.bars:
+        dx, dy = bar.end_node.x - bar.start_node.x, bar.end_node.y - bar.start_node.y
+        assert bar.length == pytest.approx(np.hypot(dx, dy))
+
+
+@pytest.mark.parametrize("build, n_bars, n_nodes", [
+    (warren_truss, 4 * 6 - 1, 2 * 6 + 1),
+    (pratt_truss, 4 * 6 + 1, 2 * 6 + 2),
+    (howe_truss, 4 * 6 + 1, 2 * 6 + 2),
+])
+def test_trusses(build, n_bars, n_nodes):
+    truss = build(6, 12000, 1500, width=30)
+    assert len(truss.bars) == n_bars
+    assert node_count(truss) == n_nodes
+    assert_shared_nodes(truss)
+    assert all(bar.width == 30 and bar.material == 'steel' for bar in truss.bars)
+    # Pin at the left end and roller at the right end of the bottom chord
+    assert [(node.x, node.y, constraints) for node, constraints in truss.supports] == \
+        [(0, 0, (True, True, False)), (12000, 0, (False, True, False))]
+
+
+def test_pratt_and_howe_diagonals_are_mirrored():
+    def diagonals(truss):
+        return {tuple(sorted([(bar.start_node.x, bar.start_node.y), (bar.end_node.x, bar.end_node.y)]))
+                for bar in truss.bars if bar.start_node.x != bar.end_node.x and bar.start_node.y != bar.end_node.y}
+
+    pratt, howe = diagonals(pratt_truss(4, 8000, 1000)), diagonals(howe_truss(4, 8000, 1000))
+    # Pratt diagonals go down towards the middle: from the top at x = 0 to the bottom at x = 2000
+    assert ((0, 1000), (2000, 0)) in pratt
+    assert ((0, 0), (2000, 1000)) in howe
+    assert not pratt & howe
+
+
+def test_portal_frame():
+    frame = portal_frame(3, 4, 5000, 3000, width=100)
+    assert len(frame.bars) == 4 * 4 + 3 * 4
+    assert node_count(frame) == 4 * 5
+    assert_shared_nodes(frame)
+    assert sorted((node.x, node.y, constraints) for node, constraints in frame.supports) == \
+        [(x, 0, (True, True, True)) for x in (0, 5000, 10000, 15000)]
+
+
+@pytest.mark.parametrize("diagonals, n_bars", [(False, 3 * 3 + 2 * 4), (True, 3 * 3 + 2 * 4 + 3 * 2)])
+def test_grid(diagonals, n_bars):
+    structure = grid(3, 2, 1000, 800, diagonals=diagonals)
+    assert len(structure.bars) == n_bars
+    assert node_count(structure) == 4 * 3
+    assert_shared_nodes(structure)
+    assert sorted((node.x, node.y) for node, _ in structure.supports) == [(x, 0) for x in (0, 1000, 2000, 3000)]
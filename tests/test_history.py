@@ -0,0 +1,46 @@
+import numpy as np
+from generators import scissor_lift
+from history import History
+from Structure_Analysis import resistance_check
+
+
+def cached(history):
+    """Number of bars, nodes and results held by the history."""
+    return len(history._bars), len(history._nodes), len(history._rows)
+
+
+def test_history_forgets_the_evicted_states():
+    history = History(scissor_lift(30, 60, 100), limit=2)
+    for alpha in (35, 40, 45):
+        history.push(scissor_lift(alpha, 60, 100))
+    expected = History(scissor_lift(35, 60, 100))
+    for alpha in (40, 45):
+        expected.push(scissor_lift(alpha, 60, 100))
+
+    assert len(history._undo) == 2
+    assert cached(history) == cached(expected)
+
+
+def test_history_forgets_the_discarded_redo_states():
+    history = History(scissor_lift(30, 60, 100))
+    history.push(scissor_lift(40, 60, 100))
+    history.undo()
+    history.push(scissor_lift(50, 60, 100))
+    expected = History(scissor_lift(30, 60, 100))
+    expected.push(scissor_lift(50, 60, 100))
+
+    assert not history.can_redo()
+    assert cached(history) == cached(expected)
+
+
+def test_history_results_after_pruning():
+    history = History(scissor_lift(30, 60, 100), limit=1)
+    for alpha in (40, 50, 60):
+        history.push(scissor_lift(alpha, 60, 100))
+    history.undo()
+    history.push(scissor_lift(40, 60, 100))
+    history.undo()
+
+    expected = resistance_check(scissor_lift(50, 60, 100).bars)
+    for key, value in history.result_arrays().items():
+        np.testing.assert_allclose(value, expected[key], err_msg=key)
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from Structure_Analysis import Structure, internal_forces, resistance_check
+from parallel import CHECK_OUTPUTS, parallel_check
+
+
+def loaded_structure(n_bars=40):
+    """Bars of a chain with random loads (point moments included) on all but every fourth bar."""
+    rng = np.random.default_rng(3)
+    structure = Structure("Chain")
+    coordinates = [(100.0 * i, 30.0 * (i % 2)) for i in range(n_bars + 1)]
+    bars = structure.add_bars(coordinates, [(i, i + 1) for i in range(n_bars)], width=10, height=20, material='steel')
+    for i, bar in enumerate(bars):
+        if i % 4:
+            for position in (0.2, 0.7):
+                bar.add_load(position, *rng.normal(size=3) * 100)
+    return structure
+
+
+@pytest.mark.parametrize("processes, chunk_size", [(1, None), (1, 7), (2, 7)])
+def test_parallel_check_matches_resistance_check(processes, chunk_size):
+    structure = loaded_structure()
+    results = parallel_check(structure, n_samples=50, processes=processes, chunk_size=chunk_size, diagrams=True)
+    expected = resistance_check(structure.bars, n_samples=50)
+    _, shear, normal, flexion = internal_forces(structure.bars, 50)
+
+    assert set(results) == set(CHECK_OUTPUTS) | {'shear_diagram', 'normal_diagram', 'flexion_diagram'}
+    for key, value in expected.items():
+        np.testing.assert_allclose(results[key], value, err_msg=key)
+    for key, value in (('shear', shear), ('normal', normal), ('flexion', flexion)):
+        np.testing.assert_allclose(results[f'{key}_diagram'], value, err_msg=key)
+        np.testing.assert_allclose(results[f'{key}_max'], value.max(axis=1), err_msg=key)
+        np.testing.assert_allclose(results[f'{key}_min'], value.min(axis=1), err_msg=key)
+
+
+def test_parallel_check_needs_a_process():
+    with pytest.raises(ValueError):
+        parallel_check(loaded_structure(), processes=0)
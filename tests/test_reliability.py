@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from generators import warren_truss
+from reliability import monte_carlo, wilson_interval
+from Structure_Analysis import resistance_check
+
+
+def loaded_truss():
+    truss = warren_truss(4, 8000, 1000, width=[20 + 5 * i for i in range(15)], height=20)
+    for i, bar in enumerate(truss.bars):
+        bar.add_load(0.5, 100.0 * (i % 3), -5000.0, 0)  # the narrowest bars fail
+    return truss
+
+
+def test_zero_variance_is_deterministic():
+    truss = loaded_truss()
+    expected = resistance_check(truss.bars)['utilization'] >= 1
+    assert 0 < expected.sum() < len(expected)
+
+    # Distributions with no spread: every sample is the nominal structure
+    distributions = {'width': ('normal', 1.0, 0.0), 'yield_strength': ('uniform', 1.0, 1.0), 'P': ('normal', 1.0, 0.0)}
+    result = monte_carlo(truss, distributions, n=500, chunk_size=200, seed=1)
+    np.testing.assert_array_equal(result['probability'], np.where(expected, 1.0, 0.0))
+    np.testing.assert_array_equal(result['failures'], np.where(expected, 500, 0))
+    np.testing.assert_allclose(result['mean_utilization'], resistance_check(truss.bars)['utilization'], rtol=1e-9)
+    assert result['system_probability'] == 1.0
+    assert result['system_upper'] == 1.0
+
+
+def test_result_does_not_depend_on_the_number_of_processes():
+    truss = loaded_truss()
+    distributions = {'width': ('normal', 1.0, 0.05), 'yield_strength': ('lognormal', 1.0, 0.07),
+                     'P': ('uniform', 0.5, 1.5)}
+    serial = monte_carlo(truss, distributions, n=2500, chunk_size=1000, seed=42, processes=1)
+    parallel = monte_carlo(truss, distributions, n=2500, chunk_size=1000, seed=42, processes=2)
+    assert 0 < serial['system_probability'] < 1
+    for key in ('failures', 'probability', 'lower', 'upper', 'mean_utilization'):
+        np.testing.assert_array_equal(serial[key], parallel[key])
+    assert serial['system_probability'] == parallel['system_probability']
+
+
+def test_unknown_variable():
+    with pytest.raises(ValueError):
+        monte_carlo(loaded_truss(), {'thickness': ('normal', 1.0, 0.1)}, n=10)
+
+
+def test_wilson_interval():
+    # Reference values of the 95% Wilson score interval
+    np.testing.assert_allclose(wilson_interval(10, 100), (0.05523, 0.17437), atol=1e-5)
+    np.testing.assert_allclose(wilson_interval(0, 10), (0.0, 0.27753), atol=1e-5)
+    np.testing.assert_allclose(wilson_interval(100, 100), (0.96301, 1.0), atol=1e-5)
+    lower, upper = wilson_interval([5, 50], 100)
+    np.testing.assert_allclose(lower, [0.02154, 0.40383], atol=1e-5)
+    np.testing.assert_allclose(upper, [0.11175, 0.59617], atol=1e-5)
+    # A wider interval for a higher confidence
+    assert wilson_interval(10, 100, 0.99)[0] < wilson_interval(10, 100)[0]
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+from generators import warren_truss
+from reports import build_report_figure, render_report, write_table
+from Structure_Analysis import bar_table, resistance_check
+from utils import check_resistance
+
+
+def loaded_truss():
+    truss = warren_truss(6, 12000, 1500, width=[20 + 5 * i for i in range(23)], height=20)
+    for i, bar in enumerate(truss.bars):
+        bar.add_load(0.5, 100.0 * (i % 3), -4000.0, 0)  # the narrowest bars fail
+    return truss
+
+
+def test_report_lists_the_most_utilized_bars_first():
+    truss = loaded_truss()
+    fig = build_report_figure(truss, max_rows=5)
+    table, = [ax for ax in fig.axes if ax.get_title() == "Resistance Check"]
+    text = table.texts[0].get_text().splitlines()
+
+    checks = resistance_check(truss.bars)
+    order = np.argsort(-checks['utilization'], kind='stable')
+    failing = int(np.sum(checks['utilization'] >= 1))
+    assert text[0] == f"{truss.name}: 23 bars, {failing} failing"
+    assert [int(line.split()[0]) for line in text[2:7]] == order[:5].tolist()
+    assert text[7] == "... 18 more"
+    # Same check as the scalar one of the GUI
+    for line, i in zip(text[2:7], order):
+        _, von_mises, limit = check_resistance(truss.bars[i])
+        assert f"{von_mises:10.2f} / {limit:6.1f} MPa" in line
+
+
+def test_render_report(tmp_path):
+    paths = render_report(loaded_truss(), str(tmp_path / "truss"), dpi=20, formats=('png', 'svg'))
+    assert paths == [str(tmp_path / "truss.png"), str(tmp_path / "truss.svg")]
+    assert all((tmp_path / name).stat().st_size > 0 for name in ("truss.png", "truss.svg"))
+
+
+def test_write_table_in_chunks(tmp_path):
+    truss = loaded_truss()
+    path = tmp_path / "truss.csv"
+    assert write_table(truss, str(path), chunk_size=5) == 23
+
+    table = pd.read_csv(path)
+    expected = bar_table(truss.bars)
+    assert len(table) == 23
+    assert table['bar'].tolist() == list(range(23))
+    np.testing.assert_allclose(table['width'], expected['width'])
+    np.testing.assert_allclose(table['von_mises'], expected['von_mises'])
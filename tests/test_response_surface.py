@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from generators import scissor_lift
+from response_surface import ResponseSurface
+from Structure_Analysis import envelope, resistance_check
+
+
+@pytest.fixture(scope="module")
+def surface():
+    surface = ResponseSurface(alphas=np.linspace(10, 80, 36), lengths=np.linspace(40, 80, 21))
+    surface.compute()
+    return surface
+
+
+# (37, 77) is between grid points where the governing section of BD jumps: interpolating the governing forces
+# across the jump was 98 % off on its shear force
+@pytest.mark.parametrize("alpha, length, tolerance", [(30, 60, 1e-9), (80, 40, 1e-9), (33.3, 47.7, 1e-2),
+                                                      (79.5, 41, 1e-2), (37, 77, 1e-2)])
+def test_response_surface_matches_the_exact_check(surface, alpha, length, tolerance):
+    model = scissor_lift(alpha, length, 10)
+    exact = resistance_check(model.bars)
+    extremes = envelope(model.bars)
+    result = surface.outputs(alpha, length, 10)
+    for key in ('position', 'normal', 'shear', 'flexion'):
+        np.testing.assert_allclose(result[f'governing_{key}'], exact[key], rtol=tolerance, atol=1e-9, err_msg=key)
+    for key in ('normal', 'shear', 'flexion'):
+        expected = np.maximum(np.abs(extremes[f'{key}_max']), np.abs(extremes[f'{key}_min']))
+        np.testing.assert_allclose(result[f'max_{key}'], expected, rtol=tolerance, atol=1e-9, err_msg=key)
+
+
+def test_response_surface_check_uses_the_material(surface):
+    aluminum = surface.check(33.3, 47.7, 10, 3, 1)
+    steel = surface.check(33.3, 47.7, 10, 3, 1, material='steel')
+    assert aluminum['yield_strength'] == 70
+    assert steel['yield_strength'] == 250
+    assert steel['von_mises'] == pytest.approx(aluminum['von_mises'])
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from sections import FAMILIES, KEYS, SectionCatalogue
+from Structure_Analysis import Bar, bar_arrays, section_properties
+
+
+def brute_force(profiles, required, key, families):
+    """Lightest profile of the families with the property at least the required value, by a scan of the table."""
+    allowed = np.isin(profiles['family'], families) & (profiles[key] >= required)
+    if not np.any(allowed):
+        return None
+    return np.min(profiles['mass'][allowed])
+
+
+@pytest.mark.parametrize("key", KEYS)
+@pytest.mark.parametrize("families", [FAMILIES, ('RHS', 'CHS'), ('I',), ('L',)])
+def test_lightest_matches_a_scan_of_the_table(key, families):
+    catalogue = SectionCatalogue()
+    profiles = catalogue.profiles
+    values = profiles[key][np.isin(profiles['family'], families)]
+    # Random requirements, the exact values of the table and values above the largest one
+    rng = np.random.default_rng(0)
+    required = np.concatenate((rng.uniform(0, 1.1 * values.max(), 200), values, [values.max() * 2]))
+
+    indices = catalogue.lightest(required, key, families)
+    assert indices.shape == required.shape
+    for value, index in zip(required, indices.tolist()):
+        expected = brute_force(profiles, value, key, families)
+        if expected is None:
+            assert index == -1
+        else:
+            assert profiles['family'][index] in families
+            assert profiles[key][index] >= value
+            assert profiles['mass'][index] == expected
+
+
+def test_lightest_with_ties():
+    # Profiles of the same mass: any of them is the lightest, as long as it is large enough
+    profiles = {'name': np.array(list("abcde")), 'family': np.array(['RHS'] * 5),
+                'W': np.array([1.0, 2.0, 3.0, 4.0, 5.0]), 'mass': np.array([2.0, 1.0, 3.0, 1.0, 4.0])}
+    catalogue = SectionCatalogue(profiles)
+    indices = catalogue.lightest([0.5, 1.5, 2.5, 3.5, 4.5, 5.5], 'W', ('RHS',))
+    np.testing.assert_array_equal(profiles['mass'][indices[:5]], [1.0, 1.0, 1.0, 1.0, 4.0])
+    assert np.all(profiles['W'][indices[:5]] >= [0.5, 1.5, 2.5, 3.5, 4.5])
+    assert indices[5] == -1
+
+
+def test_size_bars():
+    catalogue = SectionCatalogue()
+    bars = [Bar(length=1000, material='steel') for _ in range(6)]
+    required = np.array([1e3, 5e3, 2e4, 6e4, 1e5, 2e5])
+    indices = catalogue.size_bars(bars, required, 'W')
+
+    profiles = catalogue.profiles
+    families = np.array(['RHS', 'CHS'])
+    for value, index in zip(required, indices.tolist()):
+        assert profiles['mass'][index] == brute_force(profiles, value, 'W', families)
+    # The bars get the sections of the profiles
+    sections = section_properties(bar_arrays(bars))
+    np.testing.assert_allclose(sections['A'], profiles['A'][indices], rtol=1e-9)
+    np.testing.assert_allclose(sections['I'], profiles['I'][indices], rtol=1e-9)
+
+    with pytest.raises(ValueError):
+        catalogue.size_bars(bars[:1], profiles['W'].max() * 2, 'W')
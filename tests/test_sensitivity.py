@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from sensitivity import SECTION_PARAMETERS, section_derivatives, von_mises_sensitivities
+from Structure_Analysis import Bar, Node, bar_arrays, section_properties
+
+# Section of every kind and the parameters it depends on
+SECTIONS = [
+    (dict(width=30, height=50), ('width', 'height')),
+    (dict(width=30, height=50, hollow=True, width_thickness=3, height_thickness=4),
+     ('width', 'height', 'width_thickness', 'height_thickness')),
+    (dict(section='circular', radius=20), ('radius',)),
+    (dict(section='circular', radius=20, hollow=True, width_thickness=2), ('radius', 'width_thickness')),
+]
+
+
+def loaded_bar(section, alpha=35.0, length=800.0):
+    """Bar of a section with loads (and a point moment) along it."""
+    bar = Bar(length=length, material='steel', alpha=alpha, start_node=Node("A", 0, 0), **section)
+    bar.end()
+    bar.add_load(0, 300, 500, 0)
+    bar.add_load(0.3, -200, -1000, 2e4)
+    bar.add_load(0.7, 100, 400, 0)
+    return bar
+
+
+def central_difference(function, value, step):
+    return (function(value + step) - function(value - step)) / (2 * step)
+
+
+@pytest.mark.parametrize("section, parameters", SECTIONS)
+def test_section_derivatives_match_finite_differences(section, parameters):
+    arrays = bar_arrays([Bar(length=1000, material='steel', **section)])
+    _, derivatives = section_derivatives(arrays)
+
+    for parameter in SECTION_PARAMETERS:
+        for key in ('A', 'I', 'S', 'b'):
+            if parameter not in parameters:
+                assert derivatives[key][parameter][0] == 0, (key, parameter)
+                continue
+
+            def value(x):
+                return section_properties({**arrays, parameter: np.array([x])})[key][0]
+
+            expected = central_difference(value, arrays[parameter][0], 1e-4)
+            assert derivatives[key][parameter][0] == pytest.approx(expected, rel=1e-6, abs=1e-6), (key, parameter)
+
+
+@pytest.mark.parametrize("section, parameters", SECTIONS)
+def test_von_mises_sensitivities_match_finite_differences(section, parameters):
+    result = von_mises_sensitivities([loaded_bar(section)])
+
+    def von_mises(**changes):
+        alpha, length = changes.pop('alpha', 35.0), changes.pop('length', 800.0)
+        bar = loaded_bar({**section, **changes}, alpha, length)
+        return von_mises_sensitivities([bar])['von_mises'][0]
+
+    values = {**section, 'alpha': 35.0, 'length': 800.0}
+    for parameter in parameters + ('length', 'alpha'):
+        expected = central_difference(lambda x: von_mises(**{parameter: x}), values[parameter], 1e-4)
+        assert result['dvon_mises'][parameter][0] == pytest.approx(expected, rel=1e-5), parameter
+
+    # The loads are proportional to P: the stress too
+    assert result['dvon_mises']['P'][0] == pytest.approx(result['von_mises'][0])
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import urllib.request
+import numpy as np
+import pytest
+from fem import solve_static
+from generators import portal_frame, warren_truss
+from service import INVALID_PARAMS, AnalysisServer, call
+from Structure_Analysis import Structure, resistance_check
+
+
+def post(port, payload):
+    """Send a raw JSON-RPC payload to the server and return the decoded response."""
+    request = urllib.request.Request(f"http://127.0.0.1:{port}/", data=json.dumps(payload).encode(),
+                                     headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=60) as response:
+        return json.loads(response.read())
+
+
+def models():
+    """Three small loaded trusses of different sizes."""
+    structures = []
+    for n_panels in (2, 3, 4):
+        truss = warren_truss(n_panels, 1000 * n_panels, 800, width=20, height=20)
+        for bar in truss.bars:
+            bar.add_load(0.5, 0, -100.0 * n_panels, 0)
+        structures.append(truss)
+    return structures
+
+
+def run_server(scenario):
+    """Run a scenario (coroutine function of the server) on a server listening on a free localhost port."""
+    async def main():
+        server = AnalysisServer(port=0, processes=1, batch_window=0.5)
+        batches = []
+        run_batch = server._run_batch
+
+        async def record(batch):
+            batches.append(len(batch))
+            await run_batch(batch)
+
+        server._run_batch = record
+        await server.start()
+        try:
+            return await scenario(server, batches)
+        finally:
+            await server.close()
+
+    return asyncio.run(main())
+
+
+def test_concurrent_checks_are_batched():
+    structures = models()
+
+    async def scenario(server, batches):
+        calls = [asyncio.to_thread(call, "check", {"structure": structure.to_dict()}, port=server.port)
+                 for structure in structures]
+        return await asyncio.gather(*calls), batches
+
+    results, batches = run_server(scenario)
+    assert batches == [3]
+    for result, structure in zip(results, structures):
+        expected = resistance_check(structure.bars)
+        assert result.keys() == expected.keys()
+        for key, value in expected.items():
+            np.testing.assert_allclose(result[key], value, err_msg=key)
+
+
+def test_bad_model_does_not_fail_its_batch():
+    good = models()[0].to_dict()
+    bad = Structure("Bad").to_dict()
+    bad['bars'] = [{**good['bars'][0], 'material': 'unobtainium'}]
+
+    async def scenario(server, batches):
+        payload = [{"jsonrpc": "2.0", "method": "check", "params": {"structure": model}, "id": i}
+                   for i, model in enumerate((good, bad, good))]
+        return await asyncio.to_thread(post, server.port, payload), batches
+
+    responses, batches = run_server(scenario)
+    assert batches == [3]
+    responses = {response["id"]: response for response in responses}
+    assert responses[1]["error"]["code"] == INVALID_PARAMS
+    assert "unobtainium" in responses[1]["error"]["message"]
+    for i in (0, 2):
+        np.testing.assert_allclose(responses[i]["result"]["von_mises"],
+                                   resistance_check(models()[0].bars)["von_mises"])
+
+
+def test_ping_and_solve():
+    frame = portal_frame(2, 2, 4000, 3000, width=100, height=200)
+    for bar in frame.bars:
+        bar.add_load(0.5, 500.0, -1000.0, 0)
+
+    async def scenario(server, batches):
+        ping = await asyncio.to_thread(call, "ping", port=server.port)
+        solution = await asyncio.to_thread(call, "solve", {"structure": frame.to_dict()}, port=server.port)
+        with pytest.raises(RuntimeError, match="not found"):
+            await asyncio.to_thread(call, "unknown", port=server.port)
+        return ping, solution
+
+    ping, solution = run_server(scenario)
+    assert ping == "pong"
+    u, end_forces, model = solve_static(frame)
+    np.testing.assert_allclose(solution["nodes"], model.coords)
+    np.testing.assert_allclose(solution["displacements"], u.reshape(-1, 3))
+    np.testing.assert_allclose(solution["end_forces"], end_forces)
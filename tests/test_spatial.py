@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from spatial import GridIndex
+
+
+def random_segments(rng, n, extent=1000.0, max_length=300.0):
+    x0, y0 = rng.uniform(0, extent, (2, n))
+    angle = rng.uniform(0, 2 * np.pi, n)
+    length = rng.uniform(0, max_length, n)
+    return x0, y0, x0 + length * np.cos(angle), y0 + length * np.sin(angle)
+
+
+def boxes(x0, y0, x1, y1):
+    return np.minimum(x0, x1), np.minimum(y0, y1), np.maximum(x0, x1), np.maximum(y0, y1)
+
+
+def brute_force_query(segments, xmin, ymin, xmax, ymax):
+    bxmin, bymin, bxmax, bymax = boxes(*segments)
+    return np.flatnonzero((bxmax >= xmin) & (bxmin <= xmax) & (bymax >= ymin) & (bymin <= ymax))
+
+
+def brute_force_pairs(segments):
+    bxmin, bymin, bxmax, bymax = boxes(*segments)
+    i, j = np.triu_indices(len(bxmin), k=1)
+    overlap = (bxmax[i] >= bxmin[j]) & (bxmin[i] <= bxmax[j]) & (bymax[i] >= bymin[j]) & (bymin[i] <= bymax[j])
+    return np.stack([i[overlap], j[overlap]], axis=1)
+
+
+# Default cell size, cells much smaller than the segments (each spans many cells) and a single cell
+@pytest.mark.parametrize("cell_size", [None, 10.0, 5000.0])
+def test_query_matches_brute_force(cell_size):
+    rng = np.random.default_rng(0)
+    segments = random_segments(rng, 200)
+    index = GridIndex(*segments, cell_size=cell_size)
+    if cell_size == 10.0:
+        assert index.shape[0] > 50
+
+    for _ in range(100):
+        (xmin, xmax), (ymin, ymax) = np.sort(rng.uniform(-200, 1200, (2, 2)), axis=1)
+        np.testing.assert_array_equal(index.query(xmin, ymin, xmax, ymax),
+                                      brute_force_query(segments, xmin, ymin, xmax, ymax))
+    # Points, boxes covering everything and boxes outside the extent
+    for xmin, ymin, xmax, ymax in ((500, 500, 500, 500), (-1e4, -1e4, 1e4, 1e4), (2000, 2000, 3000, 3000),
+                                   (-3000, 0, -2000, 1000)):
+        np.testing.assert_array_equal(index.query(xmin, ymin, xmax, ymax),
+                                      brute_force_query(segments, xmin, ymin, xmax, ymax))
+    assert len(index.query(2000, 2000, 3000, 3000)) == 0
+
+
+def test_empty_query_inside_the_extent():
+    # Two far segments: a box between them touches no item, though the grid covers it
+    index = GridIndex([0, 900], [0, 900], [100, 1000], [100, 1000], cell_size=50)
+    assert index.query(400, 400, 600, 600).tolist() == []
+    assert index.query(50, 50, 60, 60).tolist() == [0]
+    assert index.query(100, 100, 900, 900).tolist() == [0, 1]  # touching boxes intersect
+
+
+@pytest.mark.parametrize("cell_size", [None, 10.0, 5000.0])
+def test_pairs_match_brute_force(cell_size):
+    rng = np.random.default_rng(1)
+    segments = random_segments(rng, 150)
+    pairs = GridIndex(*segments, cell_size=cell_size).pairs()
+    np.testing.assert_array_equal(pairs, brute_force_pairs(segments))
+
+
+def test_pairs_of_axis_aligned_segments():
+    # Horizontal and vertical segments (flat boxes) spanning several cells, with shared ends
+    x0, y0, x1, y1 = np.array([(0, 0, 1000, 0), (1000, 0, 1000, 1000), (0, 500, 600, 500), (600, 0, 600, 800),
+                               (2000, 0, 3000, 0)], dtype=float).T
+    pairs = GridIndex(x0, y0, x1, y1, cell_size=100).pairs()
+    np.testing.assert_array_equal(pairs, brute_force_pairs((x0, y0, x1, y1)))
+    assert pairs.tolist() == [[0, 1], [0, 3], [2, 3]]
+
+
+def test_empty_index():
+    index = GridIndex([], [], [], [])
+    assert index.query(0, 0, 1, 1).tolist() == []
+    assert index.pairs().shape == (0, 2)
+    assert GridIndex([0], [0], [1], [1]).pairs().shape == (0, 2)
@@ -0,0 +1,195 @@
+import numpy as np
+import pytest
+from Structure_Analysis import (Bar, BarSnapshot, Node, Structure, bar_arrays, envelope, internal_forces, load_arrays,
+                                resistance_check, section_properties, von_mises_stress)
+
+
+def test_sectional_area_of_solid_rectangle():
+    bar = Bar(length=1000, width=30, height=50, section='rectangular', material='steel')
+    assert bar.sectional_area() == pytest.approx(30 * 50)
+    assert bar.volume() == pytest.approx(bar.sectional_area() * bar.length)
+
+
+@pytest.mark.parametrize("kwargs", [
+    dict(width=30, height=50),
+    dict(width=30, height=50, hollow=True, width_thickness=3, height_thickness=4),
+    dict(section='circular', radius=20),
+    dict(section='circular', radius=20, hollow=True, width_thickness=2),
+])
+def test_section_properties_match_bar_methods(kwargs):
+    bar = Bar(length=1000, material='steel', **kwargs)
+    sections = section_properties(bar_arrays([bar]))
+    assert sections['A'][0] == pytest.approx(bar.sectional_area())
+    assert sections['I'][0] == pytest.approx(bar.moment_of_inertia())
+    assert sections['S'][0] == pytest.approx(bar.static_moment())
+
+
+def random_bars(rng, n_bars=12, n_loads=4):
+    """Bars of random sections and angles, with random loads (with point moments) on all but every third bar."""
+    bars = []
+    for i in range(n_bars):
+        bar = Bar(length=rng.uniform(50, 500), width=rng.uniform(5, 30), height=rng.uniform(5, 30), material='steel',
+                  alpha=rng.uniform(0, 180), start_node=Node("A", 0, 0))
+        bar.end()
+        if i % 3:
+            for position in rng.choice(np.linspace(0, 1, 21), size=n_loads, replace=False):
+                bar.add_load(position, *rng.normal(size=3) * 100)
+        bars.append(bar)
+    return bars
+
+
+def diagram_extremes(bars, n_samples, loads):
+    """Extremes of the diagrams of internal_forces, as envelope returns them."""
+    x_data, shear, normal, flexion = internal_forces(bars, n_samples, loads)
+    sections = {key: value[:, None] for key, value in section_properties(bar_arrays(bars)).items()}
+    von_mises, _, _ = von_mises_stress(normal, shear, flexion, sections)
+    rows = np.arange(len(bars))
+    results = {}
+    for name, values in (('normal', normal), ('shear', shear), ('flexion', flexion), ('von_mises', von_mises)):
+        for kind, pick in (('max', np.argmax), ('min', np.argmin)):
+            best = pick(values, axis=1)
+            results[f'{name}_{kind}'] = values[rows, best]
+            results[f'{name}_{kind}_position'] = x_data[rows, best]
+    best = np.argmax(np.abs(shear) + np.abs(normal) + np.abs(flexion), axis=1)
+    results['governing_position'] = x_data[rows, best]
+    results['governing_normal'] = normal[rows, best]
+    results['governing_shear'] = shear[rows, best]
+    results['governing_flexion'] = flexion[rows, best]
+    return results
+
+
+@pytest.mark.parametrize("n_samples", [100, 37])
+def test_envelope_matches_internal_forces(n_samples):
+    bars = random_bars(np.random.default_rng(1))
+    loads = load_arrays(bars)
+    results = envelope(bars, n_samples)
+    for key, expected in diagram_extremes(bars, n_samples, loads).items():
+        np.testing.assert_allclose(results[key], expected, rtol=1e-9, atol=1e-9, err_msg=key)
+
+
+def test_envelope_with_load_cases():
+    rng = np.random.default_rng(2)
+    bars = random_bars(rng)
+    positions, forces, mask = load_arrays(bars)
+    cases = rng.normal(size=(3,) + forces.shape) * 100 * mask[..., None]
+    results = envelope(bars, 50, (positions, cases, mask))
+    for case, case_forces in enumerate(cases):
+        for key, expected in diagram_extremes(bars, 50, (positions, case_forces, mask)).items():
+            assert results[key].shape == (3, len(bars))
+            np.testing.assert_allclose(results[key][case], expected, rtol=1e-9, atol=1e-9, err_msg=key)
+
+
+def test_envelope_and_checks_without_bars():
+    results = envelope([])
+    assert all(value.shape == (0,) for value in results.values())
+    assert all(value.shape == (0,) for value in resistance_check([]).values())
+    assert len(Structure("Empty").table()) == 0
+
+
+def test_write_table_without_bars(tmp_path):
+    from reports import write_table
+
+    path = tmp_path / "empty.csv"
+    assert write_table(Structure("Empty"), str(path)) == 0
+    assert path.read_text().startswith("bar,")
+
+
+def test_add_bars_matches_add_bar():
+    coordinates = [(0, 0), (1000, 0), (1000, 500), (0, 500)]
+    connectivity = [(0, 1), (1, 2), (2, 3), (3, 0), (0, 2)]
+    properties = dict(width=[20, 30, 40, 50, 60], height=80, hollow=True, width_thickness=[2, 3, 4, 5, 6],
+                      height_thickness=5, material=['steel', 'aluminum', 'wood', 'steel', 'abs'])
+    bulk = Structure("Bulk")
+    bars = bulk.add_bars(coordinates, connectivity, **properties)
+
+    for k, (i, j) in enumerate(connectivity):
+        start, end = Node(str(i), *coordinates[i]), Node(str(j), *coordinates[j])
+        bar = Bar(length=np.hypot(end.x - start.x, end.y - start.y),
+                  alpha=np.degrees(np.arctan2(end.y - start.y, end.x - start.x)), start_node=start, end_node=end,
+                  **{key: value[k] if isinstance(value, list) else value for key, value in properties.items()})
+        expected, actual = vars(bar), vars(bars[k])
+        assert actual.keys() == expected.keys()
+        for key, value in expected.items():
+            if key in ('start_node', 'end_node'):
+                assert vars(actual[key]) == vars(value), key
+            elif isinstance(value, float):
+                assert actual[key] == pytest.approx(value), key
+            else:
+                assert actual[key] == value, key
+
+    # The bars meeting at a node share it, and get their own load dictionaries
+    assert bars[0].start_node is bars[4].start_node is bars[3].end_node
+    bars[0].add_load(0.5, 0, -10, 0)
+    assert bars[1].load == {}
+
+
+def snapshot_structure():
+    """Two bars sharing the node B, with loads and two supports."""
+    structure = Structure("Snapshot")
+    ab, bc = structure.add_bars([(0, 0), (1000, 0), (1000, 800)], [(0, 1), (1, 2)], width=[20, 30], height=40,
+                                hollow=True, width_thickness=2, height_thickness=3, material=['steel', 'aluminum'])
+    ab.add_load(0.5, 0, -100, 0)
+    ab.add_load(0, 10, 20, 30)
+    bc.add_load(1, 5, 0, -7)
+    structure.add_support(ab.start_node, rz=True)
+    structure.add_support(bc.end_node, ux=False)
+    return structure
+
+
+def test_snapshot_round_trip():
+    structure = snapshot_structure()
+    snapshot = structure.snapshot()
+    restored = snapshot.to_structure()
+
+    assert restored.name == structure.name
+    assert len(restored.bars) == len(structure.bars)
+    for copy, bar in zip(restored.bars, structure.bars):
+        assert copy.load == bar.load
+        assert {**copy.to_dict(), 'loads': None} == {**bar.to_dict(), 'loads': None}
+    assert [(vars(node), constraints) for node, constraints in restored.supports] == \
+        [(vars(node), constraints) for node, constraints in structure.supports]
+    assert restored.snapshot() == snapshot
+    # The shared node is still shared, by the bars and by the supports
+    assert restored.bars[0].end_node is restored.bars[1].start_node
+    assert restored.supports[0][0] is restored.bars[0].start_node
+    assert restored.supports[1][0] is restored.bars[1].end_node
+
+
+def test_snapshot_equality_and_hash():
+    first, second = snapshot_structure().snapshot(), snapshot_structure().snapshot()
+    assert first == second and hash(first) == hash(second)
+    assert first.bars[0].start_node is not second.bars[0].start_node
+
+    changed = first.with_bar(1, width=35)
+    assert changed != first
+    assert changed.bars[0] is first.bars[0]  # the unchanged bars are shared
+    assert len({first, second, changed}) == 2
+
+
+def test_snapshot_pickle_keeps_shared_nodes():
+    import pickle
+
+    snapshot = snapshot_structure().snapshot()
+    assert snapshot.bars[0].end_node is snapshot.bars[1].start_node
+    copy = pickle.loads(pickle.dumps(snapshot))
+    assert copy == snapshot and hash(copy) == hash(snapshot)
+    assert copy.bars[0].end_node is copy.bars[1].start_node
+    restored = copy.to_structure()
+    assert restored.bars[0].end_node is restored.bars[1].start_node
+
+
+def test_snapshot_with_load_checks_the_position_as_add_load():
+    bar = Bar(length=0.5, width=10, height=20, material='steel')
+    snapshot = BarSnapshot.from_bar(bar)
+    for position in (0, 0.25, 0.5):
+        bar.add_load(position, 1, 2, 3)
+        snapshot = snapshot.with_load(position, 1, 2, 3)
+    assert snapshot.load == bar.load
+    for position in (-0.1, 0.75):
+        with pytest.raises(ValueError):
+            bar.add_load(position, 1, 2, 3)
+        with pytest.raises(ValueError):
+            snapshot.with_load(position, 1, 2, 3)
+
+    # A load at an existing position replaces it, as in Bar.load
+    assert snapshot.with_load(0.25, 0, 0, 0).load[0.25] == [0, 0, 0]
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from Structure_Analysis import Bar, Node
+from utils import check_resistance, compute_stress
+
+
+def loaded_bar():
+    """Horizontal bar loaded at its start: N = 50, T = 100 and |M| largest at the last sample."""
+    bar = Bar(length=100, width=10, height=20, material='steel', alpha=0, start_node=Node("A", 0, 0))
+    bar.end()
+    bar.add_load(0, -50, 100, 0)
+    return bar
+
+
+def test_check_resistance_uses_normal_and_shear_in_order():
+    bar = loaded_bar()
+    x_data, shear, normal, flexion = compute_stress(bar)
+    idx = np.argmax(np.abs(shear) + np.abs(normal) + np.abs(flexion))
+
+    position, von_mises, limit = check_resistance(bar)
+
+    expected, _, _, _ = bar.resistance_analysis(normal[idx], shear[idx], flexion[idx], verbose=False)
+    swapped, _, _, _ = bar.resistance_analysis(shear[idx], normal[idx], flexion[idx], verbose=False)
+    assert von_mises == pytest.approx(expected)
+    assert von_mises != pytest.approx(swapped)  # before the fix, the shear diagram was passed as N
+    assert limit == 250
+
+
+def test_check_resistance_position_of_the_last_sample():
+    # The most stressed section is the end of the bar: reading x_data[idx + 1] went past the diagram
+    bar = loaded_bar()
+    position, _, _ = check_resistance(bar)
+    assert position == pytest.approx(bar.length)
+
+
+def test_compute_stress_matches_internal_forces():
+    from Structure_Analysis import internal_forces
+
+    rng = np.random.default_rng(0)
+    bars = []
+    for alpha in (0, 30, 90, 135):
+        bar = Bar(length=200, width=10, height=20, material='steel', alpha=alpha, start_node=Node("A", 0, 0))
+        bar.end()
+        # Loads added out of order, with point moments
+        for position in (0.8, 0.1, 0.5, 0.0, 1.0):
+            bar.add_load(position, *rng.normal(size=3) * 100)
+        bars.append(bar)
+
+    x_data, shear, normal, flexion = internal_forces(bars)
+    for i, bar in enumerate(bars):
+        diagrams = compute_stress(bar)
+        for expected, actual in zip((x_data[i], shear[i], normal[i], flexion[i]), diagrams):
+            np.testing.assert_allclose(actual, expected, atol=1e-9)
+
+
+def test_compute_stress_does_not_depend_on_load_order():
+    # Before the fix, a load set the diagrams after it from the value at its own sample: adding the load at 0.5
+    # before the one at 0 lost the second one beyond 0.5
+    first = Bar(length=100, width=10, height=20, material='steel', alpha=0, start_node=Node("A", 0, 0))
+    first.end()
+    first.add_load(0.5, 0, 30, 0)
+    first.add_load(0, 0, 10, 0)
+    second = Bar(length=100, width=10, height=20, material='steel', alpha=0, start_node=Node("A", 0, 0))
+    second.end()
+    second.add_load(0, 0, 10, 0)
+    second.add_load(0.5, 0, 30, 0)
+
+    _, shear, _, _ = compute_stress(first)
+    np.testing.assert_allclose(shear[-1], 40)
+    for a, b in zip(compute_stress(first), compute_stress(second)):
+        np.testing.assert_allclose(a, b)
+
+
+def test_compute_stress_includes_point_moments():
+    bar = Bar(length=100, width=10, height=20, material='steel', alpha=0, start_node=Node("A", 0, 0))
+    bar.end()
+    bar.add_load(0.5, 0, 0, 7)
+    _, _, _, flexion = compute_stress(bar)
+    np.testing.assert_allclose(flexion[:49], 0)
+    np.testing.assert_allclose(flexion[49:], -7)
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from generators import warren_truss
+from Structure_Analysis import Bar, Node, Structure
+from validation import validate_structure
+
+
+def structure(coordinates, connectivity):
+    frame = Structure("Frame")
+    frame.add_bars(coordinates, connectivity, width=20, height=20)
+    return frame
+
+
+def bar(start, end):
+    length = np.hypot(end.x - start.x, end.y - start.y)
+    return Bar(length=length, width=20, height=20, start_node=start, end_node=end)
+
+
+def codes(issues):
+    return [(issue.code, issue.severity, issue.bars) for issue in issues]
+
+
+def test_clean_truss_has_no_issues():
+    assert validate_structure(warren_truss(4, 8000, 1000, width=20, height=20)) == []
+    assert validate_structure(Structure("Empty")) == []
+
+
+@pytest.mark.parametrize("coordinates, connectivity, expected", [
+    # Same nodes, in either direction
+    ([(0, 0), (1000, 0)], [(0, 1), (1, 0)], [('duplicate_bar', 'error', (0, 1))]),
+    # Collinear bars sharing 500 mm
+    ([(0, 0), (1000, 0), (500, 0), (1500, 0)], [(0, 1), (2, 3)], [('overlapping_bars', 'error', (0, 1))]),
+    # Diagonals of a square without a node at the center
+    ([(0, 0), (1000, 1000), (0, 1000), (1000, 0)], [(0, 1), (2, 3)], [('crossing_bars', 'warning', (0, 1))]),
+    # T joint: the end of the second bar lies on the first one
+    ([(0, 0), (1000, 0), (500, 0), (500, 500)], [(0, 1), (2, 3)], [('unconnected_joint', 'warning', (0, 1))]),
+    # Collinear bars end to end and a corner: connected, no issue
+    ([(0, 0), (1000, 0), (2000, 0), (2000, 1000)], [(0, 1), (1, 2), (2, 3)], []),
+])
+def test_pair_issues(coordinates, connectivity, expected):
+    assert codes(validate_structure(structure(coordinates, connectivity))) == expected
+
+
+def test_overlap_length_in_message():
+    issue, = validate_structure(structure([(0, 0), (1000, 0), (500, 0), (1500, 0)], [(0, 1), (2, 3)]))
+    assert "500.000 mm" in issue.message
+
+
+def test_duplicate_node_id():
+    frame = Structure("Frame")
+    frame.add_bar(bar(Node("A", 0, 0), Node("B", 1000, 0)))
+    frame.add_bar(bar(Node("A", 0, 500), Node("C", 1000, 500)))
+    issues = validate_structure(frame)
+    assert codes(issues) == [('duplicate_node_id', 'error', (0, 1))]
+    assert "'A'" in issues[0].message
+
+
+def test_coincident_nodes():
+    frame = Structure("Frame")
+    frame.add_bar(bar(Node("A", 0, 0), Node("B", 1000, 0)))
+    frame.add_bar(bar(Node("C", 1000, 0), Node("D", 1000, 1000)))
+    issues = validate_structure(frame)
+    assert codes(issues) == [('coincident_nodes', 'warning', (0, 1))]
+    assert "'B', 'C'" in issues[0].message
+
+
+@pytest.mark.parametrize("changes, code", [
+    (dict(width=0), 'non_positive_width'),
+    (dict(hollow=True, width_thickness=10, height_thickness=2), 'infeasible_hollow_section'),
+    (dict(material='unobtainium'), 'unknown_material'),
+    (dict(length=900), 'length_mismatch'),
+])
+def test_bar_issues(changes, code):
+    frame = Structure("Frame")
+    frame.add_bar(bar(Node("A", 0, 0), Node("B", 1000, 0)))
+    vars(frame.bars[0]).update(changes)  # as set after the checks of Bar.__init__
+    assert codes(validate_structure(frame)) == [(code, 'error', (0,))]
@@ -1,9 +1,18 @@
+import base64
+import io
+from collections import OrderedDict
 import matplotlib.patches as patches
 from matplotlib.patches import FancyArrowPatch
+from matplotlib.collections import LineCollection
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.animation import FuncAnimation
 import matplotlib.pyplot as plt
 import numpy as np
 from Structure_Analysis import Bar, Node
+from spatial import GridIndex
+import tkinter as tk
 from tkinter import ttk
 
 def show_temporary_message(mainframe, message, duration=2000):
@@ -14,8 +23,10 @@ def show_temporary_message(mainframe, message, duration=2000):
     # Hide the message after the specified duration (in milliseconds)
     mainframe.after(duration, lambda: message_label.grid_forget())
 
-def draw_forces_on_canvas(ax, structure):
-    for bar in structure.bars:
+def draw_forces_on_canvas(ax, structure, bars=None):
+    if bars is None:
+        bars = structure.bars
+    for bar in bars:
         # Iterate over forces applied at the fixed position
         for position, force in bar.load.items():
             Fx, Fy, M = force
@@ -47,12 +58,205 @@ def draw_forces_on_canvas(ax, structure):
                 # Optionally, label the moment value
                 ax.text(x_pos + moment_radius * np.cos(angle), y_pos + moment_radius * np.sin(angle), f'M={M}', fontsize=10, color='red')
 
-def draw_structure_on_canvas(canvas_frame, structure):
+class StructureView:
+    """Pan/zoom state of the structure canvas.
+    The bars are stored in a spatial index, so only the members, loads and labels inside the
+    current viewport are drawn. When too many bars are visible, only the members are drawn."""
+
+    def __init__(self, detail_limit: int = 200, zoom_step: float = 1.2):
+        """
+        Parameters:
+        - detail_limit: Maximum number of visible bars for which labels and loads are drawn.
+        - zoom_step: Zoom factor applied for every mouse wheel step.
+        """
+        self.detail_limit = detail_limit
+        self.zoom_step = zoom_step
+        self.structure = None
+        self.index = GridIndex([], [], [], [])
+        self.xlim = None
+        self.ylim = None
+        self.navigated = False
+        self._press = None
+        self.deformed = None
+        self.deformed_scale = None
+
+    def set_structure(self, structure):
+        """Rebuild the spatial index of the bars (to be called when the structure changes)."""
+        self.structure = structure
+        bars = structure.bars
+        self.index = GridIndex([bar.start_node.x for bar in bars], [bar.start_node.y for bar in bars],
+                               [bar.end_node.x for bar in bars], [bar.end_node.y for bar in bars])
+        # Follow the structure until the user pans or zooms
+        if self.xlim is None or not self.navigated:
+            self.reset()
+
+    def set_deformed(self, deformed: dict = None, scale: float = None):
+        """
+        Overlay a deformed shape on the structure (kept when panning, zooming and resizing).
+        Parameters:
+        - deformed: Result of fem.deflections, or None to remove the overlay.
+        - scale: Amplification of the displacements (default: largest displacement drawn as 10% of the structure).
+        """
+        self.deformed = deformed
+        self.deformed_scale = scale
+
+    def reset(self):
+        """Fit the viewport to the whole structure."""
+        xmin, ymin, xmax, ymax = self.index.bounds()
+        self.xlim = (min(xmin, 0) - 5, max(xmax, 20) + 5)
+        self.ylim = (min(ymin, 0) - 2, max(ymax, 15) + 5)
+        self.navigated = False
+
+    def zoom(self, factor: float, x: float, y: float):
+        """Zoom around the point (x, y). A factor greater than 1 zooms in."""
+        self.xlim = (x - (x - self.xlim[0]) / factor, x + (self.xlim[1] - x) / factor)
+        self.ylim = (y - (y - self.ylim[0]) / factor, y + (self.ylim[1] - y) / factor)
+        self.navigated = True
+
+    def pan(self, dx: float, dy: float):
+        """Move the viewport by (dx, dy) in data coordinates."""
+        self.xlim = (self.xlim[0] + dx, self.xlim[1] + dx)
+        self.ylim = (self.ylim[0] + dy, self.ylim[1] + dy)
+        self.navigated = True
+
+    def visible_bars(self) -> np.ndarray:
+        """Return the indices of the bars inside the viewport."""
+        return self.index.query(self.xlim[0], self.ylim[0], self.xlim[1], self.ylim[1])
+
+    def connect(self, canvas, ax):
+        """Connect the mouse events of a matplotlib canvas: wheel to zoom, drag to pan, double click to reset."""
+        def redraw():
+            plot_structure(ax, self.structure, self)
+            canvas.draw_idle()
+
+        def on_scroll(event):
+            if event.inaxes is not ax:
+                return
+            factor = self.zoom_step if event.button == 'up' else 1 / self.zoom_step
+            self.zoom(factor, event.xdata, event.ydata)
+            redraw()
+
+        def on_press(event):
+            if event.inaxes is not ax or event.button != 1:
+                return
+            if event.dblclick:
+                self.reset()
+                redraw()
+                return
+            bbox = ax.get_window_extent()
+            self._press = (event.x, event.y, self.xlim, self.ylim,
+                           (self.xlim[1] - self.xlim[0]) / bbox.width, (self.ylim[1] - self.ylim[0]) / bbox.height)
+
+        def on_motion(event):
+            if self._press is None:
+                return
+            x0, y0, xlim, ylim, sx, sy = self._press
+            self.xlim, self.ylim = xlim, ylim
+            self.pan(-(event.x - x0) * sx, -(event.y - y0) * sy)
+            redraw()
+
+        def on_release(event):
+            self._press = None
+
+        canvas.mpl_connect('scroll_event', on_scroll)
+        canvas.mpl_connect('button_press_event', on_press)
+        canvas.mpl_connect('motion_notify_event', on_motion)
+        canvas.mpl_connect('button_release_event', on_release)
+
+def plot_structure(ax, structure, view: StructureView):
+    """Draw the part of the structure inside the viewport on the given axes.
+    Args:
+        ax (matplotlib.axes.Axes): The axes where the structure is drawn.
+        structure (Structure): The structure to draw.
+        view (StructureView): The viewport, with the spatial index of the bars."""
+    ax.cla()
+    visible = [structure.bars[i] for i in view.visible_bars()]
+    detailed = len(visible) <= view.detail_limit
+
+    if detailed:
+        for bar in visible:
+            x_vals = [bar.start_node.x, bar.end_node.x]
+            y_vals = [bar.start_node.y, bar.end_node.y]
+            ax.plot(x_vals, y_vals, 'bo-')
+
+            # Placing the label of the start node
+            if round(bar.start_node.y,2) == 0:
+                ax.text(bar.start_node.x, bar.start_node.y - 1.5, s=f"{bar.start_node.id}", fontsize=12, color='green', clip_on=True)
+            else:
+                ax.text(bar.start_node.x, bar.start_node.y + 1, s=f"{bar.start_node.id}", fontsize=12, color='green', clip_on=True)
+
+            # Placing the label of the end node
+            if round(bar.end_node.y,2) == 0:
+                ax.text(bar.end_node.x, bar.end_node.y - 1.5, s=f"{bar.end_node.id}", fontsize=12, color='green', clip_on=True)
+            else:
+                ax.text(bar.end_node.x, bar.end_node.y + 1, s=f"{bar.end_node.id}", fontsize=12, color='green', clip_on=True)
+
+        # Draw the forces on the bars (custom function)
+        draw_forces_on_canvas(ax, structure, visible)
+    else:
+        # Low level of detail: members only, drawn as a single collection
+        segments = [[(bar.start_node.x, bar.start_node.y), (bar.end_node.x, bar.end_node.y)] for bar in visible]
+        ax.add_collection(LineCollection(segments, colors='b', linewidths=1))
+
+    ax.axhline(y=0, color='brown', linestyle='--', linewidth=1)
+    ax.set_aspect('equal')
+    ax.set_title("Structure Analysis")
+    if view.deformed is not None:
+        scale = plot_deformed(ax, view.deformed, view.deformed_scale)
+        ax.set_title(f"Structure Analysis - deformed shape (x{scale:.3g})")
+    ax.grid(True)
+    ax.set_xlabel("Length (m)")
+    ax.set_xlim(*view.xlim)
+    ax.set_ylim(*view.ylim)
+
+    # Example angle in degrees
+    angle = structure.bars[0].alpha if structure.bars else 30  # fallback if not defined
+
+    # Create an arc (start angle 0°, sweep 'angle' degrees counter-clockwise)
+    arc = patches.Arc((0, 0), width=6, height=6, theta1=0, theta2=angle,
+                      edgecolor='purple', linestyle='-', linewidth=2)
+    ax.add_patch(arc)
+
+    # Add alpha symbol label
+    ax.text(3, 0.2, r'$\alpha$', fontsize=14, color='purple', clip_on=True)
+
+def plot_deformed(ax, deformed: dict, scale: float = None) -> float:
+    """Draw a deformed shape over the structure, all the bars in a single collection.
+    Args:
+        ax (matplotlib.axes.Axes): The axes where the structure is drawn.
+        deformed (dict): Result of fem.deflections (positions and displacements along the bars).
+        scale (float): Amplification of the displacements (default: largest displacement drawn as 10% of the structure).
+    Returns:
+        float: The scale used."""
+    positions = deformed['positions']
+    displacements = deformed['displacements']
+    if scale is None:
+        size = np.ptp(positions.reshape(-1, 2), axis=0).max()
+        peak = np.linalg.norm(displacements, axis=2).max()
+        scale = 0.1 * size / peak if peak > 0 else 1.0
+    ax.add_collection(LineCollection(positions + scale * displacements, colors='orange', linewidths=2))
+    return scale
+
+def draw_structure_on_canvas(canvas_frame, structure, view: StructureView = None, deformed: dict = None,
+                             scale: float = None):
+    """Draw the structure on the canvas.
+    Args:
+        canvas_frame (tk.Frame): The frame where the canvas is located.
+        structure (Structure): The structure to draw.
+        view (StructureView): Pan/zoom state kept between redraws (optional).
+        deformed (dict): Deformed shape to overlay, result of fem.deflections (default: the one kept by the view).
+        scale (float): Amplification of the deformed shape (default: automatic)."""
     plt.close('all')  # Close all previous figures to prevent memory leaks
     # Close previous figures to prevent memory leaks
     for widget in canvas_frame.winfo_children():
         widget.destroy()
 
+    if view is None:
+        view = StructureView()
+    view.set_structure(structure)
+    if deformed is not None:
+        view.set_deformed(deformed, scale)
+
     # Get the current width and height of the canvas
     canvas_width = canvas_frame.winfo_width()
     canvas_height = canvas_frame.winfo_height()
@@ -60,58 +264,66 @@ def draw_structure_on_canvas(canvas_frame, structure):
     # Create a new figure with the size of the canvas
     fig, ax = plt.subplots(figsize=(canvas_width / 100, canvas_height / 100))  # Size in inches, 100 dpi
 
-    for bar in structure.bars:
-        x_vals = [bar.start_node.x, bar.end_node.x]
-        y_vals = [bar.start_node.y, bar.end_node.y]
-        ax.plot(x_vals, y_vals, 'bo-')
-
-        # Placing the label of the start node
-        # bar.info()
-        if round(bar.start_node.y,2) == 0:
-            ax.text(bar.start_node.x, bar.start_node.y - 1.5, s=f"{bar.start_node.id}", fontsize=12, color='green')
-        else:
-            ax.text(bar.start_node.x, bar.start_node.y + 1, s=f"{bar.start_node.id}", fontsize=12, color='green')
-        
-        # Placing the label of the end node
-        if round(bar.end_node.y,2) == 0:
-            ax.text(bar.end_node.x, bar.end_node.y - 1.5, s=f"{bar.end_node.id}", fontsize=12, color='green')   
-        else:
-            ax.text(bar.end_node.x, bar.end_node.y + 1, s=f"{bar.end_node.id}", fontsize=12, color='green')
-        
-    # Draw the forces on the bars (custom function)
-    draw_forces_on_canvas(ax, structure)
+    plot_structure(ax, structure, view)
 
-    ax.axhline(y=0, color='brown', linestyle='--', linewidth=1)
-    ax.set_aspect('equal')
-    ax.set_title("Structure Analysis")
-    ax.grid(True)
-    ax.set_xlabel("Length (m)")
-    if structure.bars[0].length <= 20:
-        ax.set_xlim(-5, 25)
-        ax.set_ylim(-2, 20)
-    else:
-        ax.set_xlim(-5, structure.bars[0].length + 5)
-        ax.set_ylim(-2, structure.bars[0].length + 5)
+    canvas = FigureCanvasTkAgg(fig, master=canvas_frame)
+    view.connect(canvas, ax)
+
+    plt.tight_layout()
+    canvas.draw()
+    canvas.get_tk_widget().pack(fill='both', expand=True)
 
+def animate_mode_shape(canvas_frame, model, mode: np.ndarray, frequency: float = None, scale: float = None,
+                       n_points: int = 11, frames: int = 40, interval: int = 50):
+    """Animate a mode shape of the structure on the canvas.
+    Args:
+        canvas_frame (tk.Frame): The frame where the canvas is located.
+        model (FrameModel): Finite element model of the structure (from fem.modal_analysis).
+        mode (np.ndarray): Mode shape on all the dofs of the model.
+        frequency (float): Natural frequency of the mode in Hz, shown in the title (optional).
+        scale (float): Amplification of the displacements (default: 10% of the size of the structure).
+        n_points (int): Number of points used to draw each bar.
+        frames (int): Number of frames of one period of the animation.
+        interval (int): Delay between frames in milliseconds.
+    Returns:
+        FuncAnimation: The running animation (keep a reference to it, or it stops)."""
+    plt.close('all')  # Close all previous figures to prevent memory leaks
     for widget in canvas_frame.winfo_children():
         widget.destroy()
 
-    canvas = FigureCanvasTkAgg(fig, master=canvas_frame)
+    canvas_width = canvas_frame.winfo_width()
+    canvas_height = canvas_frame.winfo_height()
+    fig, ax = plt.subplots(figsize=(canvas_width / 100, canvas_height / 100))  # Size in inches, 100 dpi
 
-    # Example angle in degrees
-    angle = structure.bars[0].alpha if structure.bars else 30  # fallback if not defined
+    positions = model.positions(n_points)
+    displacements = model.interpolate(mode, n_points)
+    size = np.ptp(model.coords, axis=0).max()
+    if scale is None:
+        peak = np.abs(displacements).max()
+        scale = 0.1 * size / peak if peak > 0 else 1.0
 
-    # Create an arc (start angle 0°, sweep 'angle' degrees counter-clockwise)
-    arc = patches.Arc((0, 0), width=6, height=6, theta1=0, theta2=angle,
-                      edgecolor='purple', linestyle='-', linewidth=2)
-    ax.add_patch(arc)
+    ax.add_collection(LineCollection(positions, colors='lightgrey', linestyles='--', linewidths=1))
+    deformed = LineCollection(positions, colors='b', linewidths=2)
+    ax.add_collection(deformed)
 
-    # Add alpha symbol label
-    ax.text(3, 0.2, r'$\alpha$', fontsize=14, color='purple')
+    margin = 0.1 * size + 1
+    ax.set_xlim(model.coords[:, 0].min() - margin, model.coords[:, 0].max() + margin)
+    ax.set_ylim(model.coords[:, 1].min() - margin, model.coords[:, 1].max() + margin)
+    ax.set_aspect('equal')
+    ax.grid(True)
+    ax.set_xlabel("Length (m)")
+    ax.set_title("Mode Shape" if frequency is None else f"Mode Shape - f = {frequency:.2f} Hz")
 
+    def update(frame):
+        deformed.set_segments(positions + scale * np.sin(2 * np.pi * frame / frames) * displacements)
+        return deformed,
+
+    canvas = FigureCanvasTkAgg(fig, master=canvas_frame)
+    animation = FuncAnimation(fig, update, frames=frames, interval=interval, blit=False)
     plt.tight_layout()
     canvas.draw()
     canvas.get_tk_widget().pack(fill='both', expand=True)
+    return animation
 
 def draw_stress_on_canvas(canvas_frame, bar: Bar):
     """Draw the stress on the canvas for a given bar.
@@ -123,9 +335,6 @@ def draw_stress_on_canvas(canvas_frame, bar: Bar):
     for widget in canvas_frame.winfo_children():
         widget.destroy()
 
-    # Unpack the stress list
-    x_data, shear_stress, normal_stress, flexion_stress = compute_stress(bar)
-
     # Get the current width and height of the canvas
     canvas_width = canvas_frame.winfo_width()
     canvas_height = canvas_frame.winfo_height()
@@ -134,6 +343,22 @@ def draw_stress_on_canvas(canvas_frame, bar: Bar):
     fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(canvas_width / 100, canvas_height / 100))
     fig.subplots_adjust(hspace=0.8)  # Adjust space between subplots
 
+    plot_stress((ax1, ax2, ax3), bar)
+
+    canvas = FigureCanvasTkAgg(fig, master=canvas_frame)
+    canvas.draw()
+    canvas.get_tk_widget().pack(fill='both', expand=True)
+
+def plot_stress(axes, bar: Bar):
+    """Draw the shear, normal and flexion diagrams of a bar on three axes.
+    Args:
+        axes (tuple): The three matplotlib axes (shear, normal, flexion).
+        bar (Bar): The bar object containing the properties."""
+    ax1, ax2, ax3 = axes
+
+    # Unpack the stress list
+    x_data, shear_stress, normal_stress, flexion_stress = compute_stress(bar)
+
     arrow_up, arrow_down, arrow_r, arrow_l, arrow_mr, arrow_ml = draw_arrow(bar)
 
     ax1.add_patch(arrow_down)
@@ -172,10 +397,104 @@ def draw_stress_on_canvas(canvas_frame, bar: Bar):
     ax3.text(bar.length + 2, 0.2, f"{bar.end_node.id}", fontsize=10, color='green')
     ax3.grid(True)
 
-    canvas = FigureCanvasTkAgg(fig, master=canvas_frame)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill='both', expand=True)
-    
+class StressDashboard:
+    """Scrollable list with the N/T/M diagrams of every bar of the structure.
+    The list is virtualized: a diagram is rendered (offscreen) only when its row scrolls into view,
+    and the rendered images are kept in a cache so that scrolling back does not render them again."""
+
+    def __init__(self, parent, row_height: int = 450, cache_size: int = 64, dpi: int = 100):
+        """
+        Parameters:
+        - parent: Tk widget containing the dashboard.
+        - row_height: Height in pixels of the diagrams of one bar.
+        - cache_size: Maximum number of rendered diagrams kept in memory.
+        - dpi: Resolution used to render the diagrams.
+        """
+        self.row_height = row_height
+        self.cache_size = cache_size
+        self.dpi = dpi
+        self.bars = []
+        self._cache = OrderedDict()
+        self._items = {}
+
+        self.frame = ttk.Frame(parent)
+        self.frame.rowconfigure(0, weight=1)
+        self.frame.columnconfigure(0, weight=1)
+        self.canvas = tk.Canvas(self.frame, highlightthickness=0, background='white')
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = ttk.Scrollbar(self.frame, orient='vertical', command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+
+        self.canvas.bind("<Configure>", lambda e: self.refresh(clear=True))
+        self.canvas.bind("<MouseWheel>", lambda e: self._scroll(-1 if e.delta > 0 else 1))
+        self.canvas.bind("<Button-4>", lambda e: self._scroll(-1))
+        self.canvas.bind("<Button-5>", lambda e: self._scroll(1))
+
+    def grid(self, **kwargs):
+        """Place the dashboard with the grid geometry manager."""
+        self.frame.grid(**kwargs)
+
+    def set_structure(self, structure):
+        """Show the bars of a structure. Diagrams of unchanged bars are taken from the cache."""
+        self.bars = list(structure.bars)
+        self.canvas.configure(scrollregion=(0, 0, 1, len(self.bars) * self.row_height))
+        self.refresh(clear=True)
+
+    def _on_scrollbar(self, *args):
+        self.canvas.yview(*args)
+        self.refresh()
+
+    def _scroll(self, units: int):
+        self.canvas.yview_scroll(units, "units")
+        self.refresh()
+
+    def visible_rows(self) -> range:
+        """Return the indices of the bars whose row is (at least partially) visible."""
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        first = max(int(top // self.row_height), 0)
+        last = min(int(bottom // self.row_height) + 1, len(self.bars))
+        return range(first, last)
+
+    def refresh(self, clear: bool = False):
+        """Draw the visible rows and drop the canvas items of the rows that left the view."""
+        if clear:
+            self.canvas.delete("all")
+            self._items.clear()
+        width = self.canvas.winfo_width()
+        if width <= 1:
+            return
+        rows = self.visible_rows()
+        for i in list(self._items):
+            if i not in rows:
+                self.canvas.delete(self._items.pop(i))
+        for i in rows:
+            if i not in self._items:
+                self._items[i] = self.canvas.create_image(0, i * self.row_height, anchor='nw', image=self._image(i, width))
+
+    def _image(self, i: int, width: int):
+        """Return the rendered diagrams of the i-th bar, rendering them only on a cache miss."""
+        bar = self.bars[i]
+        key = (width, bar.start_node.id, bar.end_node.id, bar.length, bar.alpha, tuple(sorted((p, tuple(f)) for p, f in bar.load.items())))
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        fig = Figure(figsize=(width / self.dpi, self.row_height / self.dpi), dpi=self.dpi)
+        FigureCanvasAgg(fig)
+        axes = fig.subplots(3, 1)
+        fig.subplots_adjust(hspace=0.8)  # Adjust space between subplots
+        plot_stress(axes, bar)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', dpi=self.dpi)
+        image = tk.PhotoImage(master=self.canvas, data=base64.b64encode(buffer.getvalue()), format='png')
+
+        self._cache[key] = image
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return image
+
 def compute_stress(bar: Bar) -> list:
     """Compute the stress in a bar given the loads applied to it.
     Args:
@@ -198,6 +517,7 @@ def compute_stress(bar: Bar) -> list:
     for i, p in enumerate(p_list):
         fx = forces_list[i][0]
         fy = forces_list[i][1]
+        m = forces_list[i][2]
 
         # Find the index of the position in x_data --> where the load is applied
         # The stresses are then computed by cumulating the stress from that point to the end of the bar
@@ -207,11 +527,11 @@ def compute_stress(bar: Bar) -> list:
             print("Element not found in the list")
 
         # Compute shear stress
-        shear_stress[index[0]:] = shear_stress[index[0]] + fy*np.cos(np.deg2rad(bar.alpha)) - fx*np.sin(np.deg2rad(bar.alpha))
+        shear_stress[index[0]:] += fy*np.cos(np.deg2rad(bar.alpha)) - fx*np.sin(np.deg2rad(bar.alpha))
         # Compute normal stress
-        normal_stress[index[0]:] = normal_stress[index[0]] - fx*np.cos(np.deg2rad(bar.alpha)) - fy*np.sin(np.deg2rad(bar.alpha))
+        normal_stress[index[0]:] += - fx*np.cos(np.deg2rad(bar.alpha)) - fy*np.sin(np.deg2rad(bar.alpha))
         # Compute flexion stress
-        flexion_stress[index[0]:] += (fy*np.cos(np.deg2rad(bar.alpha)) - fx*np.sin(np.deg2rad(bar.alpha))) * (x_data[index[0]:] - p*bar.length)
+        flexion_stress[index[0]:] += (fy*np.cos(np.deg2rad(bar.alpha)) - fx*np.sin(np.deg2rad(bar.alpha))) * (x_data[index[0]:] - p*bar.length) - m
     
     return [x_data, shear_stress, normal_stress, flexion_stress]
 
@@ -293,6 +613,22 @@ def resistance_analysis(bar: Bar):
 
     return max_shear_stress, max_normal_stress, max_flexion_stress
 
+def check_resistance(bar: Bar) -> tuple:
+    """Run the resistance check on the most stressed section of a bar.
+    The most stressed section is the one with the largest |T| + |N| + |M|.
+    Args:
+        bar (Bar): The bar object containing the loads and properties.
+    Returns:
+        tuple: position of the most stressed section, Von Mises stress, yield strength"""
+    x_data, shear_stress, normal_stress, flexion_stress = compute_stress(bar)
+
+    # Finding the section of maximum stress along the bar --> The index is the position along the bar
+    proxy = abs(shear_stress) + abs(normal_stress) + abs(flexion_stress)
+    idx = np.argmax(proxy)
+
+    von_mises_stress, limit, _, _ = bar.resistance_analysis(normal_stress[idx], shear_stress[idx], flexion_stress[idx], verbose=False)
+    return x_data[idx], von_mises_stress, limit
+
 def draw_section_plot(canvas_frame, bar: Bar):
     """Draw the section plot of a bar."""
     # Close all previous figures to prevent memory leaks
@@ -304,15 +640,23 @@ def draw_section_plot(canvas_frame, bar: Bar):
     canvas_width = canvas_frame.winfo_width() 
     canvas_height = canvas_frame.winfo_height()
 
-    # Get the current width and height of the canvas_frame
+    # Create a new figure with the size of the canvas_frame
+    fig, ax = plt.subplots(figsize=(canvas_width / 100, canvas_height / 100))  # Size in inches, 100 dpi
+
+    plot_section(ax, bar)
+    
+    canvas = FigureCanvasTkAgg(fig, master=canvas_frame)
+    canvas.draw()
+    canvas.get_tk_widget().pack(fill='both', expand=True)
+
+def plot_section(ax, bar: Bar):
+    """Draw the cross section of a bar on the given axes."""
     width = bar.width
     height = bar.height
     hollow = bar.hollow
     width_thickness = bar.width_thickness
     height_thickness = bar.height_thickness
     radius = bar.radius
-    # Create a new figure with the size of the canvas_frame
-    fig, ax = plt.subplots(figsize=(canvas_width / 100, canvas_height / 100))  # Size in inches, 100 dpi
 
     if bar.section == "rectangular":
         # # Draw a rectangle for the section
@@ -359,8 +703,4 @@ def draw_section_plot(canvas_frame, bar: Bar):
     ax.set_title("Section Plot")
     ax.set_xlabel("X-axis")
     ax.set_ylabel("Y-axis")
-    ax.set_aspect('equal', 'box')
-    
-    canvas = FigureCanvasTkAgg(fig, master=canvas_frame)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill='both', expand=True)
\ No newline at end of file
+    ax.set_aspect('equal', 'box')
\ No newline at end of file
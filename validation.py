@@ -0,0 +1,162 @@
+from typing import NamedTuple
+import numpy as np
+from Structure_Analysis import Structure, bar_arrays
+from spatial import GridIndex
+
+
+# Issue class
+# One problem found by validate_structure: errors make the analysis meaningless,
+# warnings point at modelling choices worth checking (e.g. bars crossing without a node).
+class Issue(NamedTuple):
+    code: str
+    severity: str  # 'error' or 'warning'
+    bars: tuple    # indices of the bars involved
+    message: str
+
+
+def _bar_issues(arrays: dict, tolerance: float) -> list:
+    """Checks of every bar on its own: dimensions, hollow walls, material and length."""
+    issues = []
+    circular = arrays['circular']
+    hollow = arrays['hollow']
+    w, h, r = arrays['width'], arrays['height'], arrays['radius']
+    tw, th = arrays['width_thickness'], arrays['height_thickness']
+    distance = np.hypot(arrays['x1'] - arrays['x0'], arrays['y1'] - arrays['y0'])
+
+    with np.errstate(invalid='ignore'):
+        checks = [
+            ('non_positive_length', ~(arrays['length'] > 0), "Length must be greater than zero ({length} mm)."),
+            ('non_positive_width', ~circular & ~(w > 0), "Width must be greater than zero ({width} mm)."),
+            ('non_positive_height', ~circular & ~(h > 0), "Height must be greater than zero ({height} mm)."),
+            ('non_positive_radius', circular & ~(r > 0), "Radius must be greater than zero ({radius} mm)."),
+            ('infeasible_hollow_section',
+             hollow & ~circular & ~((tw > 0) & (th > 0) & (2 * tw < w) & (2 * th < h)),
+             "Wall thicknesses ({width_thickness}, {height_thickness} mm) do not fit the {width} x {height} mm section."),
+            ('infeasible_hollow_section', hollow & circular & ~((tw > 0) & (tw < r)),
+             "Wall thickness ({width_thickness} mm) does not fit the radius ({radius} mm)."),
+            ('unknown_material', np.isnan(arrays['density']), "Material not recognized."),
+            ('zero_length_bar', distance <= tolerance, "Start and end nodes are at the same position."),
+            ('length_mismatch', (distance > tolerance) & ~(np.abs(arrays['length'] - distance) <= tolerance),
+             "Length of the bar ({length}) does not match the distance between start and end nodes ({distance:.3f})."),
+        ]
+    for code, failed, message in checks:
+        for i in np.flatnonzero(failed).tolist():
+            values = {key: arrays[key][i] for key in ('length', 'width', 'height', 'radius', 'width_thickness', 'height_thickness')}
+            issues.append(Issue(code, 'error', (i,), message.format(distance=distance[i], **values)))
+    return issues
+
+def _pair_issues(arrays: dict, tolerance: float) -> list:
+    """Checks of the pairs of bars close to each other: duplicates, overlaps and crossings without a node."""
+    x0, y0, x1, y1 = arrays['x0'], arrays['y0'], arrays['x1'], arrays['y1']
+    index = GridIndex(np.minimum(x0, x1) - tolerance, np.minimum(y0, y1) - tolerance,
+                      np.maximum(x0, x1) + tolerance, np.maximum(y0, y1) + tolerance)
+    pairs = index.pairs()
+    i, j = pairs[:, 0], pairs[:, 1]
+
+    p0, p1 = np.stack([x0[i], y0[i]], axis=1), np.stack([x1[i], y1[i]], axis=1)
+    q0, q1 = np.stack([x0[j], y0[j]], axis=1), np.stack([x1[j], y1[j]], axis=1)
+    d, e = p1 - p0, q1 - q0
+    length_p, length_q = np.linalg.norm(d, axis=1), np.linalg.norm(e, axis=1)
+    valid = (length_p > tolerance) & (length_q > tolerance)  # zero-length bars are reported by _bar_issues
+
+    def close(a, b):
+        return np.linalg.norm(a - b, axis=1) <= tolerance
+
+    def cross(a, b):
+        return a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        duplicate = valid & ((close(p0, q0) & close(p1, q1)) | (close(p0, q1) & close(p1, q0)))
+
+        # Collinear bars: both ends of q on the line of p, then the length shared along p
+        distance_q0 = np.abs(cross(d, q0 - p0)) / length_p
+        distance_q1 = np.abs(cross(d, q1 - p0)) / length_p
+        collinear = valid & (distance_q0 <= tolerance) & (distance_q1 <= tolerance)
+        t0 = np.einsum('ij,ij->i', q0 - p0, d) / length_p
+        t1 = np.einsum('ij,ij->i', q1 - p0, d) / length_p
+        shared = np.minimum(length_p, np.maximum(t0, t1)) - np.maximum(0, np.minimum(t0, t1))
+        overlapping = collinear & ~duplicate & (shared > tolerance)
+
+        # Intersection point of the lines: p0 + t d = q0 + u e
+        denominator = cross(d, e)
+        t = cross(q0 - p0, e) / denominator
+        u = cross(q0 - p0, d) / denominator
+        intersect = (valid & ~collinear & (np.abs(denominator) > 0) &
+                     (t * length_p >= -tolerance) & (t * length_p <= length_p + tolerance) &
+                     (u * length_q >= -tolerance) & (u * length_q <= length_q + tolerance))
+        end_p = (np.abs(t) * length_p <= tolerance) | (np.abs(1 - t) * length_p <= tolerance)
+        end_q = (np.abs(u) * length_q <= tolerance) | (np.abs(1 - u) * length_q <= tolerance)
+        crossing = intersect & ~end_p & ~end_q
+        unconnected = intersect & (end_p ^ end_q)
+
+    issues = []
+    for code, severity, found, message in (
+            ('duplicate_bar', 'error', duplicate, "Bars {} and {} connect the same nodes."),
+            ('overlapping_bars', 'error', overlapping, "Bars {} and {} overlap along {:.3f} mm."),
+            ('crossing_bars', 'warning', crossing, "Bars {} and {} cross without a common node."),
+            ('unconnected_joint', 'warning', unconnected, "An end of bar {} or {} lies on the other bar without being connected to its nodes.")):
+        for k in np.flatnonzero(found).tolist():
+            issues.append(Issue(code, severity, (int(i[k]), int(j[k])), message.format(i[k], j[k], shared[k])))
+    return issues
+
+def _groups(group: np.ndarray, members: np.ndarray, selected: np.ndarray):
+    """Yield (group, members of the group) for the selected groups, with a single sort of the members."""
+    order = np.argsort(group, kind='stable')
+    bounds = np.searchsorted(group[order], selected, side='left'), np.searchsorted(group[order], selected, side='right')
+    for g, start, end in zip(selected.tolist(), *bounds):
+        yield g, members[order[start:end]]
+
+def _node_issues(bars: list, tolerance: float) -> list:
+    """Checks of the nodes: same id at different positions, different ids at the same position."""
+    ids = np.array([str(node.id) for bar in bars for node in (bar.start_node, bar.end_node)])
+    xy = np.array([(node.x, node.y) for bar in bars for node in (bar.start_node, bar.end_node)], dtype=float).reshape(-1, 2)
+    owner = np.repeat(np.arange(len(bars)), 2)
+    issues = []
+
+    # Same id, different positions (nodes without id are not compared)
+    named = np.flatnonzero(ids != "")
+    labels, group = np.unique(ids[named], return_inverse=True)
+    low = np.full((len(labels), 2), np.inf)
+    high = np.full((len(labels), 2), -np.inf)
+    np.minimum.at(low, group, xy[named])
+    np.maximum.at(high, group, xy[named])
+    moved = np.linalg.norm(high - low, axis=1) > tolerance
+    for g, members in _groups(group, named, np.flatnonzero(moved)):
+        issues.append(Issue('duplicate_node_id', 'error', tuple(np.unique(owner[members]).tolist()),
+                            f"Node id '{labels[g]}' is used at different positions."))
+
+    # Different ids, same position (the analysis merges them: check that the bars are meant to be connected)
+    cells = np.round(xy / max(tolerance, 1e-12)).astype(np.int64)
+    _, position = np.unique(cells, axis=0, return_inverse=True)
+    position = position.ravel()
+    _, code = np.unique(ids, return_inverse=True)
+    low = np.full(position.max() + 1, len(ids))
+    high = np.full(position.max() + 1, -1)
+    np.minimum.at(low, position, code)
+    np.maximum.at(high, position, code)
+    for _, members in _groups(position, np.arange(len(ids)), np.flatnonzero(low != high)):
+        names = sorted(set(ids[members].tolist()))
+        bars_at = np.unique(owner[members])
+        if len(names) > 1 and len(bars_at) > 1:
+            x, y = xy[members[0]]
+            issues.append(Issue('coincident_nodes', 'warning', tuple(bars_at.tolist()),
+                                f"Nodes {', '.join(repr(name) for name in names)} are at the same position ({x:.3f}, {y:.3f})."))
+    return issues
+
+def validate_structure(structure: Structure, tolerance: float = 1e-3) -> list:
+    """
+    Check the whole structure at once and return all the problems found (instead of stopping at the first one).
+    Checks: positive dimensions, hollow walls fitting the section, known materials, zero-length bars,
+    length versus node distance, duplicate, overlapping and crossing bars, bar ends lying on other bars,
+    and inconsistent or coincident nodes. The pairs of bars are found with a spatial index.
+    Parameters:
+    - structure: Structure object (or StructureSnapshot).
+    - tolerance: Distance (mm) under which two positions or lengths are equal (Bar.check_on_length rounds to 1e-3).
+    Returns:
+        list: Issue objects (code, severity, bars, message), empty if the structure is valid.
+    """
+    bars = list(structure.bars)
+    if not bars:
+        return []
+    arrays = bar_arrays(bars)
+    return _bar_issues(arrays, tolerance) + _pair_issues(arrays, tolerance) + _node_issues(bars, tolerance)